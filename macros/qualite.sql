@@ -0,0 +1,24 @@
+{% macro lignes_validees(colonnes_qualite, alias=none) -%}
+    {#- Condition de validation : aucun code qualité à 2 (= non validé) ; NULL si un code est NULL -#}
+    {%- for colonne in colonnes_qualite -%}
+        {{ alias ~ "." if alias }}{{ colonne }} != 2{{ " AND " if not loop.last }}
+    {%- endfor -%}
+{%- endmacro %}
+
+
+{% macro supprime_lignes_invalidees(source_relation, colonnes_qualite) %}
+    {#-
+        Post-hook des modèles de staging incrémentaux (merge) : supprime les lignes déjà
+        chargées dont la ligne source n'est plus validée (code qualité requalifié à 2),
+        que le merge ne peut pas retirer puisqu'elles sont filtrées avant lui. La table
+        incrémentale reste ainsi identique à un full refresh.
+    -#}
+    DELETE FROM {{ this }} AS t
+    WHERE EXISTS (
+        SELECT 1
+        FROM {{ source_relation }} AS s
+        WHERE s.NUM_POSTE = t.NUM_POSTE
+            AND s.AAAAMM = FORMAT_DATE('%Y%m', t.AAAAMM)
+            AND NOT COALESCE({{ lignes_validees(colonnes_qualite, 's') }}, FALSE)
+    )
+{% endmacro %}
@@ -0,0 +1,16 @@
+-- Page "Climat de La Réunion" : séries annuelles par station et micro-climat
+-- Seules les colonnes lues par le dashboard sont conservées
+
+{{ config(
+    partition_by={"field": "year", "data_type": "int64", "range": {"start": 1900, "end": 2101, "interval": 1}},
+    cluster_by=["Z_GEO"]
+) }}
+
+SELECT
+    NUM_POSTE,
+    Z_GEO,
+    CAST(year AS INT64) AS year,
+    TMM,
+    RRMX,
+    NBJFXI3S16X
+FROM {{ source('data_meteofrance', 'histo_simu_geo') }}
@@ -0,0 +1,117 @@
+-- Normales climatiques (moyennes de référence) par station et par zone, calculées une
+-- seule fois sur la période de référence (vars periode_reference_debut / periode_reference_fin)
+-- MOIS = 1..12 : normale mensuelle ; MOIS = 0 : normale annuelle
+-- Utilisées par les pages (écarts à la normale) et par mart_projection_2100 (baseline)
+
+{{ config(
+    cluster_by=["indicateur", "niveau", "cle"]
+) }}
+
+{% set debut = var('periode_reference_debut', 1991) %}
+{% set fin = var('periode_reference_fin', 2020) %}
+
+WITH mensuel AS (
+    -- Valeurs mensuelles des stations sur la période de référence, format long
+    SELECT NUM_POSTE, ANNEE, MOIS, indicateur, valeur
+    FROM (
+        SELECT
+            NUM_POSTE,
+            ANNEE,
+            MOIS,
+            CAST(TM AS FLOAT64) AS TM,
+            CAST(NBJTXS32 AS FLOAT64) AS NBJTXS32,
+            CAST(NBJTNS20 AS FLOAT64) AS NBJTNS20
+        FROM {{ ref('stg_mens_temperatures') }}
+        WHERE ANNEE BETWEEN {{ debut }} AND {{ fin }}
+    )
+    UNPIVOT (valeur FOR indicateur IN (TM, NBJTXS32, NBJTNS20))
+
+    UNION ALL
+
+    SELECT NUM_POSTE, ANNEE, MOIS, 'RR' AS indicateur, CAST(RR AS FLOAT64) AS valeur
+    FROM {{ ref('stg_mensq_pluviometrie') }}
+    WHERE ANNEE BETWEEN {{ debut }} AND {{ fin }}
+),
+
+annuel AS (
+    -- Moyenne annuelle pour TM, cumul annuel pour les autres indicateurs
+    SELECT
+        NUM_POSTE,
+        ANNEE,
+        0 AS MOIS,
+        indicateur,
+        IF(indicateur = 'TM', AVG(valeur), SUM(valeur)) AS valeur
+    FROM mensuel
+    GROUP BY NUM_POSTE, ANNEE, indicateur
+
+    UNION ALL
+
+    -- Jours > 32°C annuels (pages Températures de jour et Simulation 2100)
+    SELECT
+        NUM_POSTE,
+        CAST(ANNEE AS INT64) AS ANNEE,
+        0 AS MOIS,
+        'jours_sup_32' AS indicateur,
+        CAST(total_jours_sup_32c_annuel AS FLOAT64) AS valeur
+    FROM {{ source('MENS_meteofrance', 'Table_NBJTXS32_ANNEE') }}
+    WHERE CAST(ANNEE AS INT64) BETWEEN {{ debut }} AND {{ fin }}
+),
+
+valeurs AS (
+    SELECT
+        v.NUM_POSTE,
+        st.Z_GEO,
+        v.ANNEE,
+        v.MOIS,
+        v.indicateur,
+        v.valeur
+    FROM (
+        SELECT * FROM mensuel
+        UNION ALL
+        SELECT * FROM annuel
+    ) AS v
+    INNER JOIN {{ source('MENS_meteofrance', 'stations') }} AS st
+        ON v.NUM_POSTE = st.NUM_POSTE
+),
+
+par_station AS (
+    SELECT
+        'station' AS niveau,
+        CAST(NUM_POSTE AS STRING) AS cle,
+        indicateur,
+        MOIS,
+        AVG(valeur) AS reference,
+        STDDEV(valeur) AS ecart_type,
+        COUNT(DISTINCT ANNEE) AS nb_annees
+    FROM valeurs
+    GROUP BY NUM_POSTE, indicateur, MOIS
+),
+
+zone_par_annee AS (
+    -- Moyenne des stations de la zone pour chaque année (comme les marts par zone)
+    SELECT
+        Z_GEO,
+        ANNEE,
+        MOIS,
+        indicateur,
+        AVG(valeur) AS valeur
+    FROM valeurs
+    GROUP BY Z_GEO, ANNEE, MOIS, indicateur
+),
+
+par_zone AS (
+    SELECT
+        'zone' AS niveau,
+        Z_GEO AS cle,
+        indicateur,
+        MOIS,
+        AVG(valeur) AS reference,
+        STDDEV(valeur) AS ecart_type,
+        COUNT(*) AS nb_annees
+    FROM zone_par_annee
+    GROUP BY Z_GEO, indicateur, MOIS
+)
+
+SELECT {{ debut }} AS annee_debut, {{ fin }} AS annee_fin, * FROM par_station
+UNION ALL
+SELECT {{ debut }} AS annee_debut, {{ fin }} AS annee_fin, * FROM par_zone
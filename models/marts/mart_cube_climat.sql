@@ -0,0 +1,149 @@
+-- Cube d'agrégats pré-calculés : niveau spatial × grain temporel × indicateurs mensuels
+-- Calculé une seule fois à partir des modèles de staging ; les marts des pages
+-- nuits >= 20°C et précipitations > 100 mm en sont de simples sélections (même
+-- résultat que leurs anciens calculs : tests/assert_*_ancien_calcul.sql).
+--
+-- niveau : 'station' (NUM_POSTE), 'zone_climat' (Z_CLIM × Z_GEO), 'zone' (Z_GEO), 'ile'
+-- Rattachement des stations, repris des anciens marts :
+--   station, zone_climat : Z_CLIM et Z_GEO de la table `stations` ;
+--   zone : Z_GEO de `stations_zones` (ancien int_mensq_temperatures_sup_20deg) ;
+--   ile : toutes les stations du staging, y compris hors `stations`.
+-- grain  : 'mois' (ANNEE, MOIS), 'annee' (MOIS = 0), 'decennie' (ANNEE = début de la décennie, MOIS = 0)
+--
+-- Station : valeur mensuelle, puis moyenne (TM, TX, TN), maximum (RRAB) ou cumul
+-- (RR, NBJ*) sur l'année, puis moyenne des années de la décennie.
+-- Zone et île : moyenne des stations au même grain (comme les marts par zone).
+
+{{ config(
+    partition_by={"field": "ANNEE", "data_type": "int64", "range": {"start": 1900, "end": 2101, "interval": 1}},
+    cluster_by=["niveau", "grain", "Z_GEO"]
+) }}
+
+{% set moyennes = ['TM', 'TX', 'TN'] %}
+{% set maximums = ['RRAB'] %}
+{% set temperatures = moyennes + [
+    'NBJTX0', 'NBJTX25', 'NBJTX30', 'NBJTX35', 'NBJTXI20', 'NBJTXI27', 'NBJTXS32',
+    'NBJTN5', 'NBJTN10', 'NBJTNI10', 'NBJTNI15', 'NBJTNI20', 'NBJTNS20', 'NBJTNS25',
+    'NBJGELEE', 'NBJTMS24'
+] %}
+{% set pluies = ['RR'] + maximums + ['NBJRR1', 'NBJRR5', 'NBJRR10', 'NBJRR30', 'NBJRR50', 'NBJRR100'] %}
+{% set indicateurs = temperatures + pluies %}
+{% set niveaux = {
+    'zone_climat': {'cles': {'Z_CLIM': 'Z_CLIM', 'Z_GEO': 'Z_GEO'}, 'filtre': 'dans_stations'},
+    'zone': {'cles': {'Z_GEO': 'Z_GEO_zones'}, 'filtre': 'dans_stations_zones'},
+    'ile': {'cles': {}, 'filtre': 'TRUE'}
+} %}
+
+WITH station_mois AS (
+    SELECT
+        COALESCE(t.NUM_POSTE, p.NUM_POSTE) AS NUM_POSTE,
+        COALESCE(t.ANNEE, p.ANNEE) AS ANNEE,
+        COALESCE(t.MOIS, p.MOIS) AS MOIS,
+        t.NUM_POSTE IS NOT NULL AS a_temperature,
+        p.NUM_POSTE IS NOT NULL AS a_pluie,
+        {% for indicateur in temperatures %}
+        CAST(t.{{ indicateur }} AS FLOAT64) AS {{ indicateur }},
+        {% endfor %}
+        {% for indicateur in pluies %}
+        CAST(p.{{ indicateur }} AS FLOAT64) AS {{ indicateur }}{{ "," if not loop.last }}
+        {% endfor %}
+    FROM {{ ref('stg_mens_temperatures') }} AS t
+    FULL OUTER JOIN {{ ref('stg_mensq_pluviometrie') }} AS p
+        ON t.NUM_POSTE = p.NUM_POSTE
+        AND t.AAAAMM = p.AAAAMM
+),
+
+station_annee AS (
+    SELECT
+        NUM_POSTE,
+        ANNEE,
+        0 AS MOIS,
+        LOGICAL_OR(a_temperature) AS a_temperature,
+        LOGICAL_OR(a_pluie) AS a_pluie,
+        {% for indicateur in indicateurs %}
+        {% if indicateur in moyennes %}AVG{% elif indicateur in maximums %}MAX{% else %}SUM{% endif %}({{ indicateur }}) AS {{ indicateur }}{{ "," if not loop.last }}
+        {% endfor %}
+    FROM station_mois
+    GROUP BY NUM_POSTE, ANNEE
+),
+
+station_decennie AS (
+    SELECT
+        NUM_POSTE,
+        DIV(ANNEE, 10) * 10 AS ANNEE,
+        0 AS MOIS,
+        LOGICAL_OR(a_temperature) AS a_temperature,
+        LOGICAL_OR(a_pluie) AS a_pluie,
+        {% for indicateur in indicateurs %}
+        AVG({{ indicateur }}) AS {{ indicateur }}{{ "," if not loop.last }}
+        {% endfor %}
+    FROM station_annee
+    GROUP BY NUM_POSTE, DIV(ANNEE, 10) * 10
+),
+
+par_station AS (
+    SELECT
+        g.grain,
+        g.NUM_POSTE,
+        st.Z_CLIM,
+        st.Z_GEO,
+        sz.Z_GEO AS Z_GEO_zones,
+        st.NUM_POSTE IS NOT NULL AS dans_stations,
+        sz.NUM_POSTE IS NOT NULL AS dans_stations_zones,
+        g.ANNEE,
+        g.MOIS,
+        g.a_temperature,
+        g.a_pluie,
+        {% for indicateur in indicateurs %}
+        g.{{ indicateur }}{{ "," if not loop.last }}
+        {% endfor %}
+    FROM (
+        SELECT 'mois' AS grain, * FROM station_mois
+        UNION ALL
+        SELECT 'annee' AS grain, * FROM station_annee
+        UNION ALL
+        SELECT 'decennie' AS grain, * FROM station_decennie
+    ) AS g
+    LEFT JOIN {{ source('MENS_meteofrance', 'stations') }} AS st
+        ON g.NUM_POSTE = st.NUM_POSTE
+    LEFT JOIN {{ source('MENS_meteofrance', 'stations_zones') }} AS sz
+        ON g.NUM_POSTE = sz.NUM_POSTE
+)
+
+SELECT
+    'station' AS niveau,
+    grain,
+    NUM_POSTE,
+    Z_CLIM,
+    Z_GEO,
+    ANNEE,
+    MOIS,
+    IF(a_temperature, 1, 0) AS nb_stations_temperature,
+    IF(a_pluie, 1, 0) AS nb_stations_pluie,
+    {% for indicateur in indicateurs %}
+    {{ indicateur }}{{ "," if not loop.last }}
+    {% endfor %}
+FROM par_station
+WHERE dans_stations
+
+{% for niveau, options in niveaux.items() %}
+{% set cles = options['cles'] %}
+UNION ALL
+
+SELECT
+    '{{ niveau }}' AS niveau,
+    grain,
+    NULL AS NUM_POSTE,
+    {{ cles['Z_CLIM'] ~ " AS Z_CLIM" if "Z_CLIM" in cles else "NULL AS Z_CLIM" }},
+    {{ cles['Z_GEO'] ~ " AS Z_GEO" if "Z_GEO" in cles else "NULL AS Z_GEO" }},
+    ANNEE,
+    MOIS,
+    COUNT(DISTINCT IF(a_temperature, NUM_POSTE, NULL)) AS nb_stations_temperature,
+    COUNT(DISTINCT IF(a_pluie, NUM_POSTE, NULL)) AS nb_stations_pluie,
+    {% for indicateur in indicateurs %}
+    AVG({{ indicateur }}) AS {{ indicateur }}{{ "," if not loop.last }}
+    {% endfor %}
+FROM par_station
+WHERE {{ options['filtre'] }}
+GROUP BY grain, ANNEE, MOIS{% for colonne in cles.values() %}, {{ colonne }}{% endfor %}
+{% endfor %}
@@ -0,0 +1,33 @@
+-- Page "Températures de jour" : moyenne annuelle des jours > 32°C par zone
+-- Même source que la normale `jours_sup_32` (mart_climatologies) et la baseline de
+-- mart_projection_2100 : cumuls annuels de Table_NBJTXS32_ANNEE, et non NBJTXS32 du
+-- cube (staging filtré sur les codes qualité)
+
+{{ config(
+    partition_by={"field": "ANNEE", "data_type": "int64", "range": {"start": 1900, "end": 2101, "interval": 1}},
+    cluster_by=["Z_GEO", "Z_CLIM"]
+) }}
+
+WITH CTE AS (
+    SELECT
+        t1.ANNEE,
+        t2.Z_CLIM,
+        t2.Z_GEO,
+        AVG(t1.total_jours_sup_32c_annuel) AS moyenne_jours_chauds_zone,
+        COUNT(DISTINCT t1.NUM_POSTE) AS nombre_stations_incluses
+    FROM {{ source('MENS_meteofrance', 'Table_NBJTXS32_ANNEE') }} AS t1
+    INNER JOIN {{ source('MENS_meteofrance', 'stations') }} AS t2
+        ON t1.NUM_POSTE = t2.NUM_POSTE
+    GROUP BY
+        t1.ANNEE,
+        t2.Z_CLIM,
+        t2.Z_GEO
+)
+
+SELECT
+    CAST(ANNEE AS INT64) AS ANNEE,
+    Z_CLIM,
+    Z_GEO,
+    moyenne_jours_chauds_zone,
+    nombre_stations_incluses
+FROM CTE
@@ -0,0 +1,17 @@
+-- Page "Températures de nuit" : nombre moyen de nuits >= 20°C par zone et par année
+
+{{ config(
+    partition_by={"field": "ANNEE", "data_type": "int64", "range": {"start": 1900, "end": 2101, "interval": 1}},
+    cluster_by=["zone_geographique"]
+) }}
+
+-- Lecture du cube d'agrégats (moyenne des stations du cumul annuel de NBJTNS20)
+SELECT
+    ANNEE,
+    Z_GEO AS zone_geographique,
+    NBJTNS20 AS moy_nuits_ge_20,
+    nb_stations_temperature AS nb_stations
+FROM {{ ref('mart_cube_climat') }}
+WHERE niveau = 'zone'
+    AND grain = 'annee'
+    AND nb_stations_temperature > 0
@@ -0,0 +1,20 @@
+-- Page "Cyclones" : mois avec plus d'un jour de précipitations > 100 mm (moyenne des stations)
+
+{{ config(
+    partition_by={"field": "date_key", "data_type": "date", "granularity": "year"},
+    cluster_by=["annee", "mois"]
+) }}
+
+-- Lecture du cube d'agrégats (moyenne mensuelle des stations de l'île)
+SELECT
+    ANNEE AS annee,
+    MOIS AS mois,
+    DATE(ANNEE, MOIS, 1) AS date_key,
+    RR AS Cumul_Mensuel_Pluie_Total,
+    -- RRAB : précipitation maximale tombée en 24 heures au cours du mois
+    RRAB AS Cumul_MAxi_par_mois,
+    NBJRR100 AS Nb_Jours_Sup_100mm
+FROM {{ ref('mart_cube_climat') }}
+WHERE niveau = 'ile'
+    AND grain = 'mois'
+    AND NBJRR100 > 1
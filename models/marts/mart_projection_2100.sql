@@ -0,0 +1,57 @@
+-- Page "Simulation 2100" : projection statique des jours > 32°C à l'horizon 2100
+-- Projection = baseline observée 1991-2020 moyenne de la zone + delta simulé en 2100
+
+{{ config(
+    cluster_by=["Scenario", "Z_GEO"]
+) }}
+
+WITH T_OBS_REF AS (
+    -- 1. BASELINE OBSERVÉE PAR STATION (normale 1991-2020, précalculée dans mart_climatologies)
+    SELECT
+        t2.NUM_POSTE,
+        t2.Z_CLIM,
+        t2.Z_GEO,
+        t1.reference AS baseline_jours_chauds_ref
+    FROM {{ ref('mart_climatologies') }} AS t1
+    INNER JOIN {{ source('MENS_meteofrance', 'stations') }} AS t2
+        ON t1.cle = CAST(t2.NUM_POSTE AS STRING)
+    WHERE
+        t1.niveau = 'station'
+        AND t1.indicateur = 'jours_sup_32'
+        AND t1.MOIS = 0
+),
+
+T_PROJ_AGR AS (
+    -- 2. CALCUL DU DELTA MOYEN PAR ZONE UNIQUEMENT POUR L'ANNÉE 2100
+    SELECT
+        t2.Scenario,
+        t2.Z_GEO,
+        AVG(t2.NBJTXS32) AS delta_jours_chauds_moyen_2100
+    FROM {{ source('MENS_meteofrance', 'Table_sim_2100') }} AS t2
+    WHERE
+        EXTRACT(YEAR FROM t2.date_2100) = 2100
+    GROUP BY
+        t2.Scenario, t2.Z_GEO
+)
+
+-- 3. JOINTURE FINALE ET CALCUL DE LA PROJECTION STATIQUE (HORIZON 2100)
+SELECT
+    2100 AS ANNEE_HORIZON,
+    T_PROJ.Scenario,
+    T_ST.Z_CLIM,
+    T_PROJ.Z_GEO,
+    AVG(T_ST.LAT) AS latitude_centre,
+    AVG(T_ST.LON) AS longitude_centre,
+    AVG(T_OBS_REF.baseline_jours_chauds_ref) AS baseline_jours_chauds_zone,
+    AVG(T_OBS_REF.baseline_jours_chauds_ref) + T_PROJ.delta_jours_chauds_moyen_2100 AS jours_chauds_projete_2100,
+    T_PROJ.delta_jours_chauds_moyen_2100 AS delta_projection_2100
+FROM T_PROJ_AGR AS T_PROJ
+INNER JOIN {{ source('MENS_meteofrance', 'stations') }} AS T_ST
+    ON T_PROJ.Z_GEO = T_ST.Z_GEO
+INNER JOIN T_OBS_REF
+    ON T_ST.NUM_POSTE = T_OBS_REF.NUM_POSTE
+GROUP BY
+    T_PROJ.Scenario,
+    T_ST.Z_CLIM,
+    T_PROJ.Z_GEO,
+    T_PROJ.delta_jours_chauds_moyen_2100
@@ -3,6 +3,21 @@
 -- extract year and month from AAAAMM
 -- remove lines where quality codes = 2 (= not validated)
 -- exclude data before 1952 because data is very sparse
+-- incremental : seuls les nouveaux mois sont traités à chaque rafraîchissement (clé NUM_POSTE, AAAAMM) ;
+-- les lignes déjà chargées puis requalifiées non validées sont supprimées après le merge
+-- (post-hook supprime_lignes_invalidees), comme le ferait un full refresh
+
+{% set colonnes_qualite = ['QRR', 'QRRAB'] %}
+
+{{ config(
+    materialized='incremental',
+    incremental_strategy='merge',
+    unique_key=['NUM_POSTE', 'AAAAMM'],
+    partition_by={'field': 'AAAAMM', 'data_type': 'date', 'granularity': 'month'},
+    cluster_by=['NUM_POSTE'],
+    on_schema_change='append_new_columns',
+    post_hook="{{ supprime_lignes_invalidees(source('data_meteofrance', 'MENSQ_974_1900-2025'), " ~ colonnes_qualite ~ ") }}"
+) }}
 
 WITH base AS (
     SELECT 
@@ -23,9 +38,16 @@ WITH base AS (
         NBJRR50,
         NBJRR100 
     FROM {{ source('data_meteofrance', 'MENSQ_974_1900-2025') }}
+    {% if is_incremental() %}
+    -- Seuls les mois absents de la table (et les `mois_recalcules` derniers mois
+    -- déjà chargés, que Météo-France peut encore corriger) sont relus et parsés
+    WHERE AAAAMM >= (
+        SELECT FORMAT_DATE('%Y%m', DATE_SUB(MAX(AAAAMM), INTERVAL {{ var('mois_recalcules', 3) }} MONTH))
+        FROM {{ this }}
+    )
+    {% endif %}
 )
 SELECT *
 FROM base
-WHERE QRR != 2
-AND QRRAB != 2
+WHERE {{ lignes_validees(colonnes_qualite) }}
 AND ANNEE >= 1952
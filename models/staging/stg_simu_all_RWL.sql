@@ -2,10 +2,12 @@
 -- Chloé
 -- Sélection de variables
 -- Mise au bon format
+-- Micro-climat du point de grille (table points_zones, cf. src/geo/spatial_index.py)
 
 WITH base AS (
   SELECT
-    Point - 200000 AS Point,
+    simu.Point - 200000 AS Point,
+    pz.Z_GEO,
     CASE `Période` 
       WHEN 'RWL15' THEN '+1.5°C'
       WHEN 'RWL20' THEN '+2.0°C'
@@ -32,7 +34,9 @@ WITH base AS (
     NORRR10D AS NBJRR10,
     NORRR100D AS NBJRR100,
     NORRx1D AS RRAB
-  FROM `cc-reunion.data_meteofrance.simu_all_RWL`
+  FROM {{ source('data_meteofrance', 'simu_all_RWL') }} AS simu
+  LEFT JOIN {{ source('data_meteofrance', 'points_zones') }} AS pz
+    ON simu.Point = pz.Point
 )
 
 SELECT
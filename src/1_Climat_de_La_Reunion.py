@@ -1,12 +1,18 @@
 import streamlit as st
-import plotly.express as px
-import geojson
-from pathlib import Path
-from config.constants import get_coordonnees_reunion, get_couleurs_zones
-from data_layer.bigquery import get_table
+from config.constants import get_coordonnees_reunion
+from charts.climat import figure_tmm, figure_precipitations
+from charts.downsampling import series
+from data_layer.bigquery import get_climat_annuel
+from data_layer.prefetch import show_warm_up_status
+from geo.zones import get_zones_layer, style_function, highlight_function
+from profiling.spans import span, start_rerun, finish_rerun
 import folium
 from streamlit_folium import st_folium
 
+# Colonnes et années utilisées par la page (projection et filtre exécutés par BigQuery)
+COLONNES = ("year", "Z_GEO", "TMM", "RRMX")
+FILTRES = {"year": ("<=", 2025)}
+
 
 st.set_page_config(
     page_title="Climat de La Réunion",
@@ -14,40 +20,11 @@ st.set_page_config(
     layout="wide"
 )
 
+start_rerun("1_Climat_de_La_Reunion")
 st.title("🏝️ Le climat à La Réunion")
+show_warm_up_status()
 
 
-# ----------------------------------------------------
-# CONFIGURATION DE LA CARTE
-# ----------------------------------------------------
-
-# Fonction de style pour les zones climatiques
-def style_function(feature):
-    zone = feature['properties'].get('Zone')
-    couleurs = get_couleurs_zones()
-    return {
-        "fillColor": couleurs.get(zone, "#808080"),
-        "color": couleurs.get(zone, "#000000"),
-        "weight": 2,
-        "fillOpacity": 0.4,
-    }
-
-# Fonction de surlignage au survol
-def highlight_function(feature):
-    return {
-        "weight": 4,
-        "color": "yellow",
-        "fillOpacity": 0.7,
-    }
-
-
-# __file__ = chemin du fichier Python courant
-BASE_DIR = Path(__file__).resolve().parent
-filepath = BASE_DIR / "zones_climatiques.geojson"
-
-with open(filepath, 'r', encoding='utf-8') as file:
-    geojson_data = geojson.load(file)
-
 # Division de la page en deux colonnes
 col1, col2 = st.columns([1, 2]) # 1/3 pour la carte, 2/3 pour les graphiques
 
@@ -61,64 +38,53 @@ with col1:
     st.markdown(":blue-badge[Hauts sous le vent (SV_H)] :green-badge[Hauts au vent (AV_H)]")
 
     # Création de la carte Folium centrée sur La Réunion
-    m = folium.Map(location=get_coordonnees_reunion(), zoom_start=9)
-
-    # Ajout du GeoJSON
-    folium.GeoJson(
-        geojson_data,
-        name="Zones climatiques",
-        style_function=style_function,
-        highlight_function=highlight_function,
-        tooltip=folium.features.GeoJsonTooltip(
-            fields=["Zone"],
-            aliases=["Micro-climat:"]
-        )
-    ).add_to(m)
+    zoom = 9
+    with span("carte"):
+        m = folium.Map(location=get_coordonnees_reunion(), zoom_start=zoom)
+
+        # Ajout du GeoJSON (couche simplifiée pour le zoom, mise en cache par processus)
+        folium.GeoJson(
+            get_zones_layer(zoom),
+            name="Zones climatiques",
+            style_function=style_function,
+            highlight_function=highlight_function,
+            tooltip=folium.features.GeoJsonTooltip(
+                fields=["Zone"],
+                aliases=["Micro-climat:"]
+            )
+        ).add_to(m)
 
     # Affichage de la carte dans Streamlit
     # `use_container_width=True` est essentiel pour que la carte puisse s'afficher correctement
     # en s'adaptant à la largeur de la colonne
-    st_folium(m, use_container_width=True, height=400)
+    with span("st_folium"):
+        st_folium(m, use_container_width=True, height=400)
 
 
 
 # ----------------------------------------------------
 # B. DEUXIÈME COLONNE : GRAPHIQUES DE SÉRIES TEMPORELLES
 # ----------------------------------------------------
-df_data = get_table(tab_name = 'cc-reunion.data_meteofrance.histo_simu_geo')
-df_data = df_data[df_data.year <= 2025]
-df_data = df_data.sort_values(by='year', ascending=True)
+with span("data"):
+    df_data = get_climat_annuel(COLONNES, FILTRES)
+with span("transform"):
+    # Une valeur par micro-climat et par année (moyenne des stations), séries longues sous-échantillonnées
+    df_tmm = series(df_data, 'year', 'TMM', group='Z_GEO')
+    df_precip = series(df_data, 'year', 'RRMX', group='Z_GEO')
 
 with col2:
     st.subheader("Variations annuelles de 1953 à nos jours")
-    height = 400
-    
+
     # --- 1. GRAPHIQUE DES TEMPÉRATURES MOYENNES (TMM) ---
-    
-    fig_tmm = px.line(
-        df_data,
-        x='year',
-        y='TMM',
-        color='Z_GEO',
-        title="Température Moyenne Annuelle (TMM) par micro-climat",
-        labels={'TMM': 'TMM (°C)', 'year': 'Année','Z_GEO' : 'micro-climat'},
-        color_discrete_map=get_couleurs_zones(),
-        template='plotly_white'
-    )
-    fig_tmm.update_layout(height=height)
-    st.plotly_chart(fig_tmm, use_container_width=True)
+    with span("figure_tmm"):
+        fig_tmm = figure_tmm(df_tmm)
+    with span("st.plotly_chart"):
+        st.plotly_chart(fig_tmm, use_container_width=True)
 
     # --- 2. GRAPHIQUE DES PRÉCIPITATIONS ANNUELLES ---
-    
-    fig_precip = px.line(
-        df_data,
-        x='year',
-        y='RRMX',
-        color='Z_GEO',
-        title = "Hauteur moyenne de Précipitations Annuelle (RRM) par micro-climat",
-        labels={'RRMX': 'RRM (mm)', 'year': 'Année','Z_GEO' : 'micro-climat'},
-        color_discrete_map=get_couleurs_zones(),
-        template='plotly_white'
-    )
-    fig_precip.update_layout(height=height)
-    st.plotly_chart(fig_precip, use_container_width=True)
+    with span("figure_precipitations"):
+        fig_precip = figure_precipitations(df_precip)
+    with span("st.plotly_chart"):
+        st.plotly_chart(fig_precip, use_container_width=True)
+
+finish_rerun()
@@ -0,0 +1,53 @@
+"""
+Normales climatiques (moyennes de référence) et écarts à la normale.
+
+`get_climatologie` calcule la normale sur un DataFrame déjà chargé (par exemple
+pour des regroupements de zones propres à une page), mise en cache tant que les
+données ne changent pas. Les normales stockées par dbt (`mart_climatologies`) ne
+servent qu'à la baseline de `mart_projection_2100`.
+
+`anomalies` retrouve la normale de chaque ligne par une recherche d'index
+vectorisée (pas de `groupby().transform` ni de `.apply` ligne à ligne) : les
+interactions (curseurs, sélecteurs) ne recalculent jamais de normale.
+"""
+import pandas as pd
+import streamlit as st
+
+# Période de référence des normales (identique aux vars dbt periode_reference_*)
+PERIODE_REFERENCE = (1991, 2020)
+
+
+def _liste(colonnes):
+    return [colonnes] if isinstance(colonnes, str) else list(colonnes)
+
+
+def calcule_climatologie(df, par, colonnes, x="ANNEE", periode=PERIODE_REFERENCE):
+    """
+    Normale de chaque colonne pour chaque groupe de `par` (moyenne sur `periode`,
+    toute la période si None). Retourne un DataFrame indexé par `par`.
+    """
+    if periode is not None:
+        df = df[pd.to_numeric(df[x]).between(*periode)]
+    return df.groupby(_liste(par), observed=True)[_liste(colonnes)].mean()
+
+
+@st.cache_data(show_spinner=False)
+def get_climatologie(df, par, colonnes, x="ANNEE", periode=PERIODE_REFERENCE):
+    return calcule_climatologie(df, par, colonnes, x, periode)
+
+
+def anomalies(df, normales, par, colonne):
+    """
+    Écart de `colonne` à la normale du groupe de chaque ligne.
+    `normales` : Série (ou DataFrame contenant `colonne`) indexée par `par`.
+    """
+    if isinstance(normales, pd.DataFrame):
+        normales = normales[colonne]
+    par = _liste(par)
+    if len(par) == 1:
+        # Clés comparées en texte (catégories, entiers ou chaînes selon la source)
+        normales = normales.set_axis(normales.index.astype(str))
+        cles = pd.Index(df[par[0]].astype(str))
+    else:
+        cles = pd.MultiIndex.from_frame(df[par])
+    return df[colonne].to_numpy() - normales.reindex(cles).to_numpy()
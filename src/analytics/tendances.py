@@ -0,0 +1,150 @@
+"""
+Tendances linéaires des séries annuelles, calculées pour toutes les séries en une fois.
+
+Les séries (une par zone et par indicateur) sont placées dans une matrice
+années × séries (NaN pour les années manquantes) et chaque estimateur est
+calculé en une seule opération NumPy sur toutes les colonnes :
+
+- pente des moindres carrés (OLS), ordonnée à l'origine et intervalle de confiance ;
+- pente de Sen (médiane des pentes entre toutes les paires d'années) ;
+- test de Mann-Kendall (statistique S, score z et p-valeur bilatérale), avec la
+  correction de variance des ex aequo (nombres de jours, moyennes arrondies).
+
+`get_tendances` met le résultat en cache (`st.cache_data`) : il n'est recalculé
+que si le contenu du DataFrame change, c'est-à-dire à chaque nouvelle version
+des données.
+"""
+import math
+import warnings
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Quantile de la loi normale pour un intervalle de confiance à 95 %
+Z_95 = 1.959963984540054
+RESULTATS = ["n", "pente", "ordonnee", "pente_min", "pente_max", "pente_sen", "mk_s", "mk_z", "mk_p"]
+
+
+def quantile_student(z, dof):
+    # Développement de Cornish-Fisher du quantile de Student à partir de celui de la loi normale
+    # (erreur < 1 % dès 5 degrés de liberté, sans dépendre de scipy)
+    dof = np.asarray(dof, dtype="float64")
+    return (
+        z
+        + (z ** 3 + z) / (4 * dof)
+        + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * dof ** 2)
+        + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * dof ** 3)
+    )
+
+
+def ols(x, y, z=Z_95):
+    """
+    Régression linéaire de chaque colonne de `y` (années × séries) sur `x`.
+    Retourne un dict de tableaux (une valeur par série) : n, pente, ordonnee,
+    pente_min, pente_max (intervalle de confiance).
+    """
+    x = np.asarray(x, dtype="float64")[:, None]
+    y = np.asarray(y, dtype="float64")
+    mask = ~np.isnan(y)
+    n = mask.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_moy = np.where(mask, x, 0).sum(axis=0) / n
+        y_moy = np.nansum(y, axis=0) / n
+        dx = np.where(mask, x - x_moy, 0)
+        dy = np.where(mask, y - y_moy, 0)
+        sxx = (dx ** 2).sum(axis=0)
+        pente = (dx * dy).sum(axis=0) / sxx
+        ordonnee = y_moy - pente * x_moy
+        residus = np.where(mask, dy - pente * dx, 0)
+        erreur = np.sqrt((residus ** 2).sum(axis=0) / (n - 2) / sxx)
+        marge = quantile_student(z, n - 2) * erreur
+    # Moins de 3 points : pas d'intervalle de confiance
+    marge = np.where(n > 2, marge, np.nan)
+    return {
+        "n": n,
+        "pente": pente,
+        "ordonnee": ordonnee,
+        "pente_min": pente - marge,
+        "pente_max": pente + marge,
+    }
+
+
+def _paires(x, y):
+    # Différences entre toutes les paires d'années i < j : (paires × séries)
+    i, j = np.triu_indices(len(x), k=1)
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    return x[j] - x[i], y[j] - y[i]
+
+
+def sen(x, y):
+    """Pente de Sen de chaque colonne de `y` (NaN ignorés)."""
+    dx, dy = _paires(x, y)
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        # Série sans paire valide : NaN, sans avertissement
+        warnings.simplefilter("ignore", RuntimeWarning)
+        pentes = np.where(dx[:, None] != 0, dy / dx[:, None], np.nan)
+        return np.nanmedian(pentes, axis=0)
+
+
+def mann_kendall(x, y):
+    """Test de Mann-Kendall de chaque colonne de `y` : dict de tableaux s, z, p."""
+    y = np.asarray(y, dtype="float64")
+    _, dy = _paires(x, y)
+    s = np.nansum(np.sign(dy), axis=0)
+    n = (~np.isnan(y)).sum(axis=0).astype("float64")
+    # Ex aequo : somme de t(t-1)(2t+5) par groupe de t valeurs égales, soit pour chaque
+    # valeur (c - 1)(2c + 5) où c est le nombre de valeurs égales de sa série (elle comprise)
+    egales = (y[:, None, :] == y[None, :, :]).sum(axis=1)
+    ex_aequo = np.where(egales > 0, (egales - 1) * (2 * egales + 5), 0).sum(axis=0)
+    variance = (n * (n - 1) * (2 * n + 5) - ex_aequo) / 18
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = np.where(s > 0, s - 1, np.where(s < 0, s + 1, 0)) / np.sqrt(variance)
+    p = np.array([math.erfc(abs(v) / math.sqrt(2)) if np.isfinite(v) else np.nan for v in z])
+    return {"s": s, "z": z, "p": p}
+
+
+def calcule_tendances(df, x, colonnes, par=None, z=Z_95):
+    """
+    Tendances de chaque indicateur de `colonnes` pour chaque groupe de `par`.
+    Retourne un DataFrame : [par], indicateur, n, pente, ordonnee, pente_min,
+    pente_max, pente_sen, mk_s, mk_z, mk_p.
+    """
+    if isinstance(colonnes, str):
+        colonnes = [colonnes]
+    if par is None:
+        large = df.groupby(x)[colonnes].mean()
+        cles = pd.DataFrame({"indicateur": colonnes})
+    else:
+        # Matrice années × (groupe, indicateur)
+        large = df.pivot_table(index=x, columns=par, values=colonnes, aggfunc="mean", observed=True)
+        cles = large.columns.to_frame(index=False)
+        cles.columns = ["indicateur", par]
+        cles = cles[[par, "indicateur"]]
+    large = large.sort_index()
+    annees = pd.to_numeric(pd.Series(large.index)).to_numpy()
+    valeurs = large.to_numpy(dtype="float64")
+
+    resultats = ols(annees, valeurs, z)
+    resultats["pente_sen"] = sen(annees, valeurs)
+    mk = mann_kendall(annees, valeurs)
+    resultats.update({"mk_s": mk["s"], "mk_z": mk["z"], "mk_p": mk["p"]})
+    return pd.concat([cles.reset_index(drop=True), pd.DataFrame(resultats)], axis=1)
+
+
+@st.cache_data(show_spinner=False)
+def get_tendances(df, x, colonnes, par=None):
+    """Version mise en cache de `calcule_tendances` (recalcul si les données changent)."""
+    return calcule_tendances(df, x, colonnes, par)
+
+
+def droites(tendances, annees, x="annee"):
+    """Valeurs ajustées (OLS) de chaque tendance pour les années données, format long."""
+    annees = np.asarray(annees, dtype="float64")
+    valeurs = tendances["ordonnee"].to_numpy()[:, None] + tendances["pente"].to_numpy()[:, None] * annees
+    cles = [c for c in tendances.columns if c not in RESULTATS]
+    df = tendances.loc[tendances.index.repeat(len(annees)), cles].reset_index(drop=True)
+    df[x] = np.tile(annees, len(tendances))
+    df["tendance"] = valeurs.ravel()
+    return df
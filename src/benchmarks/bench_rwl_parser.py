@@ -0,0 +1,112 @@
+"""
+Benchmark : lecture des fichiers simu_RWL*.txt.
+
+Compare l'approche du notebook `chloe_explo_simu.ipynb` (`extraire_csv` :
+readlines + split manuel + CSV intermédiaire relu par `pd.read_csv`, un fichier
+par horizon) à `ingestion.rwl.read_rwl_files` (Arrow direct, trois horizons en
+un appel), sur des fichiers synthétiques au format DRIAS.
+
+    python -m benchmarks.bench_rwl_parser --points 20000 --repeat 3
+"""
+import argparse
+import csv
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ingestion.rwl import read_rwl_files
+
+INDICATEURS = [
+    "NORTMm", "NORCDDcold24", "NORCDDcold25", "NORCDDcold26", "NORCDDcold27", "NORETR", "NORDTRm", "NORSU",
+    "NORTX26D", "NORTX27D", "NORTN24D", "NORTN25D", "NORTN26D", "NORTNn", "NORTNx", "NORTR", "NORTR25D",
+    "NORTX31D", "NORTX32D", "NORTX33D", "NORTX34D", "NORTX35D", "NORTX36D", "NORTX40D", "NORTXn", "NORTXx",
+    "NORGD10", "NORPXCWD", "NORPXCDD", "NORPRCPTOT", "NORRR10D", "NORRR20D", "NORRR50D", "NORRR100D",
+    "NORRR200D", "NORRR300D", "NORRR400D", "NORRRq95refTOT", "NORRRq99refTOT", "NORRx1D", "NORRx5D", "NORSDII",
+]
+HORIZONS = ["RWL15", "RWL20", "RWL29"]
+
+
+def ecrire_fichier_rwl(path, horizon, nb_points, rng):
+    # 59 lignes de commentaires, la ligne des colonnes (ligne 60), une ligne vide, les données (ligne 62)
+    colonnes = ["Point", "Latitude", "Longitude", "Contexte", "Période"] + INDICATEURS
+    valeurs = rng.uniform(0, 500, size=(nb_points, len(INDICATEURS))).round(2)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(59):
+            f.write(f"# Métadonnées DRIAS ligne {i + 1}\n")
+        f.write("# " + ";".join(colonnes) + ";\n\n")
+        for i in range(nb_points):
+            debut = f"{200000 + i};{-21.38 + (i % 40) * 0.03:.2f};{55.2 + (i // 40) * 0.03:.2f};SSP585;{horizon};"
+            f.write(debut + ";".join(map(str, valeurs[i])) + ";\n")
+
+
+# Copie de la fonction du notebook (référence)
+def extraire_csv(file_in, file_out, ligne_colonnes=60, ligne_donnees=62):
+    with open(file_in, "r", encoding="utf-8") as f:
+        lignes = f.readlines()
+    ligne_col = lignes[ligne_colonnes - 1].strip()
+    if ligne_col.startswith("# "):
+        ligne_col = ligne_col[2:]
+    colonnes = ligne_col.rstrip(";").split(";")
+    data = []
+    for ligne in lignes[ligne_donnees - 1:]:
+        ligne = ligne.strip()
+        if ligne == "":
+            continue
+        data.append(ligne.rstrip(";").split(";"))
+    with open(file_out, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile, delimiter=";")
+        writer.writerow(colonnes)
+        writer.writerows(data)
+
+
+def approche_notebook(fichiers, tmp_dir):
+    frames = []
+    for fichier in fichiers:
+        file_out = Path(tmp_dir) / (Path(fichier).stem + ".csv")
+        extraire_csv(fichier, file_out)
+        frames.append(pd.read_csv(file_out, delimiter=";"))
+    return pd.concat(frames, ignore_index=True)
+
+
+def approche_arrow(fichiers):
+    return read_rwl_files(fichiers).to_pandas()
+
+
+def chronometrer(fonction, repeat):
+    durees = []
+    for _ in range(repeat):
+        debut = time.perf_counter()
+        resultat = fonction()
+        durees.append(time.perf_counter() - debut)
+    return min(durees), resultat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--points", type=int, default=20000, help="Nombre de points de grille par horizon")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fichiers = []
+        for horizon in HORIZONS:
+            path = Path(tmp_dir) / f"simu_{horizon}.txt"
+            ecrire_fichier_rwl(path, horizon, args.points, rng)
+            fichiers.append(path)
+
+        t_notebook, df_notebook = chronometrer(lambda: approche_notebook(fichiers, tmp_dir), args.repeat)
+        t_arrow, df_arrow = chronometrer(lambda: approche_arrow(fichiers), args.repeat)
+
+    assert len(df_notebook) == len(df_arrow)
+    np.testing.assert_allclose(df_notebook["NORTX32D"].to_numpy(), df_arrow["NORTX32D"].to_numpy())
+    print(f"{len(df_arrow)} lignes ({args.points} points x {len(HORIZONS)} horizons)")
+    print(f"notebook (extraire_csv + read_csv) : {t_notebook * 1000:8.1f} ms")
+    print(f"ingestion.rwl (Arrow direct)       : {t_arrow * 1000:8.1f} ms  (x{t_notebook / t_arrow:.1f})")
+
+
+if __name__ == "__main__":
+    main()
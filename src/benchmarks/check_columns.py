@@ -0,0 +1,173 @@
+"""
+Vérification des colonnes chargées par les pages.
+
+Les octets facturés par BigQuery (et le volume transféré) sont proportionnels
+aux colonnes lues : chaque page doit déclarer les colonnes dont elle a besoin
+(`get_climat_annuel(COLONNES, filtres)`) plutôt que de tout charger.
+
+Analyse statique de chaque page : pour chaque accesseur du data layer appelé
+(`data_layer.bigquery.get_*`, `data_layer.store.get_store`), les colonnes
+chargées sont celles passées en `columns` (littéral ou constante du module), à
+défaut toutes les colonnes de la requête du registre (`SELECT *`). Une colonne
+est considérée utilisée si son nom apparaît (chaîne, encodage altair `"col:Q"`
+ou attribut `df.col`) dans la page ou dans les modules `charts.*` /
+`analytics.*` qu'elle importe. Une page qui affiche un DataFrame entier
+(`st.dataframe(df)`) utilise toutes les colonnes qu'elle charge.
+
+Le script liste les colonnes chargées mais jamais utilisées, ainsi que les
+appels dont la projection diffère de celle préchargée au démarrage
+(`Query.prefetch_columns` / `prefetch_filters` : sinon, le préchargement ne sert
+pas la page), et sort en erreur s'il en trouve.
+
+    python -m benchmarks.check_columns
+    python -m benchmarks.check_columns --pages 1_Climat
+"""
+import argparse
+import ast
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1]
+PAGES = [SRC_DIR / "1_Climat_de_La_Reunion.py"] + sorted((SRC_DIR / "pages").glob("*.py"))
+# Modules dont les noms de colonnes comptent comme utilisés par la page qui les importe
+LOCAL_PACKAGES = ("charts", "analytics")
+# Affichages de tableaux : un DataFrame passé tel quel montre toutes ses colonnes
+TABLE_DISPLAYS = ("dataframe", "table", "data_editor")
+
+
+def parse(path):
+    return ast.parse(Path(path).read_text(encoding="utf-8"), filename=str(path))
+
+
+def accessor_queries():
+    """Accesseur de `data_layer.bigquery` -> nom de la requête du registre (`run_named("...")`)."""
+    queries = {}
+    for node in parse(SRC_DIR / "data_layer" / "bigquery.py").body:
+        if not isinstance(node, ast.FunctionDef) or not node.name.startswith("get_"):
+            continue
+        for call in ast.walk(node):
+            if (isinstance(call, ast.Call) and isinstance(call.func, ast.Name)
+                    and call.func.id == "run_named" and call.args
+                    and isinstance(call.args[0], ast.Constant)):
+                queries[node.name] = call.args[0].value
+                break
+    return queries
+
+
+def module_constants(tree):
+    # Constantes du module (COLONNES = ("year", ...)) utilisables comme `columns`
+    constants = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            try:
+                constants[node.targets[0].id] = ast.literal_eval(node.value)
+            except ValueError:
+                continue
+    return constants
+
+
+def names_used(tree):
+    used = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            used.add(node.value)
+            used.add(node.value.split(":")[0])
+        elif isinstance(node, ast.Attribute):
+            used.add(node.attr)
+    return used
+
+
+def displays_whole_frame(tree):
+    # st.dataframe(df) ou st.dataframe(df.head(10)), sans sélection de colonnes
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                and node.func.attr in TABLE_DISPLAYS and node.args):
+            frame = node.args[0]
+            if isinstance(frame, ast.Call) and isinstance(frame.func, ast.Attribute) and frame.func.attr == "head":
+                frame = frame.func.value
+            if isinstance(frame, ast.Name):
+                return True
+    return False
+
+
+def local_imports(tree):
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module and node.module.split(".")[0] in LOCAL_PACKAGES:
+            path = SRC_DIR.joinpath(*node.module.split(".")).with_suffix(".py")
+            if path.exists():
+                yield path
+
+
+def call_argument(call, position, keyword, constants):
+    """Valeur littérale d'un argument d'appel (ou constante du module), None à défaut."""
+    argument = call.args[position] if len(call.args) > position else None
+    for kw in call.keywords:
+        if kw.arg == keyword:
+            argument = kw.value
+    if argument is None:
+        return None
+    if isinstance(argument, ast.Name):
+        return constants.get(argument.id)
+    try:
+        return ast.literal_eval(argument)
+    except ValueError:
+        return None
+
+
+def check_page(path, accessors, registry):
+    """Problèmes (page, ligne, message) des appels d'accesseurs d'une page."""
+    tree = parse(path)
+    whole_frame = displays_whole_frame(tree)
+    constants = module_constants(tree)
+    used = names_used(tree)
+    for module in local_imports(tree):
+        used |= names_used(parse(module))
+
+    findings = []
+    for call in ast.walk(tree):
+        if not isinstance(call, ast.Call) or not isinstance(call.func, ast.Name):
+            continue
+        name = call.func.id
+        if name == "get_store" and call.args and isinstance(call.args[0], ast.Constant):
+            query, columns, filters = registry.get(call.args[0].value), None, None
+        elif name in accessors:
+            query = registry.get(accessors[name])
+            columns = call_argument(call, 0, "columns", constants)
+            filters = call_argument(call, 1, "filters", constants)
+        else:
+            continue
+        unused = [column for column in columns or query.columns if column not in used]
+        if unused and not whole_frame:
+            findings.append((path.name, call.lineno,
+                             f"'{query.name}' charge des colonnes inutilisées : {', '.join(unused)}"))
+        if query.prefetch and (
+            tuple(columns or ()) != tuple(query.prefetch_columns or ())
+            or (filters or {}) != (query.prefetch_filters or {})
+        ):
+            findings.append((path.name, call.lineno,
+                             f"'{query.name}' : projection différente de celle préchargée (prefetch_columns / prefetch_filters)"))
+    return findings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Colonnes chargées mais inutilisées par les pages.")
+    parser.add_argument("--pages", nargs="*", help="Préfixes des pages à vérifier (défaut : toutes)")
+    args = parser.parse_args(argv)
+
+    if str(SRC_DIR) not in sys.path:
+        sys.path.insert(0, str(SRC_DIR))
+    from data_layer.queries import REGISTRY
+
+    accessors = accessor_queries()
+    pages = [p for p in PAGES if not args.pages or any(p.name.startswith(prefix) for prefix in args.pages)]
+    findings = [finding for page in pages for finding in check_page(page, accessors, REGISTRY)]
+    for page, line, message in findings:
+        print(f"{page}:{line}: {message}")
+    if findings:
+        print(f"\n✗ {len(findings)} problème(s) de projection.")
+        sys.exit(1)
+    print(f"✓ {len(pages)} page(s) : aucune colonne chargée inutilement.")
+
+
+if __name__ == "__main__":
+    main()
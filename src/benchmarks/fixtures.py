@@ -0,0 +1,159 @@
+"""
+Jeu de données synthétique au format snapshot (moteur DuckDB local).
+
+Génère, pour un nombre de stations donné, toutes les tables lues par les requêtes
+du registre (`data_layer.queries`) avec les mêmes colonnes que les marts dbt :
+`<sortie>/<dataset>/<table>.parquet`. Sert aux tests de charge et aux benchmarks,
+sans accès à BigQuery.
+
+    python -m benchmarks.fixtures --output ../data/fixtures/snapshot --stations 40
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_layer.queries import CUBE_INDICATEURS
+
+ZONES = ["AV_C", "AV_H", "SV_C", "SV_H"]
+CLIMATS = {"AV_C": "Af", "AV_H": "Cfb", "SV_C": "Aw", "SV_H": "Am"}
+SCENARIOS = ["+1.5°C", "+2.0°C", "+2.9°C"]
+ANNEES = range(1952, 2026)
+# Cube d'agrégats : agrégation annuelle des indicateurs mensuels (cumul par défaut)
+MOYENNES = ["TM", "TX", "TN"]
+MAXIMUMS = ["RRAB"]
+
+
+def write(out_dir, dataset, table, df):
+    path = Path(out_dir) / dataset
+    path.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(path / f"{table}.parquet", index=False)
+
+
+def build_cube(mensuel, rng):
+    """Cube d'agrégats (mêmes règles que le modèle dbt mart_cube_climat)."""
+    mensuel = mensuel.copy()
+    for indicateur in CUBE_INDICATEURS:
+        if indicateur not in mensuel:
+            mensuel[indicateur] = rng.poisson(2, len(mensuel)).astype(float)
+    mensuel["TX"] = mensuel["TM"] + 5
+    mensuel["TN"] = mensuel["TM"] - 5
+    dims = ["NUM_POSTE", "Z_CLIM", "Z_GEO"]
+    indicateurs = list(CUBE_INDICATEURS)
+    regles = {i: "mean" if i in MOYENNES else "max" if i in MAXIMUMS else "sum" for i in indicateurs}
+    annee = mensuel.groupby(dims + ["ANNEE"], as_index=False).agg(regles).assign(MOIS=0)
+    decennie = annee.assign(ANNEE=annee["ANNEE"] // 10 * 10).groupby(dims + ["ANNEE"], as_index=False)[indicateurs].mean()
+    stations = pd.concat([
+        mensuel[dims + ["ANNEE", "MOIS"] + indicateurs].assign(grain="mois"),
+        annee.assign(grain="annee"),
+        decennie.assign(grain="decennie", MOIS=0),
+    ], ignore_index=True)
+    niveaux = [stations.assign(niveau="station", nb_stations_temperature=1, nb_stations_pluie=1)]
+    for niveau, cles in (("zone_climat", ["Z_CLIM", "Z_GEO"]), ("zone", ["Z_GEO"]), ("ile", [])):
+        groupes = ["grain", "ANNEE", "MOIS"] + cles
+        df = stations.groupby(groupes, as_index=False)[indicateurs].mean()
+        nb = stations.groupby(groupes, as_index=False)["NUM_POSTE"].nunique()["NUM_POSTE"]
+        niveaux.append(df.assign(niveau=niveau, nb_stations_temperature=nb, nb_stations_pluie=nb))
+    colonnes = ["niveau", "grain", "NUM_POSTE", "Z_CLIM", "Z_GEO", "ANNEE", "MOIS",
+                "nb_stations_temperature", "nb_stations_pluie"] + indicateurs
+    cube = pd.concat(niveaux, ignore_index=True).reindex(columns=colonnes)
+    cube["NUM_POSTE"] = cube["NUM_POSTE"].astype("Int64")
+    return cube
+
+
+def build_snapshot(out_dir, nb_stations=40, seed=0):
+    """Écrit le snapshot synthétique dans `out_dir` et retourne son chemin."""
+    rng = np.random.default_rng(seed)
+    stations = pd.DataFrame({"NUM_POSTE": 97401000 + np.arange(nb_stations)})
+    stations["Z_GEO"] = [ZONES[i % len(ZONES)] for i in range(nb_stations)]
+    stations["Z_CLIM"] = stations["Z_GEO"].map(CLIMATS)
+    stations["LAT"] = -21.1 + rng.normal(0, 0.1, nb_stations)
+    stations["LON"] = 55.5 + rng.normal(0, 0.1, nb_stations)
+
+    # Séries mensuelles par station, à partir desquelles les tables annuelles sont agrégées
+    mensuel = pd.MultiIndex.from_product(
+        [stations["NUM_POSTE"], ANNEES, range(1, 13)], names=["NUM_POSTE", "ANNEE", "MOIS"]
+    ).to_frame(index=False)
+    mensuel = mensuel.merge(stations[["NUM_POSTE", "Z_GEO", "Z_CLIM"]])
+    n = len(mensuel)
+    tendance = (mensuel["ANNEE"] - ANNEES[0]) / len(ANNEES)
+    saison_cyclonique = mensuel["MOIS"].isin([1, 2, 3])
+    mensuel["TM"] = rng.normal(22, 3, n) + tendance
+    mensuel["RR"] = rng.gamma(2, 100, n) * np.where(saison_cyclonique, 2, 1)
+    mensuel["RRAB"] = rng.gamma(2, 30, n)
+    mensuel["NBJRR100"] = rng.poisson(np.where(saison_cyclonique, 1.2, 0.2)).astype(float)
+    mensuel["NBJTNS20"] = rng.poisson(4 + 4 * tendance)
+    mensuel["NBJTXS32"] = rng.poisson(1.5 + 2 * tendance)
+
+    annuel = mensuel.groupby(["NUM_POSTE", "Z_GEO", "Z_CLIM", "ANNEE"], as_index=False).agg(
+        TMM=("TM", "mean"), RRMX=("RR", "sum"), NBJTNS20=("NBJTNS20", "sum"), NBJTXS32=("NBJTXS32", "sum")
+    )
+    annuel["NBJFXI3S16X"] = rng.gamma(2, 10, len(annuel))
+
+    geo = annuel.rename(columns={"ANNEE": "year"})[["NUM_POSTE", "Z_GEO", "year", "TMM", "RRMX", "NBJFXI3S16X"]]
+    write(out_dir, "data_meteofrance", "histo_simu_geo", geo)
+    write(out_dir, "data_meteofrance", "mart_climat_annuel", geo)
+    write(out_dir, "data_meteofrance", "histo_simu_ann", geo.groupby("year", as_index=False)["TMM"].mean())
+
+    precip = mensuel.groupby(["ANNEE", "MOIS"], as_index=False).agg(
+        Cumul_Mensuel_Pluie_Total=("RR", "mean"), Cumul_MAxi_par_mois=("RRAB", "mean"),
+        Nb_Jours_Sup_100mm=("NBJRR100", "mean"),
+    ).rename(columns={"ANNEE": "annee", "MOIS": "mois"})
+    precip["date_key"] = pd.to_datetime(dict(year=precip["annee"], month=precip["mois"], day=1)).dt.date
+    precip = precip[precip["Nb_Jours_Sup_100mm"] > 1]
+    write(out_dir, "data_meteofrance", "mart_precip_sup_100mm", precip[
+        ["annee", "mois", "date_key", "Cumul_Mensuel_Pluie_Total", "Cumul_MAxi_par_mois", "Nb_Jours_Sup_100mm"]
+    ])
+
+    nuits = annuel.groupby(["ANNEE", "Z_GEO"], as_index=False).agg(
+        moy_nuits_ge_20=("NBJTNS20", "mean"), nb_stations=("NUM_POSTE", "nunique")
+    )
+    write(out_dir, "data_meteofrance", "int_mensq_temperatures_sup_20deg", nuits)
+    write(out_dir, "data_meteofrance", "mart_nuits_sup_20deg_par_zone",
+          nuits.rename(columns={"Z_GEO": "zone_geographique"}))
+
+    chauds = annuel.groupby(["ANNEE", "Z_CLIM", "Z_GEO"], as_index=False).agg(
+        moyenne_jours_chauds_zone=("NBJTXS32", "mean"), nombre_stations_incluses=("NUM_POSTE", "nunique")
+    )
+    write(out_dir, "data_meteofrance", "mart_jours_chauds_par_zone", chauds)
+
+    # Projection 2100 par scénario (baseline : normale 1991-2020)
+    reference = annuel[annuel["ANNEE"].between(1991, 2020)]
+    baseline = reference.groupby(["Z_CLIM", "Z_GEO"], as_index=False)["NBJTXS32"].mean()
+    centres = stations.groupby("Z_GEO", as_index=False)[["LAT", "LON"]].mean()
+    projection = pd.DataFrame(
+        [(scenario, zone) for scenario in SCENARIOS for zone in ZONES], columns=["Scenario", "Z_GEO"]
+    ).merge(baseline).merge(centres)
+    projection["delta_projection_2100"] = rng.gamma(4, 2.5, len(projection))
+    projection = projection.rename(columns={
+        "NBJTXS32": "baseline_jours_chauds_zone", "LAT": "latitude_centre", "LON": "longitude_centre"
+    })
+    projection["jours_chauds_projete_2100"] = projection["baseline_jours_chauds_zone"] + projection["delta_projection_2100"]
+    projection["ANNEE_HORIZON"] = 2100
+    write(out_dir, "data_meteofrance", "mart_projection_2100", projection[[
+        "ANNEE_HORIZON", "Scenario", "Z_CLIM", "Z_GEO", "latitude_centre", "longitude_centre",
+        "baseline_jours_chauds_zone", "jours_chauds_projete_2100", "delta_projection_2100",
+    ]])
+
+    write(out_dir, "data_meteofrance", "mart_cube_climat", build_cube(mensuel, rng))
+
+    points = pd.DataFrame({"Point": 200000 + np.arange(nb_stations * 25)})
+    points["Latitude"] = -21.1 + rng.normal(0, 0.12, len(points))
+    points["Longitude"] = 55.5 + rng.normal(0, 0.15, len(points))
+    points["Z_GEO"] = rng.choice(ZONES, len(points))
+    write(out_dir, "data_meteofrance", "points_zones", points)
+    return Path(out_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génération d'un snapshot synthétique pour le moteur DuckDB.")
+    parser.add_argument("--output", required=True, help="Répertoire du snapshot")
+    parser.add_argument("--stations", type=int, default=40, help="Nombre de stations simulées")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    print(f"✓ snapshot synthétique -> {build_snapshot(args.output, args.stations, args.seed)}")
+
+
+if __name__ == "__main__":
+    main()
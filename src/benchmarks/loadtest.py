@@ -0,0 +1,191 @@
+"""
+Test de charge hors ligne de l'application Streamlit multipage.
+
+Des utilisateurs virtuels (threads) ouvrent les pages via `streamlit.testing.v1.AppTest`
+et rejouent des interactions (curseur d'année, sélection de zone ou de scénario),
+avec le moteur DuckDB sur un snapshot local (synthétique par défaut, voir
+`benchmarks.fixtures`) : ni BigQuery ni navigateur ne sont nécessaires.
+
+Pour chaque niveau de concurrence, le rapport donne les latences de rerun
+(p50 / p95 / p99), le débit (reruns par seconde), la mémoire par session
+(hausse de la RSS du processus divisée par le nombre de sessions ouvertes) et
+le nombre d'erreurs.
+
+    python -m benchmarks.loadtest --concurrency 1 2 4 8 --iterations 5
+    python -m benchmarks.loadtest --snapshot ../data/snapshot --pages 2_Temperatures --json rapport.json
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+SRC_DIR = Path(__file__).resolve().parents[1]
+PAGES = [SRC_DIR / "1_Climat_de_La_Reunion.py"] + sorted((SRC_DIR / "pages").glob("*.py"))
+TIMEOUT = 120
+
+
+def rss_bytes():
+    # RSS courante (Linux) ; à défaut, pic de RSS du processus
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+# --- Interactions rejouées après le premier affichage de chaque page ---
+def interactions_temperatures_jour(at, rng):
+    slider = at.sidebar.slider[0]
+    yield lambda: slider.set_value(rng.randint(int(slider.min), int(slider.max))).run()
+    selectbox = at.sidebar.selectbox[0]
+    yield lambda: selectbox.set_value(rng.choice(selectbox.options)).run()
+
+
+def interactions_simulation(at, rng):
+    selectbox = at.sidebar.selectbox[0]
+    for _ in range(2):
+        yield lambda: selectbox.set_value(rng.choice(selectbox.options)).run()
+
+
+def interactions_rerun(at, rng):
+    yield at.run
+
+
+INTERACTIONS = {
+    "2_Temperatures de jour": interactions_temperatures_jour,
+    "5_Simulation_temperature_extreme_2100": interactions_simulation,
+}
+
+
+class Results:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = []
+        self.errors = []
+        self.sessions = []
+
+    def add(self, latency, page, at):
+        with self._lock:
+            self.latencies.append(latency)
+            if at.exception or at.error:
+                messages = [e.value for e in at.exception] + [e.value for e in at.error]
+                self.errors.append(f"{page}: {messages[0]}")
+
+    def keep(self, at):
+        # Les sessions restent ouvertes jusqu'à la mesure mémoire du niveau
+        with self._lock:
+            self.sessions.append(at)
+
+
+def timed(action):
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def virtual_user(pages, iterations, seed, results):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    for _ in range(iterations):
+        page = rng.choice(pages)
+        at = AppTest.from_file(str(page), default_timeout=TIMEOUT)
+        results.add(timed(at.run), page.stem, at)
+        if at.exception:
+            continue
+        for action in INTERACTIONS.get(page.stem, interactions_rerun)(at, rng):
+            results.add(timed(action), page.stem, at)
+        results.keep(at)
+
+
+def run_level(pages, concurrency, iterations, seed):
+    results = Results()
+    rss_before = rss_bytes()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(virtual_user, pages, iterations, seed + i, results) for i in range(concurrency)
+        ]
+        for future in futures:
+            future.result()
+    duration = time.perf_counter() - start
+    latencies = np.array(results.latencies) * 1000
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (np.nan,) * 3
+    return {
+        "concurrency": concurrency,
+        "reruns": len(latencies),
+        "errors": len(results.errors),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "reruns_per_s": len(latencies) / duration,
+        "mb_per_session": max(rss_bytes() - rss_before, 0) / max(len(results.sessions), 1) / 1024 ** 2,
+        "first_errors": results.errors[:3],
+    }
+
+
+def print_report(levels):
+    print(f"{'users':>5} {'reruns':>7} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'rerun/s':>8} {'MB/sess':>8}")
+    for level in levels:
+        print(
+            f"{level['concurrency']:>5} {level['reruns']:>7} {level['errors']:>4} {level['p50_ms']:>8.0f} "
+            f"{level['p95_ms']:>8.0f} {level['p99_ms']:>8.0f} {level['reruns_per_s']:>8.1f} "
+            f"{level['mb_per_session']:>8.1f}"
+        )
+        for error in level["first_errors"]:
+            print(f"      ! {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test de charge hors ligne (AppTest + moteur DuckDB).")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Niveaux de concurrence (utilisateurs simultanés)")
+    parser.add_argument("--iterations", type=int, default=5, help="Pages ouvertes par utilisateur et par niveau")
+    parser.add_argument("--pages", nargs="+", help="Pages à tester (début du nom de fichier), toutes par défaut")
+    parser.add_argument("--snapshot", help="Snapshot DuckDB existant (défaut : snapshot synthétique temporaire)")
+    parser.add_argument("--stations", type=int, default=40, help="Taille du snapshot synthétique")
+    parser.add_argument("--no-warm-up", action="store_true", help="Mesurer aussi le premier chargement (cache froid)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Écrit le rapport en JSON")
+    args = parser.parse_args(argv)
+
+    pages = [p for p in PAGES if not args.pages or any(p.stem.startswith(prefix) for prefix in args.pages)]
+    if not pages:
+        parser.error(f"Aucune page ne correspond à {args.pages}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        snapshot = args.snapshot
+        if snapshot is None:
+            from benchmarks.fixtures import build_snapshot
+            snapshot = build_snapshot(Path(tmp_dir) / "snapshot", args.stations, args.seed)
+        # Configuration lue par le data layer au premier appel (moteur, snapshot, cache isolé)
+        os.environ["PROJET_CC_BACKEND"] = "duckdb"
+        os.environ["PROJET_CC_SNAPSHOT_DIR"] = str(snapshot)
+        os.environ["PROJET_CC_CACHE_DIR"] = str(Path(tmp_dir) / "cache")
+        if str(SRC_DIR) not in sys.path:
+            sys.path.insert(0, str(SRC_DIR))
+
+        if not args.no_warm_up:
+            run_level(pages, 1, 1, args.seed)
+            for page in pages:
+                run_level([page], 1, 1, args.seed)
+        levels = [run_level(pages, level, args.iterations, args.seed) for level in args.concurrency]
+
+    print_report(levels)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"pages": [p.stem for p in pages], "levels": levels}, file, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
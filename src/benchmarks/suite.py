@@ -0,0 +1,242 @@
+"""
+Benchmarks du data layer et des étapes de construction des pages.
+
+Deux familles de mesures, sur un snapshot DuckDB local (synthétique par défaut,
+voir `benchmarks.fixtures`) :
+
+- `data.<accesseur>` : chaque accesseur sans argument de `data_layer.bigquery`
+  (découverte automatique), à froid (cache de résultats vidé : requête DuckDB
+  + écriture Parquet) et à chaud (lecture du cache disque) ;
+- `page.<étape>` : transformations pandas et construction des figures plotly /
+  altair de chaque page (`charts.*`), sur les données déjà chargées.
+
+Chaque benchmark est exécuté `--rounds` fois (temps min et médian), puis une fois
+sous `tracemalloc` (pic d'allocation). Les résultats peuvent être enregistrés comme
+référence (`--save`, un fichier par machine dans `.benchmarks/`) ; les exécutions
+suivantes sont comparées à cette référence et le script sort en erreur si le temps
+médian ou le pic d'allocation dépasse la tolérance.
+
+    python -m benchmarks.suite --save                 # enregistre la référence
+    python -m benchmarks.suite                        # compare à la référence
+    python -m benchmarks.suite --filter page. --tolerance 0.5
+"""
+import argparse
+import inspect
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1]
+BASELINE_DIR = SRC_DIR.parent / ".benchmarks"
+
+
+class Benchmark:
+    def __init__(self, name, func, setup=None):
+        self.name = name
+        self.func = func
+        self.setup = setup
+
+    def _run(self):
+        if self.setup is not None:
+            self.setup()
+        start = time.perf_counter()
+        self.func()
+        return time.perf_counter() - start
+
+    def measure(self, rounds):
+        times = [self._run() for _ in range(rounds)]
+        # Pic d'allocation mesuré à part : tracemalloc ralentit l'exécution
+        if self.setup is not None:
+            self.setup()
+        tracemalloc.start()
+        try:
+            self.func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return {
+            "min_ms": min(times) * 1000,
+            "median_ms": statistics.median(times) * 1000,
+            "peak_mb": peak / 1024 ** 2,
+        }
+
+
+# --- Accesseurs du data layer ---
+def data_benchmarks():
+    from data_layer import bigquery
+    from data_layer.cache import get_result_cache
+
+    cache = get_result_cache()
+    benchmarks = []
+    for name, func in inspect.getmembers(bigquery, inspect.isfunction):
+        if not name.startswith("get_") or func.__module__ != bigquery.__name__:
+            continue
+        if any(p.default is p.empty for p in inspect.signature(func).parameters.values()):
+            continue
+        benchmarks.append(Benchmark(f"data.{name}.cold", func, setup=cache.clear))
+        benchmarks.append(Benchmark(f"data.{name}.warm", func, setup=func))
+    return benchmarks
+
+
+# --- Étapes de construction des pages (données chargées une fois) ---
+def page_benchmarks():
+    import numpy as np
+    import pandas as pd
+
+    from analytics.climatologies import calcule_climatologie, anomalies
+    from analytics.tendances import calcule_tendances, droites
+    from charts import climat, cyclones, downsampling, simulation_2100, temperatures_jour, temperatures_nuit
+    from data_layer import bigquery
+    from data_layer.store import ColumnStore
+
+    # Page 1
+    df_climat = bigquery.get_climat_annuel(("year", "Z_GEO", "TMM", "RRMX"), {"year": ("<=", 2025)})
+    df_tmm = downsampling.series(df_climat, "year", "TMM", group="Z_GEO")
+    df_precip = downsampling.series(df_climat, "year", "RRMX", group="Z_GEO")
+
+    # Page 2
+    annuelles = bigquery.get_annuelles_par_zone()
+    resume = bigquery.get_resume_annuelles_par_zone()
+    store = ColumnStore(annuelles, ("Z_GEO", "ANNEE"))
+    serie = store.frame()
+    serie["ANNEE_DATE"] = pd.to_datetime(serie["ANNEE"].astype(str), format="%Y")
+
+    # Page 3
+    nuits = bigquery.get_nb_moy_nuits_sup_20deg_par_zone_par_annee(
+        ("ANNEE", "zone_geographique", "moy_nuits_ge_20"), {"ANNEE": (">=", 1983)})
+    groupes = {"AV_C": "Zones chaudes (AV_C + SSV_C)", "SSV_C": "Zones chaudes (AV_C + SSV_C)",
+               "AV_H": "Zones hautes (AV_H + SSV_H)", "SSV_H": "Zones hautes (AV_H + SSV_H)"}
+    nuits_groupes = nuits.assign(groupe=nuits["zone_geographique"].astype(str).map(groupes)).dropna(subset=["groupe"])
+    annees = np.sort(nuits_groupes["ANNEE"].unique())
+    tendances = calcule_tendances(nuits_groupes, "ANNEE", "moy_nuits_ge_20", "groupe")
+    lignes = droites(tendances, annees, x="ANNEE")
+    nuits_ecarts = nuits.assign(groupe=np.where(
+        nuits["zone_geographique"].isin(["AV_C", "SSV_C"]), "Zones côtières", "Zones montagneuses"
+    ))
+    moyennes = calcule_climatologie(nuits_ecarts, "groupe", "moy_nuits_ge_20", periode=None)
+
+    def ecarts():
+        df_plot = nuits_ecarts.copy()
+        df_plot["ecart_moy"] = anomalies(df_plot, moyennes, "groupe", "moy_nuits_ge_20")
+        return temperatures_nuit.figure_ecarts(df_plot)
+
+    # Page 4
+    precip = bigquery.get_detection_precip_superieure100mm()
+    par_annee = cyclones.evenements_par_annee(precip)
+
+    # Page 5
+    projection = bigquery.get_projection_2100()
+    scenario = projection[projection["Scenario"] == projection["Scenario"].iloc[0]]
+    df_long = simulation_2100.format_long(scenario)
+
+    steps = {
+        "page1.series": lambda: downsampling.series(df_climat, "year", "TMM", group="Z_GEO"),
+        "page1.figure_tmm": lambda: climat.figure_tmm(df_tmm),
+        "page1.figure_precipitations": lambda: climat.figure_precipitations(df_precip),
+        "page2.store": lambda: ColumnStore(annuelles, ("Z_GEO", "ANNEE")),
+        "page2.selection_annee": lambda: store.frame(ANNEE=int(annuelles["ANNEE"].max())),
+        "page2.chart_serie": lambda: temperatures_jour.chart_serie_temporelle(serie, "Toutes les zones").to_dict(),
+        "page2.chart_zones": lambda: temperatures_jour.chart_comparaison_zones(
+            resume[["Z_GEO", "T_moyenne_periode"]]).to_dict(),
+        "page3.tendances": lambda: calcule_tendances(nuits_groupes, "ANNEE", "moy_nuits_ge_20", "groupe"),
+        "page3.figure_tendances": lambda: temperatures_nuit.figure_tendances(nuits, lignes),
+        "page3.figure_ecarts": ecarts,
+        "page4.figure_evenements": lambda: cyclones.figure_evenements(precip),
+        "page4.evenements_par_annee": lambda: cyclones.evenements_par_annee(precip),
+        "page4.figure_par_annee": lambda: cyclones.figure_evenements_par_annee(par_annee),
+        "page4.top_evenements": lambda: cyclones.top_evenements(precip),
+        "page5.melt": lambda: simulation_2100.format_long(scenario),
+        "page5.chart_carte": lambda: simulation_2100.chart_carte_delta(scenario).to_dict(),
+        "page5.chart_comparaison": lambda: simulation_2100.chart_comparaison(df_long).to_dict(),
+    }
+    return [Benchmark(name, func) for name, func in steps.items()]
+
+
+# --- Référence et comparaison ---
+def baseline_path(path=None):
+    return Path(path) if path else BASELINE_DIR / f"{platform.node() or 'machine'}.json"
+
+
+def compare(results, baseline, tolerance):
+    """Lignes du rapport et liste des régressions (temps médian ou pic d'allocation)."""
+    lines, regressions = [], []
+    lines.append(f"{'benchmark':<58} {'min ms':>9} {'med ms':>9} {'pic MB':>8} {'réf ms':>9} {'écart':>8}")
+    for name, result in results.items():
+        reference = baseline.get(name)
+        ecart = ""
+        if reference:
+            ratio = result["median_ms"] / reference["median_ms"] if reference["median_ms"] else 1
+            ecart = f"{(ratio - 1) * 100:+.0f} %"
+            # Écarts de moins d'une milliseconde ignorés (bruit de mesure)
+            if ratio > 1 + tolerance and result["median_ms"] - reference["median_ms"] > 1:
+                regressions.append(f"{name}: {reference['median_ms']:.1f} -> {result['median_ms']:.1f} ms")
+            # Petites allocations ignorées (bruit de l'interpréteur)
+            if result["peak_mb"] > max(reference["peak_mb"] * (1 + tolerance), reference["peak_mb"] + 1):
+                regressions.append(f"{name}: {reference['peak_mb']:.1f} -> {result['peak_mb']:.1f} MB")
+        lines.append(
+            f"{name:<58} {result['min_ms']:>9.1f} {result['median_ms']:>9.1f} {result['peak_mb']:>8.2f} "
+            f"{reference['median_ms'] if reference else float('nan'):>9.1f} {ecart:>8}"
+        )
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks du data layer et des pages (moteur DuckDB).")
+    parser.add_argument("--rounds", type=int, default=5, help="Exécutions par benchmark")
+    parser.add_argument("--filter", help="Ne garde que les benchmarks dont le nom contient ce texte")
+    parser.add_argument("--snapshot", help="Snapshot DuckDB existant (défaut : snapshot synthétique temporaire)")
+    parser.add_argument("--stations", type=int, default=40, help="Taille du snapshot synthétique")
+    parser.add_argument("--baseline", help="Fichier de référence (défaut : .benchmarks/<machine>.json)")
+    parser.add_argument("--save", action="store_true", help="Enregistre les résultats comme référence")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Dégradation tolérée (0.25 = +25 %%)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        snapshot = args.snapshot
+        if snapshot is None:
+            from benchmarks.fixtures import build_snapshot
+            snapshot = build_snapshot(Path(tmp_dir) / "snapshot", args.stations)
+        # Configuration lue par le data layer au premier appel (moteur, snapshot, cache isolé)
+        os.environ["PROJET_CC_BACKEND"] = "duckdb"
+        os.environ["PROJET_CC_SNAPSHOT_DIR"] = str(snapshot)
+        os.environ["PROJET_CC_CACHE_DIR"] = str(Path(tmp_dir) / "cache")
+        if str(SRC_DIR) not in sys.path:
+            sys.path.insert(0, str(SRC_DIR))
+
+        benchmarks = data_benchmarks() + page_benchmarks()
+        benchmarks = [b for b in benchmarks if not args.filter or args.filter in b.name]
+        results = {b.name: b.measure(args.rounds) for b in benchmarks}
+
+    path = baseline_path(args.baseline)
+    baseline = {}
+    if path.exists() and not args.save:
+        baseline = json.loads(path.read_text(encoding="utf-8"))["benchmarks"]
+    lines, regressions = compare(results, baseline, args.tolerance)
+    print("\n".join(lines))
+
+    if args.save:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            "machine": platform.node(),
+            "python": platform.python_version(),
+            "rounds": args.rounds,
+            "benchmarks": results,
+        }, indent=2), encoding="utf-8")
+        print(f"✓ référence enregistrée -> {path}")
+    elif not baseline:
+        print(f"Aucune référence ({path}) : relancer avec --save pour l'enregistrer.")
+    if regressions:
+        print(f"\n✗ {len(regressions)} régression(s) au-delà de {args.tolerance:.0%} :")
+        for regression in regressions:
+            print(f"  - {regression}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Graphiques de la page « Climat de La Réunion ».
+
+Les figures attendent une ligne par micro-climat et par année
+(`charts.downsampling.series`), pas les lignes par station.
+"""
+import plotly.express as px
+
+from config.constants import get_couleurs_zones
+
+HAUTEUR = 400
+
+
+def figure_serie_par_zone(df_data, y, titre, label):
+    # Série annuelle par micro-climat (TMM, RRMX, ...)
+    fig = px.line(
+        df_data,
+        x='year',
+        y=y,
+        color='Z_GEO',
+        title=titre,
+        labels={y: label, 'year': 'Année', 'Z_GEO': 'micro-climat'},
+        color_discrete_map=get_couleurs_zones(),
+        template='plotly_white'
+    )
+    fig.update_layout(height=HAUTEUR)
+    return fig
+
+
+def figure_tmm(df_data):
+    return figure_serie_par_zone(
+        df_data, 'TMM', "Température Moyenne Annuelle (TMM) par micro-climat", 'TMM (°C)'
+    )
+
+
+def figure_precipitations(df_data):
+    return figure_serie_par_zone(
+        df_data, 'RRMX', "Hauteur moyenne de Précipitations Annuelle (RRM) par micro-climat", 'RRM (mm)'
+    )
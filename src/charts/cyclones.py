@@ -0,0 +1,55 @@
+"""
+Graphiques et tableaux de la page « Cyclones ».
+"""
+import plotly.express as px
+
+
+def figure_evenements(df_pie_chart):
+    # Graphique 1: Évolution temporelle des événements cycloniques
+    fig1 = px.scatter(
+        df_pie_chart,
+        x='date_key',
+        y='Nb_Jours_Sup_100mm',
+        size='Cumul_Mensuel_Pluie_Total',
+        color='Cumul_MAxi_par_mois',
+        hover_data=['annee', 'mois', 'Cumul_Mensuel_Pluie_Total', 'Cumul_MAxi_par_mois'],
+        title="Nombre de jours avec cumul de précipitation >100mm  par mois",
+        subtitle="Bulle = Intensité mensuelle des précipitations",
+        labels={
+            'date_key': 'Date',
+            'Nb_Jours_Sup_100mm': 'Nombre de jours avec >100mm',
+            'Cumul_Mensuel_Pluie_Total': 'Cumul mensuel (mm)',
+            'Cumul_MAxi_par_mois': 'Précipitation max 24h (mm)'
+        },
+        color_continuous_scale='Blues'
+    )
+    fig1.update_layout(height=500)
+    return fig1
+
+
+def evenements_par_annee(df_pie_chart):
+    return df_pie_chart.groupby('annee').size().reset_index(name='nombre_evenements')
+
+
+def figure_evenements_par_annee(events_per_year):
+    # Graphique 2: Distribution par année
+    fig2 = px.bar(
+        events_per_year,
+        x='annee',
+        y='nombre_evenements',
+        title="Nombre de jour réunissant des conditions cycloniques par année",
+        labels={
+            'annee': 'Année',
+            'nombre_evenements': "Nombre d'événements"
+        },
+        color='nombre_evenements',
+        color_continuous_scale='Reds'
+    )
+    fig2.update_layout(height=400)
+    return fig2
+
+
+def top_evenements(df_pie_chart, n=10):
+    return df_pie_chart.nlargest(n, 'Cumul_Mensuel_Pluie_Total')[
+        ['annee', 'mois', 'Cumul_Mensuel_Pluie_Total', 'Cumul_MAxi_par_mois', 'Nb_Jours_Sup_100mm']
+    ]
@@ -0,0 +1,83 @@
+"""
+Préparation des données des séries temporelles avant la construction des figures.
+
+Les tables annuelles sont au grain de la station : tracées telles quelles (une
+ligne par zone), elles envoient au navigateur un point par station et par année
+et dessinent des allers-retours entre stations. Deux étapes, dans l'ordre :
+
+- `agrege` : une valeur par (série, x), au grain effectivement tracé
+  (moyenne des stations de la zone pour chaque année) ;
+- `lttb` : si une série dépasse `PROJET_CC_MAX_POINTS` points (défaut 500),
+  sous-échantillonnage « Largest-Triangle-Three-Buckets » qui conserve la forme
+  de la courbe (extrema, ruptures) avec un nombre de points borné.
+
+`series` enchaîne les deux pour chaque série d'un DataFrame long.
+"""
+import numpy as np
+import pandas as pd
+
+from config.settings import get_setting
+
+
+def max_points():
+    return int(get_setting("PROJET_CC_MAX_POINTS", "max_points", 500))
+
+
+def lttb(x, y, n):
+    """
+    Indices des `n` points conservés par l'algorithme LTTB (x croissant, sans NaN).
+    Le premier et le dernier point sont toujours conservés.
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    size = len(x)
+    if n >= size or n < 3:
+        return np.arange(size)
+
+    # n - 2 seaux entre le premier et le dernier point
+    bornes = np.linspace(1, size - 1, n - 1).astype(int)
+    indices = np.empty(n, dtype=int)
+    indices[0], indices[-1] = 0, size - 1
+    precedent = 0
+    for i in range(n - 2):
+        debut, fin = bornes[i], bornes[i + 1]
+        # Sommet suivant : moyenne du seau suivant (dernier point pour le dernier seau)
+        suivant = slice(fin, bornes[i + 2]) if i + 2 < len(bornes) else slice(size - 1, size)
+        x_moy, y_moy = x[suivant].mean(), y[suivant].mean()
+        # Point du seau qui forme le plus grand triangle avec le précédent et la moyenne suivante
+        aires = np.abs(
+            (x[precedent] - x_moy) * (y[debut:fin] - y[precedent])
+            - (x[precedent] - x[debut:fin]) * (y_moy - y[precedent])
+        )
+        precedent = debut + int(np.argmax(aires))
+        indices[i + 1] = precedent
+    return indices
+
+
+def agrege(df, x, y, group=None, how="mean"):
+    """Une valeur de `y` par (`group`, `x`), triée par `x`."""
+    keys = [group, x] if group else [x]
+    return (
+        df.dropna(subset=[y])
+        .groupby(keys, observed=True, sort=True)[y]
+        .agg(how)
+        .reset_index()
+    )
+
+
+def series(df, x, y, group=None, how="mean", n=None):
+    """
+    Données prêtes à tracer : agrégées au grain (`group`, `x`) puis réduites
+    à `n` points par série au plus (défaut : `max_points()`).
+    """
+    n = n or max_points()
+    df = agrege(df, x, y, group, how)
+    if group is None:
+        return df.iloc[lttb(df[x], df[y], n)].reset_index(drop=True)
+    morceaux = [
+        serie.iloc[lttb(serie[x], serie[y], n)]
+        for _, serie in df.groupby(group, observed=True, sort=False)
+    ]
+    if not morceaux:
+        return df
+    return pd.concat(morceaux, ignore_index=True)
@@ -0,0 +1,108 @@
+"""
+Cache des figures construites, partagé par toutes les sessions du processus.
+
+Une figure est identifiée par son nom, la version du jeu de données dont elle est
+issue (`data_layer.bigquery.dataset_version`) et les valeurs des widgets qui la
+paramètrent : tant que ni les tables sources ni la sélection ne changent, un
+rerun (ou un autre utilisateur) réutilise la figure déjà construite au lieu de
+relancer `px.*` / `alt.Chart(...)`.
+
+- figures plotly : l'objet `Figure` est conservé (sa construction domine le coût,
+  la sérialisation par `st.plotly_chart` est rapide) ;
+- graphiques altair : la spécification Vega-Lite (`chart.to_dict()`) est
+  conservée et affichée avec `st.vega_lite_chart`, sans reconstruire ni
+  revalider le graphique.
+
+Les entrées sont évincées (LRU) au-delà de `PROJET_CC_FIGURE_CACHE_MB` Mo
+(taille JSON estimée à l'insertion). Les figures renvoyées sont partagées : ne
+pas les modifier après coup.
+
+    fig = cached_chart("cyclones.evenements", dataset_version("precip_sup_100mm"), (),
+                       lambda: figure_evenements(df))
+    render_chart(fig, use_container_width=True)
+"""
+import json
+import threading
+from collections import OrderedDict
+
+import altair as alt
+import plotly.io as pio
+import streamlit as st
+
+from config.settings import get_setting
+from profiling.spans import span
+
+
+def _spec_size(chart):
+    if isinstance(chart, dict):
+        return len(json.dumps(chart, default=str))
+    return len(pio.to_json(chart, validate=False))
+
+
+class FigureCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # clé -> (figure ou spec, taille)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, chart):
+        size = _spec_size(chart)
+        with self._lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (chart, size)
+            self.total_bytes += size
+            # Les moins récemment utilisées d'abord (la dernière insérée est conservée)
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache(max_bytes=int(get_setting("PROJET_CC_FIGURE_CACHE_MB", "figure_cache_mb", 64)) * 1024 * 1024)
+
+
+def cached_chart(name, version, widgets, build):
+    """
+    Figure plotly ou spécification Vega-Lite (altair) de `build()`, construite une
+    seule fois pour (name, version, widgets). `widgets` : valeurs hachables.
+    """
+    cache = get_figure_cache()
+    key = (name, version, tuple(widgets))
+    chart = cache.get(key)
+    if chart is None:
+        chart = build()
+        if isinstance(chart, alt.TopLevelMixin):
+            # Sans le thème altair par défaut (tailles imposées), comme st.altair_chart
+            with alt.theme.enable("none"):
+                chart = chart.to_dict()
+        cache.put(key, chart)
+    return chart
+
+
+def render_chart(chart, **kwargs):
+    """Affiche une figure de `cached_chart` (plotly ou spécification Vega-Lite)."""
+    if isinstance(chart, dict):
+        with span("st.vega_lite_chart"):
+            return st.vega_lite_chart(spec=chart, **kwargs)
+    with span("st.plotly_chart"):
+        return st.plotly_chart(chart, **kwargs)
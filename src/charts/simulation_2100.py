@@ -0,0 +1,41 @@
+"""
+Graphiques de la page « Simulation 2100 ».
+"""
+import altair as alt
+
+
+def chart_carte_delta(df_filtre):
+    # Altair ne fait pas de choroplèthes directement, mais peut afficher des points colorés.
+    # Pour simuler la cartographie du changement par zone, nous utilisons la couleur sur le delta.
+    # Utilisation des coordonnées moyennes de la zone (calculées dans la requête SQL)
+    return alt.Chart(df_filtre).mark_circle().encode(
+        latitude='latitude_centre:Q',
+        longitude='longitude_centre:Q',
+        size=alt.Size('delta_projection_2100:Q', title="Augmentation Jours Chauds (Delta)"),
+        color=alt.Color('delta_projection_2100:Q', title="Delta Jours Chauds (2100)", scale=alt.Scale(range='heatmap')),
+        tooltip=['Z_CLIM', 'baseline_jours_chauds_zone:Q', 'delta_projection_2100:Q', 'jours_chauds_projete_2100:Q']
+    ).properties(
+        title="Impact du Changement Climatique sur les Jours Chauds (Horizon 2100)"
+    ).interactive()
+
+
+def format_long(df_filtre):
+    # On reformate le DataFrame pour Altair
+    return df_filtre.melt(
+        id_vars=['Z_CLIM', 'Scenario'],
+        value_vars=['baseline_jours_chauds_zone', 'jours_chauds_projete_2100'],
+        var_name='Type_Valeur',
+        value_name='Jours_Chauds'
+    )
+
+
+def chart_comparaison(df_long):
+    return alt.Chart(df_long).mark_bar().encode(
+        x=alt.X('Jours_Chauds:Q', title='Jours > 32°C Moyens/an'),
+        y=alt.Y('Z_CLIM:N', title='Zone Climatique', sort='-x'),
+        color=alt.Color('Type_Valeur:N', title='Période', scale=alt.Scale(domain=['baseline_jours_chauds_zone', 'jours_chauds_projete_2100'], range=['#93B5C9', '#E63946'])),
+        column=alt.Column('Type_Valeur:N', header=alt.Header(titleOrient="bottom", labelOrient="bottom")),
+        tooltip=['Z_CLIM', 'Type_Valeur', alt.Tooltip('Jours_Chauds:Q', format='.1f')]
+    ).properties(
+        title="Augmentation des Jours Chauds par Zone"
+    ).interactive()
@@ -0,0 +1,32 @@
+"""
+Graphiques de la page « Températures de jour ».
+"""
+import altair as alt
+
+
+def chart_serie_temporelle(df_serie_temporelle, zone_selectionnee):
+    # Création du graphique en lignes
+    return alt.Chart(df_serie_temporelle).mark_line().encode(
+        # Utilisation de :T pour Temporel
+        x=alt.X('ANNEE_DATE:T', title='Année'),
+        y=alt.Y('moyenne_jours_chauds_zone:Q', title='Moyenne Jours > 32°C'),
+        color='Z_GEO:N', 
+        tooltip=[
+            alt.Tooltip('ANNEE_DATE:T', title='Année', format='%Y'), 
+            'Z_GEO', 
+            alt.Tooltip('moyenne_jours_chauds_zone:Q', format='.1f', title='Jours Chauds')
+        ]
+    ).properties(
+        title=f'Tendance des Jours de Chaleur Extrême pour {zone_selectionnee}'
+    ).interactive()
+
+
+def chart_comparaison_zones(df_comparaison):
+    return alt.Chart(df_comparaison).mark_bar().encode(
+        x=alt.X('T_moyenne_periode:Q', title='Moyenne Jours > 32°C (Période Totale)'),
+        y=alt.Y('Z_GEO:N', sort='-x', title='Zone Climatique'),
+        color=alt.Color('Z_GEO:N', legend=None),
+        tooltip=['Z_GEO', alt.Tooltip('T_moyenne_periode:Q', format='.1f', title='Moyenne Jours Chauds')]
+    ).properties(
+        title='Zones les plus exposées à la chaleur extrême (Moyenne 1950-2024)'
+    ).interactive()
@@ -0,0 +1,90 @@
+"""
+Graphiques de la page « Températures de nuit ».
+"""
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Libellé et style des droites de tendance par groupe de zones
+STYLES_TENDANCE = {
+    "Zones chaudes (AV_C + SSV_C)": ("Tendance zones chaudes", "dash"),
+    "Zones hautes (AV_H + SSV_H)": ("Tendance zones hautes", "dot"),
+}
+
+# Couleurs personnalisées des écarts
+COULEURS_ECARTS = {
+    "Chaud": "#EF654D",  # rouge personnalisé
+    "Froid": "#4D8EEF"   # bleu personnalisé
+}
+
+
+def figure_tendances(df, lignes):
+    # Construction du graphique
+    fig = go.Figure()
+
+    # 1) Courbes par zone
+    for zone, df_zone in df.groupby("zone_geographique", sort=False, observed=True):
+        df_zone = df_zone.sort_values("ANNEE")
+
+        fig.add_trace(go.Scatter(
+            x=df_zone["ANNEE"],
+            y=df_zone["moy_nuits_ge_20"],
+            mode="lines+markers",
+            name=f"{zone}",
+            opacity=0.7
+        ))
+
+    # 2) Courbes de tendance zones chaudes / zones hautes
+    for label, df_ligne in lignes.groupby("groupe", sort=False):
+        nom, dash = STYLES_TENDANCE[label]
+        fig.add_trace(go.Scatter(
+            x=df_ligne["ANNEE"],
+            y=df_ligne["tendance"],
+            mode="lines",
+            name=nom,
+            line=dict(width=4, dash=dash)
+        ))
+
+    fig.update_layout(
+        title="Moyenne des nuits ≥ 20°C par zone géographique",
+        xaxis_title="Année",
+        yaxis_title="Nuits ≥ 20°C (moyenne)",
+        legend_title="Zones",
+        hovermode="x unified"
+    )
+    fig.update_layout(
+        title=dict(
+            font=dict(size=24)
+        )
+    )
+    return fig
+
+
+def figure_ecarts(df_plot):
+    # Création de la colonne couleur pour le graphique
+    df_plot["couleur"] = np.where(df_plot["ecart_moy"] > 0, "Chaud", "Froid")
+
+    fig = px.bar(
+        df_plot,
+        x="ANNEE",
+        y="ecart_moy",
+        color="couleur", # contient "Chaud" / "Froid"
+        facet_col="groupe",
+        color_discrete_map=COULEURS_ECARTS,
+        labels={"ecart_moy": "Écart à la moyenne", "ANNEE": "Année"},
+        title="Écarts à la moyenne du nombre moyen de nuits ≥20°C par zone géographique",
+    )
+
+    fig.update_layout(
+        title=dict(
+            font=dict(size=24)
+        )
+    )
+    fig.add_hline(y=0, line_dash="dash", line_color="black")
+    fig.for_each_annotation(
+        lambda a: a.update(
+            text=a.text.split("=")[1],
+            font=dict(size=18) # augmenter la taille des titres de facettes ("Zones côtières", "Zones montagneuses")
+        )
+    )
+    return fig
@@ -0,0 +1,32 @@
+"""
+Paramètres d'exécution de l'application (moteur de données, chemins locaux).
+
+Chaque paramètre est lu dans l'ordre : variable d'environnement, section
+[data] des secrets Streamlit, puis valeur par défaut.
+"""
+import os
+from pathlib import Path
+
+import streamlit as st
+
+# Racine du dépôt (src/config/settings.py -> ../../)
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def get_setting(env_name, secret_key, default=None):
+    value = os.environ.get(env_name)
+    if value:
+        return value
+    try:
+        return st.secrets["data"][secret_key]
+    except (KeyError, FileNotFoundError):
+        return default
+
+
+def get_backend_name():
+    # "bigquery" (production) ou "duckdb" (snapshots Parquet locaux)
+    return get_setting("PROJET_CC_BACKEND", "backend", "bigquery").lower()
+
+
+def get_snapshot_dir():
+    return Path(get_setting("PROJET_CC_SNAPSHOT_DIR", "snapshot_dir", PROJECT_ROOT / "data" / "snapshot"))
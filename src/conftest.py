@@ -0,0 +1,2 @@
+# Les tests importent les modules de src/ (ingestion, data_layer, ...) comme les commandes
+# `python -m` lancées depuis src : pytest ajoute ce répertoire au sys.path.
@@ -1,50 +1,10 @@
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
-from google.cloud import bigquery
+from data_layer.bigquery import get_detection_precip_superieure100mm
 
-# Initialiser le client BigQuery
-client = bigquery.Client()
-
-# Requête SQL
-query = f"""
-WITH CTE AS (
-SELECT 
-    ANNEE AS annee,
-    MOIS AS mois,
-    -- On garde AAAAMM pour le tri ou l'affichage chronologique
-    AAAAMM AS date_key, 
-
-    -- Somme des précipitations pour la période donnée
-    AVG(RR) AS Cumul_Mensuel_Pluie_Total,
-
-    --  'NBRR', c'est le nombre de jours de pluie
-
-    -- RRAB précipitation maximale tombée en 24 heures au cours du mois (Average)
-    AVG(RRAB) AS Cumul_MAxi_par_mois,
-
-    -- Nombre de jours > 100mm
-    AVG(NBJRR100) AS Nb_Jours_Sup_100mm
-
-FROM `cc-reunion.data_meteofrance.stg_mensq_pluviometrie`
--- Indispensable pour fusionner les données de toutes les stations par mois
-GROUP BY 
-    ANNEE, 
-    MOIS, 
-    AAAAMM
-
--- Tri par ordre chronologique (ce qui réglera aussi ton problème de tri dans le graph)
-ORDER BY 
-    AAAAMM ASC
-)
-
-SELECT *
-FROM CTE
-WHERE Nb_Jours_Sup_100mm > 1
-"""
-
-# Exécuter la requête et récupérer le dataframe
-df = client.query(query).to_dataframe()
+# Exécuter la requête (registre partagé avec la page Cyclones) et récupérer le dataframe
+df = get_detection_precip_superieure100mm()
 
 # Afficher le dataframe
 st.dataframe(df)
@@ -79,43 +39,6 @@ st.markdown("### Détection et analyse des événements cycloniques basés sur l
 
 # engine = get_engine()
 
-# Requête SQL pour la détection des cyclones
-query = """
-WITH CTE AS (
-SELECT 
-    ANNEE AS annee,
-    MOIS AS mois,
-    -- On garde AAAAMM pour le tri ou l'affichage chronologique
-    AAAAMM AS date_key, 
-
-    -- Somme des précipitations pour la période donnée
-    AVG(RR) AS Cumul_Mensuel_Pluie_Total,
-
-    --  'NBRR', c'est le nombre de jours de pluie
-
-    -- RRAB précipitation maximale tombée en 24 heures au cours du mois (Average)
-    AVG(RRAB) AS Cumul_MAxi_par_mois,
-
-    -- Nombre de jours > 100mm
-    AVG(NBJRR100) AS Nb_Jours_Sup_100mm
-
-FROM `cc-reunion.data_meteofrance.stg_mensq_pluviometrie`
--- Indispensable pour fusionner les données de toutes les stations par mois
-GROUP BY 
-    ANNEE, 
-    MOIS, 
-    AAAAMM
-
--- Tri par ordre chronologique (ce qui réglera aussi ton problème de tri dans le graph)
-ORDER BY 
-    AAAAMM ASC
-)
-
-SELECT *
-FROM CTE
-WHERE Nb_Jours_Sup_100mm > 1
-"""
-
 # Exécuter la requête et récupérer les données
 # @st.cache_data
 # def load_data():
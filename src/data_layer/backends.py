@@ -0,0 +1,234 @@
+"""
+Moteurs d'exécution des requêtes du data layer.
+
+- BigQueryBackend : interroge directement le projet `cc-reunion` (production).
+- DuckDBBackend : exécute les mêmes requêtes sur une base DuckDB locale construite
+  à partir de snapshots Parquet des tables `cc-reunion` (développement, tests de
+  charge, mode hors ligne sans credentials GCP), par exemple un bundle exporté
+  par `data_layer.snapshot`.
+
+Le moteur est choisi par `config.settings.get_backend_name()`.
+"""
+import datetime
+import json
+import re
+from pathlib import Path
+
+import streamlit as st
+from google.cloud import bigquery
+
+from config.settings import get_backend_name, get_snapshot_dir
+from data_layer.frames import to_compact_frame
+from data_layer.jobs import LocalJob, wait
+
+try:
+    # API Storage Read : lecture Arrow en flux parallèles, plus rapide que l'itérateur REST
+    from google.cloud import bigquery_storage  # noqa: F401
+    HAS_BQ_STORAGE = True
+except ImportError:
+    HAS_BQ_STORAGE = False
+
+
+# Identifiants BigQuery entre backticks : `projet.dataset.table`, `dataset.table` ou `colonne`
+BACKTICK_IDENTIFIER = re.compile(r"`([^`]+)`")
+# Paramètre nommé BigQuery : @nom
+QUERY_PARAMETER = re.compile(r"(?<![\w@])@(\w+)")
+# Manifeste d'un bundle exporté par data_layer.snapshot
+MANIFEST_FILE = "manifest.json"
+
+# Type BigQuery des paramètres selon le type Python (bool avant int, datetime avant date)
+BQ_PARAMETER_TYPES = [
+    (bool, "BOOL"),
+    (int, "INT64"),
+    (float, "FLOAT64"),
+    (str, "STRING"),
+    (datetime.datetime, "TIMESTAMP"),
+    (datetime.date, "DATE"),
+]
+
+
+def referenced_tables(sql):
+    # Tables pleinement qualifiées (`projet.dataset.table`) citées dans la requête
+    return {name.strip() for name in BACKTICK_IDENTIFIER.findall(sql) if name.count(".") == 2}
+
+
+# Crée et met en cache le client BigQuery à partir du secret
+@st.cache_resource
+def get_bq_client():
+    try:
+        service_account_info = json.loads(st.secrets["bigquery"]["service_account_json"])
+        client = bigquery.Client.from_service_account_info(service_account_info)
+        return client
+    except KeyError:
+        raise KeyError("Missing 'bigquery.service_account_json' in Streamlit secrets. Please configure secrets.toml")
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON in service_account_json secret: {e}")
+
+
+def _python_value(value):
+    # Scalaires numpy (issus d'un DataFrame) -> types Python
+    return value.item() if hasattr(value, "item") else value
+
+
+def _bq_type(value):
+    for python_type, bq_type in BQ_PARAMETER_TYPES:
+        if isinstance(value, python_type):
+            return bq_type
+    raise TypeError(f"Unsupported query parameter type: {type(value).__name__}")
+
+
+def bq_query_parameter(name, value):
+    if isinstance(value, (list, tuple)):
+        values = [_python_value(v) for v in value]
+        return bigquery.ArrayQueryParameter(name, _bq_type(values[0]) if values else "STRING", values)
+    value = _python_value(value)
+    return bigquery.ScalarQueryParameter(name, _bq_type(value), value)
+
+
+class BigQueryBackend:
+    name = "bigquery"
+
+    def __init__(self, client):
+        self.client = client
+
+    def query(self, sql, params=None, stats=None):
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[bq_query_parameter(name, value) for name, value in (params or {}).items()]
+        )
+        # Job soumis sans attendre, puis attendu sans bloquer les reruns (annulé si le rerun est abandonné)
+        job = self.client.query(sql, job_config=job_config)
+        if stats is not None:
+            stats["job_id"] = job.job_id
+        rows = wait(job).result()
+        if stats is not None:
+            # Statistiques du job (télémétrie) : attente avant démarrage, octets traités et facturés
+            stats.update(
+                queue_ms=(job.started - job.created).total_seconds() * 1000 if job.started and job.created else None,
+                bytes_processed=job.total_bytes_processed,
+                bytes_billed=job.total_bytes_billed,
+            )
+        return to_compact_frame(rows.to_arrow(create_bqstorage_client=HAS_BQ_STORAGE))
+
+    def table_versions(self, tables):
+        # Date de dernière modification de chaque table (métadonnées, aucun octet facturé)
+        return {table: self.client.get_table(table).modified.isoformat() for table in tables}
+
+    def read_table(self, table):
+        # Lecture directe de la table (API tabledata / Storage Read), sans job de requête ;
+        # les vues (modèles dbt `view`) n'ont pas de lignes propres : lues par une requête
+        if self.client.get_table(table).table_type in ("VIEW", "MATERIALIZED_VIEW"):
+            return self.client.query(f"SELECT * FROM `{table}`").to_arrow(create_bqstorage_client=HAS_BQ_STORAGE)
+        return self.client.list_rows(table).to_arrow(create_bqstorage_client=HAS_BQ_STORAGE)
+
+
+class DuckDBBackend:
+    """
+    Base DuckDB en mémoire exposant un répertoire de snapshots sous forme de vues :
+
+        <snapshot_dir>/<dataset>/<table>.parquet
+        <snapshot_dir>/<dataset>/<table>/**/*.parquet   (table partitionnée)
+
+    Chaque table est exposée sous `<dataset>.<table>`, le nom du projet
+    BigQuery étant ignoré lors de la traduction des requêtes.
+
+    Si le répertoire contient un manifeste (bundle de `data_layer.snapshot`), les
+    fichiers qu'il liste doivent être présents et de la bonne taille, et les
+    empreintes des tables servent de versions au cache de résultats.
+    """
+    name = "duckdb"
+
+    def __init__(self, snapshot_dir):
+        import duckdb
+
+        self.snapshot_dir = Path(snapshot_dir)
+        if not self.snapshot_dir.is_dir():
+            raise FileNotFoundError(f"Snapshot directory not found: {self.snapshot_dir}")
+        self.manifest = self._read_manifest()
+        self.con = duckdb.connect(database=":memory:")
+        self.tables = self._mount()
+
+    def _read_manifest(self):
+        path = self.snapshot_dir / MANIFEST_FILE
+        if not path.exists():
+            return None
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+        # Contrôle rapide (l'empreinte complète : python -m data_layer.snapshot verify)
+        for table, entry in manifest["tables"].items():
+            for file in entry["files"]:
+                file_path = self.snapshot_dir / file["path"]
+                if not file_path.exists() or file_path.stat().st_size != file["bytes"]:
+                    raise ValueError(f"Incomplete snapshot bundle: {file['path']} ({table}) is missing or modified")
+        return manifest
+
+    def _mount(self):
+        tables = []
+        for dataset_dir in sorted(p for p in self.snapshot_dir.iterdir() if p.is_dir()):
+            dataset = dataset_dir.name
+            self.con.execute(f'CREATE SCHEMA IF NOT EXISTS "{dataset}"')
+            for entry in sorted(dataset_dir.iterdir()):
+                if entry.is_dir():
+                    table, source = entry.name, f"read_parquet('{entry.as_posix()}/**/*.parquet', hive_partitioning = true)"
+                elif entry.suffix == ".parquet":
+                    table, source = entry.stem, f"read_parquet('{entry.as_posix()}')"
+                else:
+                    continue
+                self.con.execute(f'CREATE VIEW "{dataset}"."{table}" AS SELECT * FROM {source}')
+                tables.append(f"{dataset}.{table}")
+        return tables
+
+    def _table_path(self, table):
+        _, dataset, name = table.split(".")
+        path = self.snapshot_dir / dataset / name
+        return path if path.is_dir() else path.with_suffix(".parquet")
+
+    def table_versions(self, tables):
+        # Le snapshot fait foi : empreinte du manifeste, à défaut date de modification
+        versions = {}
+        bundle = self.manifest["tables"] if self.manifest else {}
+        for table in tables:
+            path = self._table_path(table)
+            if table in bundle:
+                versions[table] = bundle[table]["checksum"]
+            else:
+                versions[table] = path.stat().st_mtime if path.exists() else None
+        return versions
+
+    def read_table(self, table):
+        _, dataset, name = table.split(".")
+        with self.con.cursor() as cursor:
+            return cursor.execute(f'SELECT * FROM "{dataset}"."{name}"').fetch_arrow_table()
+
+    @staticmethod
+    def translate(sql):
+        # `cc-reunion.dataset.table` -> "dataset"."table" ; `Période` -> "Période"
+        def quote(match):
+            parts = match.group(1).split(".")
+            if len(parts) == 3:
+                parts = parts[1:]
+            return ".".join(f'"{part}"' for part in parts)
+
+        return BACKTICK_IDENTIFIER.sub(quote, sql)
+
+    def query(self, sql, params=None, stats=None):
+        # `stats` : pas de file d'attente ni de facturation en local
+        sql = self.translate(sql)
+        if params:
+            # Requête préparée : @nom -> $nom
+            sql = QUERY_PARAMETER.sub(r"$\1", sql)
+            params = {
+                name: [_python_value(v) for v in value] if isinstance(value, (list, tuple)) else _python_value(value)
+                for name, value in params.items()
+            }
+        # Un curseur par requête : la connexion est partagée entre les sessions Streamlit
+        job = LocalJob(self.con.cursor(), sql, params or None)
+        return to_compact_frame(wait(job).result())
+
+
+@st.cache_resource
+def get_backend():
+    backend_name = get_backend_name()
+    if backend_name == "bigquery":
+        return BigQueryBackend(get_bq_client())
+    if backend_name == "duckdb":
+        return DuckDBBackend(get_snapshot_dir())
+    raise ValueError(f"Unknown data backend '{backend_name}' (expected 'bigquery' or 'duckdb')")
@@ -0,0 +1,159 @@
+"""
+Cache disque des résultats de requêtes, partagé entre les processus Streamlit.
+
+Chaque résultat est stocké dans un fichier Parquet (`<clé>.parquet`) dont les
+métadonnées contiennent la date d'expiration et la version (date de dernière
+modification) des tables sources au moment de la requête :
+
+- une entrée expirée (TTL) ou dont une table source a été modifiée depuis est ignorée ;
+- l'écriture passe par un fichier temporaire puis `os.replace` (atomique), ce qui
+  permet à plusieurs workers de lire et d'écrire le même répertoire ;
+- la date de modification du fichier sert d'horodatage LRU : elle est mise à jour
+  à chaque lecture et les entrées les plus anciennes sont supprimées quand la
+  taille totale dépasse la limite.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+from config.settings import get_setting, PROJECT_ROOT
+from data_layer.backends import referenced_tables
+from data_layer.queries import normalize_sql
+
+METADATA_KEY = b"projet_cc"
+
+
+class ResultCache:
+    def __init__(self, cache_dir, max_bytes, default_ttl, version_check_interval=60):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        # Évite d'interroger les métadonnées des tables sources à chaque appel
+        self.version_check_interval = version_check_interval
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}  # clé -> [verrou, nombre d'appels en cours]
+
+    @staticmethod
+    def key(backend_name, sql, params=None):
+        # SQL normalisé : une même requête mise en forme différemment partage l'entrée
+        params = json.dumps(params or {}, sort_keys=True, default=str)
+        return hashlib.sha256(f"{backend_name}\n{normalize_sql(sql)}\n{params}".encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return self.cache_dir / f"{key}.parquet"
+
+    @contextmanager
+    def lock(self, key, on_wait=None, interval=0.25):
+        """
+        Verrou par requête : deux appels simultanés (préchargement + page) ne
+        déclenchent qu'une seule exécution. `on_wait` est appelée toutes les
+        `interval` secondes pendant l'attente (point d'interruption du rerun).
+        L'entrée est supprimée quand plus aucun appel ne l'utilise.
+        """
+        with self._lock:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            while not entry[0].acquire(timeout=interval):
+                if on_wait is not None:
+                    on_wait()
+            try:
+                yield
+            finally:
+                entry[0].release()
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._key_locks[key]
+
+    def source_versions(self, backend, sql):
+        tables = tuple(sorted(referenced_tables(sql)))
+        now = time.time()
+        with self._lock:
+            checked_at, versions = self._versions.get(tables, (0, None))
+        if versions is None or now - checked_at > self.version_check_interval:
+            versions = backend.table_versions(tables)
+            with self._lock:
+                self._versions[tables] = (now, versions)
+        return versions
+
+    def get(self, key, versions):
+        path = self._path(key)
+        try:
+            metadata = json.loads(pq.read_schema(path).metadata[METADATA_KEY])
+            if metadata["expires_at"] < time.time() or metadata["versions"] != versions:
+                return None
+            df = pq.read_table(path).to_pandas()
+            os.utime(path)
+        except (FileNotFoundError, KeyError, TypeError, pa.ArrowInvalid):
+            # Entrée absente, supprimée par un autre worker ou illisible
+            return None
+        return df
+
+    def put(self, key, df, versions, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = {
+            "created_at": time.time(),
+            "expires_at": time.time() + ttl,
+            "versions": versions,
+        }
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            METADATA_KEY: json.dumps(metadata).encode("utf-8"),
+        })
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            pq.write_table(table, tmp_path)
+            os.replace(tmp_path, self._path(key))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for path in self.cache_dir.glob("*.parquet"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        # Les moins récemment utilisées d'abord
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for path in self.cache_dir.glob("*.parquet"):
+            path.unlink(missing_ok=True)
+        with self._lock:
+            self._versions.clear()
+
+
+@st.cache_resource
+def get_result_cache():
+    return ResultCache(
+        cache_dir=get_setting("PROJET_CC_CACHE_DIR", "cache_dir", PROJECT_ROOT / ".cache" / "queries"),
+        max_bytes=int(get_setting("PROJET_CC_CACHE_MAX_MB", "cache_max_mb", 512)) * 1024 * 1024,
+        default_ttl=int(get_setting("PROJET_CC_CACHE_TTL", "cache_ttl", 24 * 3600)),
+    )
@@ -0,0 +1,55 @@
+"""
+Cube d'agrégats climatiques (modèle dbt `mart_cube_climat`).
+
+Tous les indicateurs mensuels (NBJ*, TM, TX, TN, RR, RRAB) y sont pré-agrégés une
+seule fois, pour chaque niveau spatial et chaque grain temporel :
+
+- niveaux : `station` (NUM_POSTE), `zone_climat` (Z_CLIM × Z_GEO), `zone` (Z_GEO), `ile` ;
+  Z_GEO vient de la table `stations`, sauf au niveau `zone` (`stations_zones`,
+  comme l'ancien mart des nuits >= 20°C) ;
+- grains : `mois` (ANNEE, MOIS), `annee`, `decennie` (ANNEE = première année).
+
+Une question « indicateur par niveau et par grain » devient une simple lecture
+(sélection des colonnes et filtres poussés dans la requête, résultat mis en cache)
+au lieu d'une nouvelle agrégation des données station × mois :
+
+    lookup("NBJTNS20", niveau="zone", grain="annee")                  # nuits >= 20°C par zone
+    lookup(["RR", "NBJRR100"], niveau="ile", grain="mois")            # pluie mensuelle de l'île
+    lookup("NBJTXS32", niveau="zone", grain="decennie", filters={"Z_GEO": "AV_C"})
+"""
+from data_layer.bigquery import get_cube_climat
+from data_layer.queries import CUBE_INDICATEURS
+
+# Colonnes identifiant une ligne pour chaque niveau et chaque grain
+NIVEAUX = {
+    "station": ("NUM_POSTE", "Z_CLIM", "Z_GEO"),
+    "zone_climat": ("Z_CLIM", "Z_GEO"),
+    "zone": ("Z_GEO",),
+    "ile": (),
+}
+GRAINS = {
+    "mois": ("ANNEE", "MOIS"),
+    "annee": ("ANNEE",),
+    "decennie": ("ANNEE",),
+}
+NB_STATIONS = ("nb_stations_temperature", "nb_stations_pluie")
+
+
+def lookup(indicateurs, niveau="zone", grain="annee", filters=None, nb_stations=False):
+    """
+    Indicateurs du cube au niveau et au grain demandés : colonnes d'identification
+    du niveau et du grain, puis une colonne par indicateur (et le nombre de
+    stations agrégées si `nb_stations`). `filters` : voir `build_select`.
+    """
+    if niveau not in NIVEAUX:
+        raise ValueError(f"Unknown cube level {niveau!r} (expected one of {list(NIVEAUX)})")
+    if grain not in GRAINS:
+        raise ValueError(f"Unknown cube grain {grain!r} (expected one of {list(GRAINS)})")
+    indicateurs = [indicateurs] if isinstance(indicateurs, str) else list(indicateurs)
+    unknown = [i for i in indicateurs if i not in CUBE_INDICATEURS]
+    if unknown:
+        raise ValueError(f"Unknown cube indicator(s) {unknown}")
+    columns = list(NIVEAUX[niveau]) + list(GRAINS[grain]) + indicateurs
+    if nb_stations:
+        columns += NB_STATIONS
+    return get_cube_climat(columns, {**(filters or {}), "niveau": niveau, "grain": grain})
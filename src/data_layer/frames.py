@@ -0,0 +1,49 @@
+"""
+Conversion des résultats Arrow en DataFrames compacts.
+
+Les colonnes de dimension (ANNEE, Z_GEO, Z_CLIM, Scenario, ...) ne prennent que
+quelques dizaines de valeurs distinctes : les chaînes sont encodées en catégories
+et les entiers réduits au plus petit type qui contient leurs valeurs, sans
+descendre sous int32 (les pages calculent sur les années et les mesures : sommes,
+`diff()`, ...) sauf pour les colonnes de codes (`CODE_COLUMNS`). Les flottants
+sont laissés en float64 pour ne pas dégrader les agrégations faites dans les pages.
+"""
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Au-delà de cette proportion de valeurs distinctes, une colonne texte reste en objet
+CATEGORY_MAX_RATIO = 0.5
+
+INT_TYPES = [pa.int8(), pa.int16(), pa.int32(), pa.int64()]
+# Colonnes de codes (jamais utilisées dans des calculs) : réduites jusqu'à int8
+CODE_COLUMNS = {"MOIS", "mois"}
+
+
+def _smallest_int_type(column, floor=pa.int32()):
+    bounds = pc.min_max(column)
+    low, high = bounds["min"].as_py(), bounds["max"].as_py()
+    if low is None:
+        return column.type
+    for int_type in INT_TYPES[INT_TYPES.index(floor):]:
+        info_bits = int_type.bit_width - 1
+        if -(2 ** info_bits) <= low and high < 2 ** info_bits:
+            return int_type
+    return column.type
+
+
+def compact_table(table):
+    columns = []
+    for field, column in zip(table.schema, table.columns):
+        if pa.types.is_integer(field.type) and table.num_rows:
+            floor = pa.int8() if field.name in CODE_COLUMNS else pa.int32()
+            column = column.cast(_smallest_int_type(column, floor))
+        elif pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            if table.num_rows and pc.count_distinct(column).as_py() <= CATEGORY_MAX_RATIO * table.num_rows:
+                column = column.dictionary_encode()
+        columns.append(column)
+    return pa.table(columns, names=table.column_names)
+
+
+def to_compact_frame(table):
+    # date_as_object=False : les DATE BigQuery deviennent des datetime64 (pas d'objets Python)
+    return compact_table(table).to_pandas(date_as_object=False)
@@ -0,0 +1,88 @@
+"""
+Attente non bloquante des requêtes lancées par les scripts des pages.
+
+Les moteurs soumettent la requête sans attendre son résultat (`client.query`
+rend la main dès la création du job BigQuery), puis `wait` interroge le job
+toutes les `PROJET_CC_JOB_POLL_MS` millisecondes (défaut 250). Entre deux
+interrogations, le thread du script rend la main à Streamlit : si l'utilisateur
+a déplacé un curseur ou changé de scénario entre-temps, Streamlit interrompt le
+rerun (RerunException / StopException) et le job devenu inutile est annulé au
+lieu d'occuper des slots BigQuery pour un résultat que personne n'affichera.
+
+Hors du thread d'un script (préchargement, benchmarks, scripts), l'attente reste
+bloquante et aucun job n'est annulé. L'attente du verrou de cache d'une requête
+déjà en cours dans une autre session (`ResultCache.lock`) passe par le même
+point d'interruption (`check_rerun`).
+
+Le moteur DuckDB suit le même protocole (`LocalJob` : requête exécutée dans un
+thread, interrompue par `interrupt()`), ce qui permet de tester l'annulation en local.
+"""
+import threading
+import time
+from concurrent.futures import Future
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from config.settings import get_setting
+
+
+def poll_interval():
+    return int(get_setting("PROJET_CC_JOB_POLL_MS", "job_poll_ms", 250)) / 1000
+
+
+def _yield_to_streamlit():
+    # Tout accès à st.session_state est un point d'interruption : Streamlit y lève
+    # RerunException / StopException si un nouveau rerun a été demandé
+    "_" in st.session_state
+
+
+def check_rerun():
+    """Point d'interruption du rerun (sans effet hors du thread d'un script)."""
+    if get_script_run_ctx(suppress_warning=True) is not None:
+        _yield_to_streamlit()
+
+
+def wait(job):
+    """
+    Attend la fin de `job` (`done()`, `cancel()`) en laissant Streamlit
+    interrompre le rerun ; le job est alors annulé et l'exception propagée.
+    """
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return job
+    interval = poll_interval()
+    try:
+        while not job.done():
+            time.sleep(interval)
+            _yield_to_streamlit()
+    except BaseException:
+        job.cancel()
+        raise
+    return job
+
+
+class LocalJob:
+    """Requête DuckDB exécutée dans un thread, avec l'interface d'un job BigQuery."""
+
+    def __init__(self, cursor, sql, params=None):
+        self.cursor = cursor
+        self.future = Future()
+        threading.Thread(target=self._run, args=(sql, params), name="duckdb-job", daemon=True).start()
+
+    def _run(self, sql, params):
+        try:
+            self.future.set_result(self.cursor.execute(sql, params).fetch_arrow_table())
+        except BaseException as e:
+            self.future.set_exception(e)
+        finally:
+            self.cursor.close()
+
+    def done(self):
+        return self.future.done()
+
+    def cancel(self):
+        if not self.future.done():
+            self.cursor.interrupt()
+
+    def result(self):
+        return self.future.result()
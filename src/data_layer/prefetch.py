@@ -0,0 +1,88 @@
+"""
+Préchargement des jeux de données des pages au démarrage du processus.
+
+Toutes les requêtes du registre marquées `prefetch` sont soumises en parallèle
+(pool de threads) dès la première exécution d'un script ; les résultats alimentent
+le cache de `run_query`, si bien que la navigation vers une page ne déclenche plus
+de job BigQuery. Les requêtes projetées par une page (`prefetch_columns`,
+`prefetch_filters`) sont préchargées avec la même projection.
+"""
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from config.settings import get_setting
+from data_layer.backends import get_backend
+from data_layer.cache import get_result_cache
+from data_layer.bigquery import run_named
+from data_layer.queries import REGISTRY
+from data_layer.telemetry import show_query_telemetry
+
+STATUS_ICONS = {"pending": "⏳", "running": "🔄", "warm": "✅", "error": "❌"}
+
+
+class WarmUp:
+    def __init__(self, datasets, max_workers):
+        self.datasets = datasets
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="warm-up")
+        self._lock = threading.Lock()
+        self.status = {name: {"state": "pending", "duration": None, "error": None} for name in datasets}
+
+    def _update(self, name, **values):
+        with self._lock:
+            self.status[name].update(values)
+
+    def _load(self, name, loader):
+        self._update(name, state="running")
+        start = time.perf_counter()
+        try:
+            loader()
+        except Exception as e:
+            self._update(name, state="error", error=str(e), duration=time.perf_counter() - start)
+        else:
+            self._update(name, state="warm", duration=time.perf_counter() - start)
+
+    def start(self):
+        for name, loader in self.datasets.items():
+            self.executor.submit(self._load, name, loader)
+        # Les threads ne bloquent pas l'arrêt du processus
+        self.executor.shutdown(wait=False)
+        return self
+
+    def snapshot(self):
+        with self._lock:
+            return {name: dict(values) for name, values in self.status.items()}
+
+    def is_complete(self):
+        return all(v["state"] in ("warm", "error") for v in self.snapshot().values())
+
+
+@st.cache_resource(show_spinner=False)
+def start_warm_up():
+    # Moteur et cache initialisés dans le thread du script avant de lancer les workers
+    get_backend()
+    get_result_cache()
+    datasets = {
+        query.name: (lambda q=query: run_named(q.name, q.prefetch_columns, q.prefetch_filters))
+        for query in REGISTRY if query.prefetch
+    }
+    max_workers = int(get_setting("PROJET_CC_PREFETCH_WORKERS", "prefetch_workers", len(datasets)))
+    return WarmUp(datasets, max_workers).start()
+
+
+def show_warm_up_status():
+    warm_up = start_warm_up()
+    status = warm_up.snapshot()
+    nb_warm = sum(v["state"] == "warm" for v in status.values())
+    with st.sidebar.expander(f"Données préchargées ({nb_warm}/{len(status)})", expanded=False):
+        for name, values in status.items():
+            line = f"{STATUS_ICONS[values['state']]} {REGISTRY.get(name).description}"
+            if values["duration"] is not None:
+                line += f" — {values['duration']:.1f} s"
+            st.markdown(line)
+            if values["error"]:
+                st.caption(values["error"])
+    # Panneau de télémétrie des requêtes (administrateurs uniquement)
+    show_query_telemetry()
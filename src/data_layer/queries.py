@@ -0,0 +1,345 @@
+"""
+Registre des requêtes nommées du data layer.
+
+Chaque jeu de données est déclaré une seule fois (nom, SQL ou modèle dbt, colonnes
+attendues, politique de cache). Les requêtes sont identifiées par une empreinte
+de leur SQL normalisé (commentaires et espaces ignorés) : deux déclarations
+équivalentes sont fusionnées et partagent la même entrée de cache.
+"""
+import hashlib
+import re
+from dataclasses import dataclass
+
+# Dataset BigQuery dans lequel dbt matérialise les modèles (dont les marts du dashboard)
+DBT_DATASET = "cc-reunion.data_meteofrance"
+
+SQL_COMMENT = re.compile(r"--[^\n]*")
+WHITESPACE = re.compile(r"\s+")
+IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+OPERATORS = ("=", "!=", "<", "<=", ">", ">=")
+
+
+def normalize_sql(sql):
+    sql = SQL_COMMENT.sub(" ", sql)
+    sql = WHITESPACE.sub(" ", sql).strip()
+    return sql.rstrip(";").strip()
+
+
+def fingerprint(sql):
+    return hashlib.sha256(normalize_sql(sql).encode("utf-8")).hexdigest()[:16]
+
+
+def check_identifier(name):
+    # Seuls les noms de colonnes simples sont interpolés dans le SQL
+    if not IDENTIFIER.match(name):
+        raise ValueError(f"Invalid column name: {name!r}")
+    return name
+
+
+def build_select(source, columns=None, filters=None, order_by=None):
+    """
+    Construit `SELECT <colonnes> FROM <source> WHERE ...` et ses paramètres.
+
+    `filters` associe une colonne à une valeur (égalité), une liste (IN) ou un
+    couple `(opérateur, valeur)`, ex. `{"Z_GEO": "AV_C", "year": ("<=", 2025)}`.
+    Les valeurs sont transmises comme paramètres de requête (`@nom`), jamais
+    interpolées.
+    """
+    predicates = []
+    params = {}
+    for column, condition in sorted((filters or {}).items()):
+        check_identifier(column)
+        param = f"f_{column}"
+        if isinstance(condition, tuple):
+            operator, value = condition
+        elif isinstance(condition, (list, set)):
+            operator, value = "in", sorted(condition)
+        else:
+            operator, value = "=", condition
+        if operator == "in":
+            predicates.append(f"{column} IN (SELECT * FROM UNNEST(@{param}))")
+        elif operator in OPERATORS:
+            predicates.append(f"{column} {operator} @{param}")
+        else:
+            raise ValueError(f"Unsupported filter operator: {operator!r}")
+        params[param] = value
+    projection = ", ".join(check_identifier(column) for column in columns) if columns else "*"
+    sql = f"SELECT {projection}\nFROM {source}"
+    if predicates:
+        sql += "\nWHERE " + "\n  AND ".join(predicates)
+    if order_by:
+        sql += f"\nORDER BY {order_by}"
+    return sql, params
+
+
+@dataclass(frozen=True)
+class Query:
+    name: str
+    description: str
+    sql: str = None
+    # Modèle dbt lu directement dans DBT_DATASET (à la place de `sql`)
+    model: str = None
+    order_by: str = None
+    # Colonnes attendues dans le résultat
+    columns: tuple = ()
+    # Durée de validité en cache (secondes), None = valeur par défaut du cache
+    ttl: int = None
+    # Chargée par le préchargement au démarrage (jeux de données des pages)
+    prefetch: bool = True
+    # Colonnes et filtres demandés par la page : préchargés à l'identique pour
+    # partager la même entrée de cache (vérifié par benchmarks.check_columns)
+    prefetch_columns: tuple = None
+    prefetch_filters: dict = None
+
+    def check_columns(self, names):
+        unknown = [name for name in names if self.columns and name not in self.columns]
+        if unknown:
+            raise ValueError(f"Query '{self.name}' has no column(s) {unknown}")
+
+    def render(self, columns=None, filters=None):
+        # Projection et filtres appliqués autour de la requête : BigQuery (comme
+        # DuckDB) les pousse jusqu'aux tables sources
+        self.check_columns(list(columns or []) + list(filters or {}))
+        if self.model is not None:
+            source = f"`{DBT_DATASET}.{self.model}`"
+        elif columns or filters:
+            source = f"(\n{self.sql.strip().rstrip(';')}\n) AS q"
+        else:
+            sql = self.sql.strip().rstrip(";")
+            if self.order_by:
+                sql = f"{sql}\nORDER BY {self.order_by}"
+            return sql, {}
+        return build_select(source, columns, filters, self.order_by)
+
+    @property
+    def fingerprint(self):
+        return fingerprint(self.render()[0])
+
+
+class QueryRegistry:
+    def __init__(self):
+        self.queries = {}
+        self.aliases = {}
+        self._by_fingerprint = {}
+
+    def register(self, query):
+        existing = self._by_fingerprint.get(query.fingerprint)
+        if existing is not None and existing != query.name:
+            # Même requête déclarée sous un autre nom : simple alias
+            self.aliases[query.name] = existing
+            return self.queries[existing]
+        if query.name in self.queries or query.name in self.aliases:
+            raise ValueError(f"Query '{query.name}' is already registered")
+        self.queries[query.name] = query
+        self._by_fingerprint[query.fingerprint] = query.name
+        return query
+
+    def get(self, name):
+        name = self.aliases.get(name, name)
+        try:
+            return self.queries[name]
+        except KeyError:
+            raise KeyError(f"Unknown query '{name}'. Registered queries: {sorted(self.queries)}")
+
+    def __iter__(self):
+        return iter(self.queries.values())
+
+
+REGISTRY = QueryRegistry()
+register = REGISTRY.register
+
+
+# Les jeux de données des pages lisent les marts dbt (models/marts/), tables
+# pré-agrégées : aucune jointure n'est recalculée au moment de la requête.
+
+# --- Climat de La Réunion / Cyclones : table annuelle par station ---
+register(Query(
+    name="climat_annuel",
+    description="Climat de La Réunion",
+    model="mart_climat_annuel",
+    columns=("NUM_POSTE", "Z_GEO", "year", "TMM", "RRMX", "NBJFXI3S16X"),
+    prefetch_columns=("year", "Z_GEO", "TMM", "RRMX"),
+    prefetch_filters={"year": ("<=", 2025)},
+))
+
+register(Query(
+    name="histo_simu_geo",
+    description="Table annuelle complète par station",
+    sql="SELECT * FROM `cc-reunion.data_meteofrance.histo_simu_geo`",
+    columns=("NUM_POSTE", "Z_GEO", "year", "TMM", "RRMX", "NBJFXI3S16X"),
+    prefetch=False,
+))
+
+register(Query(
+    name="histo_simu_ann",
+    description="Moyennes annuelles historiques et simulées",
+    sql="SELECT * FROM `cc-reunion.data_meteofrance.histo_simu_ann`",
+    prefetch=False,
+))
+
+# --- Cyclones : mois avec plus d'un jour de précipitations > 100 mm ---
+# Sélection mensuelle (niveau île) du cube d'agrégats mart_cube_climat, dans le mart
+register(Query(
+    name="precip_sup_100mm",
+    description="Cyclones",
+    model="mart_precip_sup_100mm",
+    order_by="date_key ASC",
+    columns=("annee", "mois", "date_key", "Cumul_Mensuel_Pluie_Total", "Cumul_MAxi_par_mois", "Nb_Jours_Sup_100mm"),
+))
+
+register(Query(
+    name="pluie_extreme",
+    description="Statuts d'alerte vent et pluie",
+    sql="""
+        WITH CTE AS (
+            SELECT 
+                NBJFXI3S16X,
+                RRMX,
+                year,
+                CASE
+                    WHEN NBJFXI3S16X > 32.7 THEN 'Cyclone'
+                    WHEN NBJFXI3S16X > 28.5 THEN 'Tempête Violente'
+                    WHEN NBJFXI3S16X > 24.5 THEN 'Tempête'
+                    ELSE 'Normal'
+                END AS Statut_Alerte_Vent, 
+                CASE
+                    WHEN RRMX > 5000 THEN 'Année très pluvieuse' 
+                    WHEN RRMX > 3000 THEN 'Année Normale'
+                    WHEN RRMX > 1000 THEN 'Année Sèche'
+                    ELSE 'Normal'
+                END AS Forte_pluviometrie
+            FROM 
+                `cc-reunion.data_meteofrance.histo_simu_geo` AS t1
+        )
+
+        SELECT
+            Statut_Alerte_Vent,
+            Forte_pluviometrie,
+            CTE.year,
+            CTE.RRMX,
+            CTE.NBJFXI3S16X,
+            CASE 
+                WHEN CTE.NBJFXI3S16X > 32.7 AND CTE.RRMX > 5000 THEN 'Episode Cyclonique Majeur'
+                ELSE 'Normal'
+            END AS Statut_Cyclone_Majeur,
+
+        FROM CTE
+    """,
+    columns=("Statut_Alerte_Vent", "Forte_pluviometrie", "year", "RRMX", "NBJFXI3S16X", "Statut_Cyclone_Majeur"),
+    prefetch=False,
+))
+
+# --- Températures de nuit ---
+register(Query(
+    name="nuits_sup_20deg",
+    description="Nuits ≥ 20°C par année",
+    sql="""
+        SELECT ANNEE, moy_nuits_ge_20
+        FROM `cc-reunion.data_meteofrance.int_mensq_temperatures_sup_20deg`
+        ORDER BY ANNEE ASC
+    """,
+    columns=("ANNEE", "moy_nuits_ge_20"),
+    prefetch=False,
+))
+
+register(Query(
+    name="nb_moy_nuits_sup_20deg",
+    description="Nombre moyen de nuits ≥ 20°C par année",
+    sql="""
+        SELECT ANNEE, AVG(moy_nuits_ge_20) as nb_moy_nuits_sup_20deg
+        FROM `cc-reunion.data_meteofrance.int_mensq_temperatures_sup_20deg`
+        GROUP BY ANNEE
+        ORDER BY ANNEE ASC
+    """,
+    columns=("ANNEE", "nb_moy_nuits_sup_20deg"),
+    prefetch=False,
+))
+
+register(Query(
+    name="nuits_sup_20deg_par_zone",
+    description="Températures de nuit",
+    model="mart_nuits_sup_20deg_par_zone",
+    order_by="zone_geographique, ANNEE",
+    columns=("ANNEE", "zone_geographique", "moy_nuits_ge_20", "nb_stations"),
+    prefetch_columns=("ANNEE", "zone_geographique", "moy_nuits_ge_20"),
+    prefetch_filters={"ANNEE": (">=", 1983)},
+))
+
+# --- Températures de jour : données annuelles agrégées par zone ---
+register(Query(
+    name="annuelles_par_zone",
+    description="Températures de jour",
+    model="mart_jours_chauds_par_zone",
+    order_by="ANNEE, Z_CLIM",
+    columns=("ANNEE", "Z_CLIM", "Z_GEO", "moyenne_jours_chauds_zone", "nombre_stations_incluses"),
+))
+
+# Bornes du curseur, liste des zones et moyenne sur toute la période, par zone et
+# toutes zones confondues (références des écarts affichés par la page)
+register(Query(
+    name="annuelles_resume_par_zone",
+    description="Températures de jour (résumé par zone)",
+    sql=f"""
+        SELECT
+            z.*,
+            t.T_moyenne_periode_toutes_zones
+        FROM (
+            SELECT
+                Z_GEO,
+                MIN(ANNEE) AS annee_min,
+                MAX(ANNEE) AS annee_max,
+                AVG(moyenne_jours_chauds_zone) AS T_moyenne_periode
+            FROM `{DBT_DATASET}.mart_jours_chauds_par_zone`
+            GROUP BY Z_GEO
+        ) AS z
+        CROSS JOIN (
+            SELECT AVG(moyenne_jours_chauds_zone) AS T_moyenne_periode_toutes_zones
+            FROM `{DBT_DATASET}.mart_jours_chauds_par_zone`
+        ) AS t
+    """,
+    order_by="Z_GEO",
+    columns=("Z_GEO", "annee_min", "annee_max", "T_moyenne_periode", "T_moyenne_periode_toutes_zones"),
+))
+
+# --- Simulation 2100 : projection statique à l'horizon 2100 ---
+register(Query(
+    name="projection_2100",
+    description="Simulation 2100",
+    model="mart_projection_2100",
+    order_by="Z_CLIM, Scenario",
+    columns=(
+        "ANNEE_HORIZON", "Scenario", "Z_CLIM", "Z_GEO", "latitude_centre", "longitude_centre",
+        "baseline_jours_chauds_zone", "jours_chauds_projete_2100", "delta_projection_2100",
+    ),
+))
+
+# --- Cube d'agrégats : niveau spatial × grain temporel × indicateurs mensuels (data_layer.cube) ---
+CUBE_INDICATEURS = (
+    "TM", "TX", "TN",
+    "NBJTX0", "NBJTX25", "NBJTX30", "NBJTX35", "NBJTXI20", "NBJTXI27", "NBJTXS32",
+    "NBJTN5", "NBJTN10", "NBJTNI10", "NBJTNI15", "NBJTNI20", "NBJTNS20", "NBJTNS25",
+    "NBJGELEE", "NBJTMS24",
+    "RR", "RRAB", "NBJRR1", "NBJRR5", "NBJRR10", "NBJRR30", "NBJRR50", "NBJRR100",
+)
+
+register(Query(
+    name="cube_climat",
+    description="Cube d'agrégats climatiques",
+    model="mart_cube_climat",
+    order_by="ANNEE, MOIS",
+    columns=(
+        "niveau", "grain", "NUM_POSTE", "Z_CLIM", "Z_GEO", "ANNEE", "MOIS",
+        "nb_stations_temperature", "nb_stations_pluie",
+    ) + CUBE_INDICATEURS,
+    prefetch=False,
+))
+
+# --- Micro-climat des points de grille des simulations (geo.spatial_index) ---
+register(Query(
+    name="points_zones",
+    description="Micro-climat des points de grille",
+    sql="SELECT Point, Latitude, Longitude, Z_GEO FROM `cc-reunion.data_meteofrance.points_zones`",
+    order_by="Point",
+    columns=("Point", "Latitude", "Longitude", "Z_GEO"),
+    prefetch=False,
+))
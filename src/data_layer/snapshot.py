@@ -0,0 +1,230 @@
+"""
+Export des tables `cc-reunion` en un bundle de données hors ligne.
+
+Tables exportées : toutes celles lues par les requêtes du registre
+(`data_layer.queries`, marts dbt compris) et toutes les sources dbt
+(`models/staging/_stg_sources.yml`). Le bundle a la structure d'un snapshot
+du moteur DuckDB :
+
+    <bundle>/manifest.json
+    <bundle>/<dataset>/<table>/part-00000.parquet   (zstd)
+
+Chaque table est triée par sa colonne d'année quand elle en a une, puis découpée
+en fichiers d'au plus `--rows-per-file` lignes : les statistiques min/max des
+groupes de lignes permettent à DuckDB d'ignorer les fichiers hors filtre
+(`year <= 2025`). Le manifeste donne, pour chaque table, le schéma, le nombre de
+lignes, la version de la table source et la taille et l'empreinte sha256 de
+chaque fichier.
+
+Le bundle se monte tel quel comme source de données de l'application (le moteur
+DuckDB vérifie la présence et la taille des fichiers, et utilise les empreintes
+du manifeste comme versions des tables pour le cache de résultats) :
+
+    python -m data_layer.snapshot export --output ../data/snapshot
+    python -m data_layer.snapshot verify ../data/snapshot
+    PROJET_CC_BACKEND=duckdb PROJET_CC_SNAPSHOT_DIR=../data/snapshot streamlit run 1_Climat_de_La_Reunion.py
+
+L'export lit les tables avec le moteur configuré : BigQuery (credentials dans les
+secrets) ou DuckDB pour reconditionner un snapshot local.
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+from config.settings import PROJECT_ROOT
+from data_layer.backends import MANIFEST_FILE, get_backend, referenced_tables
+from data_layer.queries import DBT_DATASET, REGISTRY
+
+SOURCES_FILE = PROJECT_ROOT / "models" / "staging" / "_stg_sources.yml"
+# Colonnes d'année utilisées pour trier les tables (filtres des pages)
+YEAR_COLUMNS = ("ANNEE", "year", "annee")
+ROWS_PER_FILE = 1_000_000
+ROW_GROUP_SIZE = 100_000
+FORMAT_VERSION = 1
+
+SOURCE_NAME = re.compile(r"^  - name:\s*['\"]?([^'\"\s]+)")
+SOURCE_SCHEMA = re.compile(r"^    schema:\s*['\"]?([^'\"\s]+)")
+TABLE_NAME = re.compile(r"^      - name:\s*['\"]?([^'\"\s]+)")
+
+
+def dbt_source_tables(path=SOURCES_FILE, project=None):
+    """Tables des sources dbt (`projet.dataset.table`), lues sans dépendre de PyYAML."""
+    project = project or DBT_DATASET.split(".")[0]
+    tables, schema = [], None
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        if match := SOURCE_NAME.match(line):
+            schema = match.group(1)
+        elif match := SOURCE_SCHEMA.match(line):
+            schema = match.group(1)
+        elif (match := TABLE_NAME.match(line)) and schema:
+            tables.append(f"{project}.{schema}.{match.group(1)}")
+    return tables
+
+
+def registry_tables():
+    return {table for query in REGISTRY for table in referenced_tables(query.render()[0])}
+
+
+def bundle_tables():
+    return sorted(registry_tables() | set(dbt_source_tables()))
+
+
+def sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def table_dir(bundle, table):
+    _, dataset, name = table.split(".")
+    return Path(bundle) / dataset / name
+
+
+def write_table(bundle, table, data, rows_per_file=ROWS_PER_FILE):
+    """Écrit `data` (table Arrow) dans le bundle ; renvoie l'entrée du manifeste."""
+    path = table_dir(bundle, table)
+    shutil.rmtree(path, ignore_errors=True)
+    path.mkdir(parents=True)
+
+    sort_column = next((c for c in YEAR_COLUMNS if c in data.column_names), None)
+    if sort_column is not None:
+        data = data.sort_by(sort_column)
+    files = []
+    for index, offset in enumerate(range(0, max(data.num_rows, 1), rows_per_file)):
+        part = data.slice(offset, rows_per_file)
+        file = path / f"part-{index:05d}.parquet"
+        pq.write_table(part, file, compression="zstd", row_group_size=ROW_GROUP_SIZE)
+        files.append({
+            "path": file.relative_to(bundle).as_posix(),
+            "rows": part.num_rows,
+            "bytes": file.stat().st_size,
+            "sha256": sha256(file),
+        })
+    return {
+        "rows": data.num_rows,
+        "schema": [{"name": field.name, "type": str(field.type)} for field in data.schema],
+        "sorted_by": sort_column,
+        "files": files,
+        # Empreinte de la table : version utilisée par le cache de résultats
+        "checksum": hashlib.sha256("".join(f["sha256"] for f in files).encode("ascii")).hexdigest(),
+    }
+
+
+def read_manifest(bundle):
+    return json.loads((Path(bundle) / MANIFEST_FILE).read_text(encoding="utf-8"))
+
+
+def export_bundle(output, tables=None, rows_per_file=ROWS_PER_FILE):
+    """
+    Exporte `tables` (défaut : `bundle_tables()`) ; renvoie le manifeste et les échecs.
+
+    Les tables sont écrites dans un répertoire temporaire à côté du bundle, puis
+    déplacées dans le bundle et le manifeste écrit seulement si toutes ont été
+    exportées : en cas d'échec, le bundle existant reste inchangé.
+    """
+    backend = get_backend()
+    output = Path(output)
+    staging = output.parent / f".{output.name}.partial"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    entries, errors = {}, {}
+    try:
+        for table in tables or bundle_tables():
+            start = time.perf_counter()
+            try:
+                entry = write_table(staging, table, backend.read_table(table), rows_per_file)
+                entry["source_version"] = backend.table_versions([table])[table]
+            except Exception as e:
+                errors[table] = str(e).splitlines()[0]
+                print(f"✗ {table} : {errors[table]}")
+                continue
+            entry["exported_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+            entries[table] = entry
+            print(f"✓ {table} : {entry['rows']} lignes, {len(entry['files'])} fichier(s) "
+                  f"({time.perf_counter() - start:.1f} s)")
+        if errors:
+            return None, errors
+
+        output.mkdir(parents=True, exist_ok=True)
+        manifest = {"format": FORMAT_VERSION, "tables": {}}
+        if (output / MANIFEST_FILE).exists():
+            # Export partiel : les autres tables du bundle sont conservées
+            manifest = read_manifest(output)
+        for table in entries:
+            target = table_dir(output, table)
+            shutil.rmtree(target, ignore_errors=True)
+            target.with_suffix(".parquet").unlink(missing_ok=True)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(table_dir(staging, table), target)
+        manifest["tables"].update(entries)
+        manifest["source"] = backend.name
+        manifest["created_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+        (output / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+        return manifest, errors
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def verify_bundle(bundle):
+    """Erreurs du bundle : fichiers manquants ou modifiés, lignes ou schéma différents."""
+    bundle = Path(bundle)
+    if not (bundle / MANIFEST_FILE).exists():
+        return [f"{MANIFEST_FILE} absent de {bundle}"]
+    errors = []
+    for table, entry in read_manifest(bundle)["tables"].items():
+        for file in entry["files"]:
+            path = bundle / file["path"]
+            if not path.exists():
+                errors.append(f"{table} : fichier manquant {file['path']}")
+            elif sha256(path) != file["sha256"]:
+                errors.append(f"{table} : empreinte différente pour {file['path']}")
+            elif pq.read_metadata(path).num_rows != file["rows"]:
+                errors.append(f"{table} : nombre de lignes différent dans {file['path']}")
+            elif [{"name": f.name, "type": str(f.type)} for f in pq.read_schema(path)] != entry["schema"]:
+                errors.append(f"{table} : schéma différent dans {file['path']}")
+        if sum(file["rows"] for file in entry["files"]) != entry["rows"]:
+            errors.append(f"{table} : {entry['rows']} lignes annoncées")
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bundle de données hors ligne (tables cc-reunion en Parquet).")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="Exporte les tables avec le moteur configuré")
+    export.add_argument("--output", required=True, help="Répertoire du bundle")
+    export.add_argument("--tables", nargs="*", help="Tables `projet.dataset.table` (défaut : registre + sources dbt)")
+    export.add_argument("--rows-per-file", type=int, default=ROWS_PER_FILE)
+    commands.add_parser("list", help="Liste les tables exportées par défaut")
+    verify = commands.add_parser("verify", help="Vérifie les fichiers d'un bundle")
+    verify.add_argument("bundle")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        print("\n".join(bundle_tables()))
+    elif args.command == "export":
+        manifest, errors = export_bundle(args.output, args.tables, args.rows_per_file)
+        if errors:
+            print(f"\n✗ {len(errors)} table(s) non exportée(s) : bundle {args.output} inchangé")
+            sys.exit(1)
+        print(f"\n{len(manifest['tables'])} table(s) dans {Path(args.output) / MANIFEST_FILE}")
+    else:
+        errors = verify_bundle(args.bundle)
+        for error in errors:
+            print(f"✗ {error}")
+        if errors:
+            sys.exit(1)
+        print(f"✓ {len(read_manifest(args.bundle)['tables'])} table(s) conformes au manifeste")
+
+
+if __name__ == "__main__":
+    main()
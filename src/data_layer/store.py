@@ -0,0 +1,118 @@
+"""
+Stockage en mémoire, en colonnes (Arrow), partagé par toutes les sessions du processus.
+
+Chaque jeu de données est chargé une fois par processus (et par version des tables
+sources), trié par ses colonnes clés (ex. `Z_GEO`, `ANNEE`) et accompagné d'index
+d'offsets : pour chaque niveau de clé, les positions où la valeur change.
+Un filtre sur les clés devient une recherche dichotomique (O(log n)) qui renvoie
+des tranches zéro-copie de la table, au lieu d'un masque booléen O(n) sur une
+copie pandas propre à chaque session.
+
+    store = get_store("annuelles_par_zone", ("Z_GEO", "ANNEE"))
+    store.frame(Z_GEO="AV_C")                    # série d'une zone
+    store.frame(ANNEE=2020)                      # toutes les zones pour une année
+    store.frame(Z_GEO=["AV_C", "SV_C"], ANNEE=2020)
+"""
+import numpy as np
+import pyarrow as pa
+import streamlit as st
+
+from data_layer.bigquery import run_named, dataset_version
+
+
+def _key_array(values):
+    # Clés comparables pour np.searchsorted : nombres tels quels, le reste en texte
+    if values.dtype.kind in "iufb":
+        return values.to_numpy()
+    return values.astype(str).to_numpy().astype(str)
+
+
+class ColumnStore:
+    def __init__(self, df, keys):
+        self.keys = tuple(keys)
+        valid = df[list(self.keys)].notna().all(axis=1).to_numpy()
+        # Tri par clés (lexsort : la dernière clé est la clé primaire) ; lignes à clé nulle en fin de table
+        arrays = [_key_array(df[key][valid]) for key in self.keys]
+        order = np.lexsort(arrays[::-1]) if len(df[valid]) else np.array([], dtype=int)
+        positions = np.concatenate([np.flatnonzero(valid)[order], np.flatnonzero(~valid)])
+        self.table = pa.Table.from_pandas(df, preserve_index=False).take(positions)
+        self.n_valid = len(order)
+        self.key_arrays = [array[order] for array in arrays]
+
+        # Index d'offsets : limites des blocs de valeurs identiques pour les clés 0..i
+        changed = np.zeros(max(self.n_valid - 1, 0), dtype=bool)
+        self.bounds = []
+        for array in self.key_arrays:
+            changed |= array[1:] != array[:-1]
+            self.bounds.append(np.concatenate([[0], np.flatnonzero(changed) + 1, [self.n_valid]]))
+
+    @property
+    def num_rows(self):
+        return self.table.num_rows
+
+    def _runs(self, level, lo, hi):
+        # Blocs de valeurs identiques (clés 0..level) dans [lo, hi)
+        bounds = self.bounds[level]
+        start, stop = np.searchsorted(bounds, [lo, hi])
+        return list(zip(bounds[start:stop], bounds[start + 1:stop + 1]))
+
+    def ranges(self, **criteria):
+        """
+        Intervalles [début, fin) des lignes correspondant aux critères (valeur ou liste).
+        Les lignes dont une clé est nulle ne sont renvoyées que sans critère.
+        """
+        unknown = set(criteria) - set(self.keys)
+        if unknown:
+            raise ValueError(f"Not a key column of the store: {sorted(unknown)} (keys: {self.keys})")
+        if not criteria:
+            return [(0, self.num_rows)]
+        last = max(self.keys.index(key) for key in criteria)
+        ranges = [(0, self.n_valid)]
+        for level, key in enumerate(self.keys[:last + 1]):
+            array = self.key_arrays[level]
+            narrowed = []
+            for lo, hi in ranges:
+                if key not in criteria:
+                    narrowed.extend(self._runs(level, lo, hi))
+                    continue
+                values = criteria[key]
+                values = values if isinstance(values, (list, tuple, set)) else [values]
+                for value in sorted(values):
+                    if array.dtype.kind == "U":
+                        value = str(value)
+                    start = lo + np.searchsorted(array[lo:hi], value, side="left")
+                    stop = lo + np.searchsorted(array[lo:hi], value, side="right")
+                    if start < stop:
+                        narrowed.append((start, stop))
+            ranges = narrowed
+        return ranges
+
+    def select(self, **criteria):
+        """Table Arrow des lignes correspondantes (tranches zéro-copie)."""
+        slices = [self.table.slice(start, stop - start) for start, stop in self.ranges(**criteria)]
+        if not slices:
+            return self.table.slice(0, 0)
+        return slices[0] if len(slices) == 1 else pa.concat_tables(slices)
+
+    def frame(self, **criteria):
+        """DataFrame pandas des lignes correspondantes (seule la tranche est convertie)."""
+        return self.select(**criteria).to_pandas()
+
+    def values(self, key):
+        """Valeurs distinctes (triées) d'une colonne clé."""
+        level = self.keys.index(key)
+        if self.n_valid == 0:
+            return []
+        if level == 0:
+            return self.key_arrays[0][self.bounds[0][:-1]].tolist()
+        return np.unique(self.key_arrays[level]).tolist()
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _build_store(name, keys, versions):
+    return ColumnStore(run_named(name), keys)
+
+
+def get_store(name, keys):
+    """Store partagé d'une requête du registre, reconstruit quand les tables sources changent."""
+    return _build_store(name, tuple(keys), dataset_version(name))
@@ -0,0 +1,115 @@
+"""
+Télémétrie des requêtes du data layer (latence, coût, cache).
+
+Chaque appel de `run_query` produit un enregistrement : requête (nom du registre
+ou empreinte du SQL), moteur, temps total, temps d'attente du job BigQuery
+(création -> démarrage), octets traités et facturés, lignes renvoyées, mémoire du
+DataFrame, et succès ou échec du cache de résultats.
+
+Les enregistrements sont :
+
+- écrits en logs structurés (une ligne JSON par requête) sur le logger
+  `projet_cc.queries`, et dans un fichier JSONL si `PROJET_CC_TELEMETRY_LOG` est défini ;
+- conservés en mémoire (derniers `PROJET_CC_TELEMETRY_SIZE` appels) pour le
+  panneau d'administration (`show_query_telemetry`), affiché dans la barre latérale
+  si `PROJET_CC_ADMIN` vaut 1 (ou `admin_panel = true` dans la section [data]).
+"""
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+import streamlit as st
+
+from config.settings import get_setting
+
+logger = logging.getLogger("projet_cc.queries")
+
+# Colonnes d'un enregistrement (dans l'ordre du panneau d'administration)
+FIELDS = [
+    "timestamp", "query", "backend", "cache", "wall_ms", "queue_ms",
+    "bytes_processed", "bytes_billed", "rows", "memory_bytes", "job_id", "error",
+]
+
+
+class QueryTelemetry:
+    def __init__(self, max_records=1000, log_path=None):
+        self.records = deque(maxlen=max_records)
+        self.log_path = log_path
+        self._lock = threading.Lock()
+
+    def record(self, **values):
+        record = {field: values.get(field) for field in FIELDS}
+        record["timestamp"] = time.time()
+        line = json.dumps(record, default=str)
+        logger.info(line)
+        with self._lock:
+            self.records.append(record)
+            if self.log_path:
+                with open(self.log_path, "a", encoding="utf-8") as file:
+                    file.write(line + "\n")
+
+    def frame(self):
+        with self._lock:
+            return pd.DataFrame(list(self.records), columns=FIELDS)
+
+    def summary(self):
+        """Agrégats par requête, triés par temps total décroissant."""
+        df = self.frame()
+        if df.empty:
+            return pd.DataFrame(columns=[
+                "query", "calls", "hit_ratio", "total_ms", "mean_ms", "p95_ms", "bytes_billed", "errors"
+            ])
+        df["hit"] = df["cache"] == "hit"
+        summary = df.groupby("query").agg(
+            calls=("wall_ms", "size"),
+            hit_ratio=("hit", "mean"),
+            total_ms=("wall_ms", "sum"),
+            mean_ms=("wall_ms", "mean"),
+            p95_ms=("wall_ms", lambda s: s.quantile(0.95)),
+            bytes_billed=("bytes_billed", "sum"),
+            errors=("error", "count"),
+        )
+        return summary.sort_values("total_ms", ascending=False).reset_index()
+
+    def clear(self):
+        with self._lock:
+            self.records.clear()
+
+
+def frame_memory(df):
+    # Mémoire du DataFrame (chaînes comprises)
+    return int(df.memory_usage(deep=True).sum())
+
+
+@st.cache_resource
+def get_query_telemetry():
+    return QueryTelemetry(
+        max_records=int(get_setting("PROJET_CC_TELEMETRY_SIZE", "telemetry_size", 1000)),
+        log_path=get_setting("PROJET_CC_TELEMETRY_LOG", "telemetry_log"),
+    )
+
+
+def is_admin_enabled():
+    return str(get_setting("PROJET_CC_ADMIN", "admin_panel", "0")).lower() in ("1", "true", "yes")
+
+
+def show_query_telemetry():
+    # Panneau d'administration : requêtes dominantes en latence et en coût
+    if not is_admin_enabled():
+        return
+    telemetry = get_query_telemetry()
+    summary = telemetry.summary()
+    with st.sidebar.expander("Télémétrie des requêtes (admin)", expanded=False):
+        if summary.empty:
+            st.caption("Aucune requête enregistrée.")
+            return
+        calls = summary["calls"].sum()
+        hits = (summary["hit_ratio"] * summary["calls"]).sum()
+        st.metric("Requêtes", int(calls), f"{hits / calls:.0%} servies par le cache", delta_color="off")
+        st.metric("Octets facturés", f"{summary['bytes_billed'].sum() / 1024 ** 3:.2f} Go")
+        st.dataframe(summary, hide_index=True)
+        if st.button("Réinitialiser", key="reset_query_telemetry"):
+            telemetry.clear()
@@ -0,0 +1,97 @@
+"""
+Affectation des stations et des points de grille aux micro-climats (`Z_GEO`).
+
+Les polygones de `zones_climatiques.geojson` sont indexés dans un STRtree ;
+l'affectation de milliers de points se fait en une seule requête vectorisée
+(`within`), avec repli optionnel sur la zone la plus proche pour les points
+côtiers situés juste en dehors des polygones.
+
+Le résultat remplace la table `stations_zones` maintenue à la main et fournit
+la zone des points de grille des simulations (`points_zones`, jointe dans
+`stg_simu_all_RWL`). Utilisation (depuis `src/`) :
+
+    python -m geo.spatial_index ../data/simu/points.parquet --output ../data/zones/points_zones.parquet
+    python -m geo.spatial_index ../data/lsh/max_temp/metadata.parquet \
+        --id NUM_POSTE --lat LATITUDE_DEG --lon LONGITUDE_DEG --output ../data/zones/stations_zones.parquet
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+import shapely
+
+from geo.zones import read_zones, ZONES_PATH
+
+# Distance maximale (en degrés, ~2 km) pour le repli sur la zone la plus proche
+MAX_DISTANCE = 0.02
+
+
+class ZoneIndex:
+    def __init__(self, zones):
+        self.names = np.array([properties.get("Zone") for properties, _ in zones], dtype=object)
+        self.tree = shapely.STRtree([geometry for _, geometry in zones])
+
+    def assign(self, latitudes, longitudes, max_distance=MAX_DISTANCE):
+        """Zone de chaque point (None si hors des polygones et au-delà de `max_distance`)."""
+        points = shapely.points(np.asarray(longitudes, dtype="float64"), np.asarray(latitudes, dtype="float64"))
+        zones = np.full(len(points), None, dtype=object)
+        found = np.zeros(len(points), dtype=bool)
+        point_index, zone_index = self.tree.query(points, predicate="within")
+        zones[point_index] = self.names[zone_index]
+        found[point_index] = True
+        missing = np.flatnonzero(~found & ~shapely.is_missing(points))
+        if max_distance and len(missing):
+            point_index, zone_index = self.tree.query_nearest(
+                points[missing], max_distance=max_distance, all_matches=False
+            )
+            zones[missing[point_index]] = self.names[zone_index]
+        return zones
+
+
+def assign_zones(table, id_column="Point", lat_column="Latitude", lon_column="Longitude",
+                 max_distance=MAX_DISTANCE, index=None):
+    """Table (identifiant, Latitude, Longitude, Z_GEO) à partir d'une table Arrow de points."""
+    index = index or ZoneIndex(read_zones())
+    latitudes = table.column(lat_column).cast(pa.float64()).to_numpy(zero_copy_only=False)
+    longitudes = table.column(lon_column).cast(pa.float64()).to_numpy(zero_copy_only=False)
+    zones = index.assign(latitudes, longitudes, max_distance)
+    return pa.table({
+        id_column: table.column(id_column),
+        "Latitude": latitudes,
+        "Longitude": longitudes,
+        "Z_GEO": pa.array(zones, pa.string()),
+    })
+
+
+def read_points(path):
+    # points.csv du notebook (séparateur ",") ou Parquet (ingestion.rwl, métadonnées LSH)
+    if str(path).endswith(".csv"):
+        return pv.read_csv(path)
+    return pq.read_table(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Affectation de points (stations, grille) aux micro-climats.")
+    parser.add_argument("input", help="Fichier de points (.parquet ou .csv)")
+    parser.add_argument("--output", required=True, help="Fichier Parquet de sortie")
+    parser.add_argument("--id", default="Point", help="Colonne identifiant (défaut : Point)")
+    parser.add_argument("--lat", default="Latitude", help="Colonne latitude (défaut : Latitude)")
+    parser.add_argument("--lon", default="Longitude", help="Colonne longitude (défaut : Longitude)")
+    parser.add_argument("--max-distance", type=float, default=MAX_DISTANCE,
+                        help="Repli sur la zone la plus proche jusqu'à cette distance en degrés (0 : désactivé)")
+    parser.add_argument("--zones", default=str(ZONES_PATH), help="GeoJSON des zones climatiques")
+    args = parser.parse_args(argv)
+
+    index = ZoneIndex(read_zones(args.zones))
+    table = assign_zones(read_points(args.input), args.id, args.lat, args.lon, args.max_distance, index)
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, args.output)
+    nb_hors_zone = table.column("Z_GEO").null_count
+    print(f"✓ {table.num_rows} points ({nb_hors_zone} hors zone) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Géométries des zones climatiques (micro-climats) pour la carte de la page d'accueil.
+
+Le fichier `zones_climatiques.geojson` est lu une seule fois par processus ; le
+style de chaque zone est calculé à ce moment-là (plus d'appel à
+`get_couleurs_zones()` par entité) et la couche GeoJSON sérialisée est mise en
+cache par niveau de zoom, avec des géométries simplifiées à la résolution d'un
+pixel et des coordonnées arrondies pour réduire la taille envoyée au navigateur.
+"""
+import json
+
+import shapely
+import streamlit as st
+from shapely.geometry import mapping, shape
+
+from config.constants import get_couleurs_zones
+from config.settings import PROJECT_ROOT
+
+ZONES_PATH = PROJECT_ROOT / "src" / "zones_climatiques.geojson"
+# Précision des coordonnées envoyées au navigateur (~1 m)
+GRID_SIZE = 1e-5
+STYLE_PAR_DEFAUT = {"fillColor": "#808080", "color": "#000000", "weight": 2, "fillOpacity": 0.4}
+
+
+def tolerance_for_zoom(zoom):
+    # Taille d'un pixel en degrés (tuiles de 256 px) : en dessous, la simplification est invisible
+    return 360 / (256 * 2 ** int(zoom)) / 2
+
+
+def zone_style(zone):
+    couleur = get_couleurs_zones().get(zone)
+    if couleur is None:
+        return dict(STYLE_PAR_DEFAUT)
+    return {**STYLE_PAR_DEFAUT, "fillColor": couleur, "color": couleur}
+
+
+def read_zones(path=ZONES_PATH):
+    """Liste des zones (propriétés avec style précalculé, géométrie shapely)."""
+    with open(path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+    zones = []
+    for feature in data["features"]:
+        properties = dict(feature["properties"])
+        properties["style"] = zone_style(properties.get("Zone"))
+        zones.append((properties, shape(feature["geometry"])))
+    return zones
+
+
+@st.cache_resource(show_spinner=False)
+def load_zones():
+    return read_zones()
+
+
+@st.cache_resource(show_spinner=False)
+def get_zones_layer(zoom):
+    """Couche GeoJSON sérialisée (chaîne JSON) simplifiée pour le niveau de zoom."""
+    tolerance = tolerance_for_zoom(zoom)
+    features = []
+    for properties, geometry in load_zones():
+        geometry = shapely.set_precision(geometry.simplify(tolerance, preserve_topology=True), GRID_SIZE)
+        features.append({"type": "Feature", "properties": properties, "geometry": mapping(geometry)})
+    return json.dumps({"type": "FeatureCollection", "features": features}, separators=(",", ":"))
+
+
+def style_function(feature):
+    return feature["properties"]["style"]
+
+
+def highlight_function(feature):
+    return {
+        "weight": 4,
+        "color": "yellow",
+        "fillOpacity": 0.7,
+    }
@@ -0,0 +1,179 @@
+"""
+Ingestion des séries mensuelles homogénéisées (LSH) de Météo-France pour l'outre-mer.
+
+Remplace le notebook `notebooks/fetch_split_format_monthly_data.ipynb` :
+
+- les archives ZIP sont téléchargées par blocs dans un fichier temporaire (ou lues
+  depuis un chemin local), jamais chargées entièrement en mémoire ;
+- chaque CSV de station est lu en une seule passe : les lignes d'en-tête
+  (métadonnées du poste) puis les mesures, parsées directement en Arrow ;
+- les archives Precipitations / Max_Temp / Min_Temp sont traitées en parallèle ;
+- les mesures sont écrites en Parquet partitionné par poste
+  (`<sortie>/<jeu>/data/num_post=<poste>/part-0.parquet`) et les métadonnées
+  dans `<sortie>/<jeu>/metadata.parquet`.
+
+Utilisation (depuis `src/`) :
+
+    python -m ingestion.fetch_monthly_data --output ../data/lsh
+    python -m ingestion.fetch_monthly_data --source Precipitations=tests/rr.zip --only Precipitations
+"""
+import argparse
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+import requests
+
+# Clé = nom du jeu de données généré, URL = lien vers l'archive ZIP
+SOURCES = {
+    "Precipitations": "https://www.data.gouv.fr/api/1/datasets/r/9617eade-a4ae-4fa1-bbe7-88458aff67b2",
+    "Max_Temp": "https://www.data.gouv.fr/api/1/datasets/r/69f2f61e-781c-4132-84c1-dee3e0becbbb",
+    "Min_Temp": "https://www.data.gouv.fr/api/1/datasets/r/9cfc5c85-3a23-4a2b-99b6-57ae76ce25b4",
+}
+
+# Structure d'un CSV de station : une ligne de titre, 12 lignes de métadonnées
+# commençant par "#", puis les mesures (séparateur ";") avec leur ligne d'en-tête
+METADATA_LINES = 12
+CHUNK_SIZE = 1024 * 1024
+
+# Noms de métadonnées renommés pour que l'import fonctionne sur BigQuery
+NOMS_COLONNES_BIGQUERY = {
+    "LATITUDE (°)": "LATITUDE_DEG",
+    "LONGITUDE(°)": "LONGITUDE_DEG",
+    "ALTITUDE (m)": "ALTITUDE_M",
+    "ETAT DU POSTE (fermé avec date de fermeture AAAA-MM-JJ ou ouvert à la date de production du fichier le 13/03/2025)": "ETAT_POSTE",
+    "Amplitude minimale détectable de la série": "AMPLITUDE_MIN_DETECTABLE",
+    "Période homogénéisée": "PERIODE_HOMOGENISEE",
+    "Date(s) de rupture(s) d'homogénéité": "DATE_RUPTURE_HOMOGENEITE",
+    "Periode homogénéisée  196501 201312  : Q_HOM": "Q_HOM_196501_201312",
+    "Données prolongées si nécessaire jusqu'en 202412 par des donnees mensuelles non homogénéisées : Q_HOM": "Q_HOM_PROLONGEES_202412",
+    "Periode homogénéisée  195501 201512  : Q_HOM": "Q_HOM_195501_201512",
+    "Periode homogénéisée  196801 201312  : Q_HOM": "Q_HOM_196801_201312",
+    "Periode homogénéisée  196401 201712  : Q_HOM": "Q_HOM_196401_201712",
+    "Periode homogénéisée  197201 201512  : Q_HOM": "Q_HOM_197201_201512",
+    "Periode homogénéisée  196701 201512  : Q_HOM": "Q_HOM_196701_201512",
+    "Periode homogénéisée  195701 201512  : Q_HOM": "Q_HOM_195701_201512",
+    "Periode homogénéisée  196501 201512  : Q_HOM": "Q_HOM_196501_201512",
+    "Periode homogénéisée  197001 201512  : Q_HOM": "Q_HOM_197001_201512",
+    "Periode homogénéisée  196901 201512  : Q_HOM": "Q_HOM_196901_201512",
+    "Periode homogénéisée  196801 201512  : Q_HOM": "Q_HOM_196801_201512",
+    "Periode homogénéisée  196501 202112  : Q_HOM": "Q_HOM_196501_202112",
+}
+
+
+def parse_metadata_line(line):
+    # "# CLE = valeur" ou "# CLE : valeur" -> (CLE, valeur), None sinon
+    line = line.strip()
+    if not line.startswith("#"):
+        return None
+    content = line[1:].strip()
+    for separator in ("=", ":"):
+        if separator in content:
+            key, value = content.split(separator, 1)
+            key = key.strip()
+            return NOMS_COLONNES_BIGQUERY.get(key, key), value.strip()
+    return None
+
+
+def read_station_csv(member, key):
+    """
+    Lit un CSV de station en une passe et retourne (poste, métadonnées, mesures Arrow).
+    `member` est un flux binaire ouvert dans l'archive.
+    """
+    member.readline()  # ligne de titre
+    metadata = {}
+    for _ in range(METADATA_LINES):
+        parsed = parse_metadata_line(member.readline().decode("utf-8"))
+        if parsed is not None:
+            metadata[parsed[0]] = parsed[1]
+    # Le poste est la valeur de la première ligne de métadonnées (NUM_POSTE = ...)
+    num_post = next(iter(metadata.values()))
+
+    # Le reste du flux (en-tête + mesures) est parsé directement en Arrow
+    # (types fixés pour que toutes les partitions aient le même schéma)
+    table = pv.read_csv(
+        member,
+        parse_options=pv.ParseOptions(delimiter=";"),
+        convert_options=pv.ConvertOptions(column_types={"AAAAMM": pa.int32(), "VALEUR": pa.float64()}),
+    )
+    if "VALEUR" in table.column_names:
+        table = table.rename_columns([key if name == "VALEUR" else name for name in table.column_names])
+    return num_post, metadata, table
+
+
+def open_archive(source, tmp_dir):
+    # Chemin local (fixtures de test) ou URL téléchargée par blocs sur disque
+    if not str(source).startswith(("http://", "https://")):
+        return zipfile.ZipFile(source)
+    path = Path(tmp_dir) / "archive.zip"
+    with requests.get(source, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        with open(path, "wb") as file:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                file.write(chunk)
+    return zipfile.ZipFile(path)
+
+
+def ingest_archive(key, source, output_dir):
+    """Traite une archive et retourne le nombre de postes et de lignes écrits."""
+    dataset_dir = Path(output_dir) / key.lower()
+    data_dir = dataset_dir / "data"
+    if data_dir.exists():
+        shutil.rmtree(data_dir)
+    metadata_rows = []
+    nb_rows = 0
+    with tempfile.TemporaryDirectory() as tmp_dir, open_archive(source, tmp_dir) as archive:
+        for filename in archive.namelist():
+            if not filename.endswith(".csv"):
+                continue
+            with archive.open(filename) as member:
+                num_post, metadata, table = read_station_csv(member, key)
+            # Le poste est porté par le nom de partition (lecture hive : colonne num_post)
+            partition_dir = data_dir / f"num_post={num_post}"
+            partition_dir.mkdir(parents=True, exist_ok=True)
+            pq.write_table(table, partition_dir / "part-0.parquet", compression="zstd")
+            metadata_rows.append(metadata)
+            nb_rows += table.num_rows
+    # Toutes les clés de métadonnées, même absentes de certains postes
+    names = list(dict.fromkeys(name for row in metadata_rows for name in row))
+    columns = {name: pa.array([row.get(name) for row in metadata_rows], pa.string()) for name in names}
+    pq.write_table(pa.table(columns), dataset_dir / "metadata.parquet")
+    return len(metadata_rows), nb_rows
+
+
+def ingest(sources, output_dir, max_workers=None):
+    with ThreadPoolExecutor(max_workers=max_workers or len(sources)) as executor:
+        futures = {key: executor.submit(ingest_archive, key, source, output_dir) for key, source in sources.items()}
+        return {key: future.result() for key, future in futures.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingestion des séries mensuelles LSH Météo-France en Parquet.")
+    parser.add_argument("--output", default=str(Path(__file__).resolve().parents[2] / "data" / "lsh"),
+                        help="Répertoire de sortie (défaut : data/lsh)")
+    parser.add_argument("--source", action="append", default=[], metavar="JEU=URL_OU_CHEMIN",
+                        help="Remplace la source d'un jeu (ex. Precipitations=fixtures/rr.zip)")
+    parser.add_argument("--only", nargs="+", choices=sorted(SOURCES), help="Ne traiter que ces jeux")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre d'archives traitées en parallèle")
+    args = parser.parse_args(argv)
+
+    sources = dict(SOURCES)
+    for override in args.source:
+        key, _, value = override.partition("=")
+        if key not in SOURCES or not value:
+            parser.error(f"Source invalide : {override!r}")
+        sources[key] = value
+    if args.only:
+        sources = {key: sources[key] for key in args.only}
+
+    for key, (nb_postes, nb_lignes) in ingest(sources, args.output, args.workers).items():
+        print(f"✓ {key} : {nb_postes} postes, {nb_lignes} lignes -> {Path(args.output) / key.lower()}")
+
+
+if __name__ == "__main__":
+    main()
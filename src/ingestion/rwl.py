@@ -0,0 +1,111 @@
+"""
+Lecture des fichiers de simulation DRIAS par niveau de réchauffement (`simu_RWL*.txt`).
+
+Format : un long en-tête de commentaires (`#`), dont la ligne des colonnes
+`# Point;Latitude;Longitude;Contexte;Période;NORTMm;...;`, puis une ligne par point
+de grille, séparateur `;` (avec un `;` final).
+
+La ligne des colonnes est localisée automatiquement (plus de numéros de lignes
+fixes comme dans `extraire_csv` du notebook `chloe_explo_simu.ipynb`) et les
+mesures sont parsées directement en Arrow, sans CSV intermédiaire. Les trois
+horizons (RWL15, RWL20, RWL29) sont concaténés dans une seule table, chargée
+ensuite dans `data_meteofrance.simu_all_RWL` (source de `stg_simu_all_RWL`).
+
+Utilisation (depuis `src/`) :
+
+    python -m ingestion.rwl simu_RWL15.txt simu_RWL20.txt simu_RWL29.txt \
+        --output ../data/simu/simu_all_RWL.parquet --points ../data/simu/points.parquet
+    bq load --source_format=PARQUET data_meteofrance.simu_all_RWL ../data/simu/simu_all_RWL.parquet
+"""
+import argparse
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+
+HEADER_PREFIX = "# Point;"
+# Colonnes non numériques (toutes les autres sont des indicateurs en float64)
+COLUMN_TYPES = {
+    "Point": pa.int32(),
+    "Latitude": pa.float64(),
+    "Longitude": pa.float64(),
+    "Contexte": pa.string(),
+    "Période": pa.string(),
+}
+# Le ";" final de chaque ligne produit une colonne vide, ignorée à la lecture
+TRAILING_COLUMN = "_fin_de_ligne"
+
+
+def locate_header(path):
+    """Retourne (colonnes, nombre de lignes à sauter avant la première donnée)."""
+    columns = None
+    with open(path, "r", encoding="utf-8") as file:
+        for index, line in enumerate(file):
+            line = line.strip()
+            if columns is None:
+                if line.startswith(HEADER_PREFIX):
+                    columns = line[2:].rstrip(";").split(";")
+            elif line and not line.startswith("#"):
+                return columns, index
+    if columns is None:
+        raise ValueError(f"No '{HEADER_PREFIX}...' header line found in {path}")
+    raise ValueError(f"No data line after the header in {path}")
+
+
+def read_rwl(path):
+    columns, skip_rows = locate_header(path)
+    column_types = {name: COLUMN_TYPES.get(name, pa.float64()) for name in columns}
+    return pv.read_csv(
+        path,
+        read_options=pv.ReadOptions(skip_rows=skip_rows, column_names=columns + [TRAILING_COLUMN]),
+        parse_options=pv.ParseOptions(delimiter=";"),
+        convert_options=pv.ConvertOptions(column_types=column_types, include_columns=columns),
+    )
+
+
+def read_rwl_files(paths):
+    """Concatène les horizons (un fichier par niveau de réchauffement) dans une table."""
+    tables = [read_rwl(path) for path in paths]
+    table = pa.concat_tables(tables, promote_options="default")
+    # Contexte / Période ne prennent que quelques valeurs
+    for name in ("Contexte", "Période"):
+        if name in table.column_names:
+            index = table.column_names.index(name)
+            table = table.set_column(index, name, table.column(name).dictionary_encode())
+    return table
+
+
+def extract_points(table):
+    """Table des points de grille (Point, Latitude, Longitude), sans doublons."""
+    # Les coordonnées d'un point sont identiques d'un horizon à l'autre
+    points = table.group_by("Point").aggregate([("Latitude", "min"), ("Longitude", "min")])
+    points = pa.table({
+        "Point": points["Point"],
+        "Latitude": points["Latitude_min"],
+        "Longitude": points["Longitude_min"],
+    })
+    return points.take(pc.sort_indices(points, [("Point", "ascending")]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Conversion des fichiers simu_RWL*.txt en Parquet.")
+    parser.add_argument("files", nargs="+", help="Fichiers simu_RWL*.txt (un par horizon)")
+    parser.add_argument("--output", required=True, help="Fichier Parquet de sortie (simu_all_RWL)")
+    parser.add_argument("--points", help="Fichier Parquet des points de grille (Point, Latitude, Longitude)")
+    args = parser.parse_args(argv)
+
+    table = read_rwl_files(args.files)
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, args.output, compression="zstd")
+    print(f"✓ {table.num_rows} lignes -> {args.output}")
+    if args.points:
+        points = extract_points(table)
+        Path(args.points).parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(points, args.points)
+        print(f"✓ {points.num_rows} points -> {args.points}")
+
+
+if __name__ == "__main__":
+    main()
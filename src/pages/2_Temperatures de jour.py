@@ -3,9 +3,13 @@
 # Importations nécessaires
 import streamlit as st
 import pandas as pd
-import altair as alt
 
-from data_layer.bigquery import get_annuelles_par_zone
+from data_layer.bigquery import get_resume_annuelles_par_zone, dataset_version
+from data_layer.store import get_store
+from charts.temperatures_jour import chart_serie_temporelle, chart_comparaison_zones
+from charts.figure_cache import cached_chart, render_chart
+from data_layer.prefetch import show_warm_up_status
+from profiling.spans import span, start_rerun, finish_rerun
 
 ## Configuration de la page Streamlit
 st.set_page_config(
@@ -14,27 +18,43 @@ st.set_page_config(
     layout="wide"
 )
 
+start_rerun("2_Temperatures de jour")
 st.title("☀️ Analyse des Jours de Forte Chaleur à La Réunion")
 
 
 
-# --- Fonction de chargement des données (avec cache) ---
-@st.cache_data
-def load_data():
-    df = get_annuelles_par_zone()
-    # Conversion de l'année en datetime pour la série temporelle
-    df['ANNEE_DATE'] = pd.to_datetime(df['ANNEE'], format='%Y')
+# --- Fonctions de chargement des données ---
+# Les données annuelles par zone sont chargées une fois par processus dans un store
+# partagé par toutes les sessions, trié par zone puis année : chaque interaction
+# ne lit qu'une tranche (recherche dichotomique), sans copie de la table complète.
+def get_store_annuelles():
+    return get_store("annuelles_par_zone", ("Z_GEO", "ANNEE"))
+
+def load_serie(zone):
+    criteres = {'Z_GEO': zone} if zone != 'Toutes les zones' else {}
+    df = get_store_annuelles().frame(**criteres)
     # Conversion de l'année en numérique/int pour le curseur
+    # (ANNEE peut arriver en catégorie depuis le data layer)
     df['ANNEE'] = pd.to_numeric(df['ANNEE'])
+    # Conversion de l'année en datetime pour la série temporelle
+    df['ANNEE_DATE'] = pd.to_datetime(df['ANNEE'].astype(str), format='%Y')
     return df
 
+def load_annee(annee, zone='Toutes les zones'):
+    criteres = {'ANNEE': annee} if zone == 'Toutes les zones' else {'Z_GEO': zone, 'ANNEE': annee}
+    return get_store_annuelles().frame(**criteres)
+
 try:
-    # 1. Chargement des données
-    data_temp = load_data()
+    # Moteur de données et préchargement (erreurs d'initialisation affichées ci-dessous)
+    show_warm_up_status()
+
+    # 1. Chargement du résumé par zone (bornes des années, liste des zones)
+    with span("data"):
+        resume_zones = get_resume_annuelles_par_zone()
     
-    # 2. Préparation du DataFrame pour l'interface
-    min_annee = int(data_temp['ANNEE'].min())
-    max_annee = int(data_temp['ANNEE'].max())
+    # 2. Préparation des bornes pour l'interface
+    min_annee = int(resume_zones['annee_min'].min())
+    max_annee = int(resume_zones['annee_max'].max())
 
     # 3. Barre latérale et Filtres Interactifs
     # --------------------------------------------------------------------------
@@ -50,23 +70,19 @@ try:
     )
     
     # Sélecteur de zone climatique
-    zones_uniques = ['Toutes les zones'] + sorted(data_temp['Z_GEO'].unique().tolist())
+    zones_uniques = ['Toutes les zones'] + sorted(resume_zones['Z_GEO'].astype(str).tolist())
     zone_selectionnee = st.sidebar.selectbox(
         "Sélectionnez une Zone Climatique :", 
         zones_uniques
     )
     
-    # 4. Filtrage des DataFrames
+    # 4. Chargement des DataFrames filtrés
     # --------------------------------------------------------------------------
     
-    # DataFrame pour la Série Temporelle (filtré uniquement par Z_CLIM)
-    if zone_selectionnee != 'Toutes les zones':
-        df_serie_temporelle = data_temp[data_temp['Z_GEO'] == zone_selectionnee]
-    else:
-        df_serie_temporelle = data_temp.copy()
-        
-    # DataFrame pour les KPI et l'Analyse Annuelle (filtré par Z_CLIM et ANNEE)
-    df_annee_filtree = df_serie_temporelle[df_serie_temporelle['ANNEE'] == annee_selectionnee]
+    with span("transform"):
+        # DataFrame de l'année sélectionnée (toutes zones), et restreint à la zone
+        df_annee = load_annee(annee_selectionnee)
+        df_annee_filtree = load_annee(annee_selectionnee, zone_selectionnee)
 
     # --- Indicateurs de Performance (KPI) ---
     st.subheader(f"Indicateurs Clés pour l'Année {annee_selectionnee} 🌡️")
@@ -76,8 +92,14 @@ try:
     if not df_annee_filtree.empty:
         jours_annee = df_annee_filtree['moyenne_jours_chauds_zone'].mean()
         
-        # Calcul de la variation par rapport à la moyenne de la zone sur toute la période
-        moyenne_historique_zone = df_serie_temporelle['moyenne_jours_chauds_zone'].mean()
+        # Variation par rapport à la moyenne de la zone sur toute la période
+        # (précalculée dans le résumé : aucun recalcul à chaque interaction)
+        if zone_selectionnee == 'Toutes les zones':
+            moyenne_historique_zone = resume_zones['T_moyenne_periode_toutes_zones'].iloc[0]
+        else:
+            moyenne_historique_zone = resume_zones.loc[
+                resume_zones['Z_GEO'].astype(str) == zone_selectionnee, 'T_moyenne_periode'
+            ].iloc[0]
         delta_annee = jours_annee - moyenne_historique_zone
         
         col1.metric(
@@ -90,7 +112,7 @@ try:
 
 
     # 2. Moyenne globale de l'année sélectionnée (toutes zones confondues)
-    moyenne_globale_annee = data_temp[data_temp['ANNEE'] == annee_selectionnee]['moyenne_jours_chauds_zone'].mean()
+    moyenne_globale_annee = df_annee['moyenne_jours_chauds_zone'].mean()
     col2.metric(
         f"Moyenne Année {annee_selectionnee} (Global)", 
         f"{moyenne_globale_annee:.1f} jours/an",
@@ -100,40 +122,29 @@ try:
     # --- Visualisation Principale : Série Temporelle ---
     st.subheader("Série Temporelle : Évolution des Jours de Forte Chaleur (1950-2024)")
     
-    # Création du graphique en lignes
-    chart_line = alt.Chart(df_serie_temporelle).mark_line().encode(
-        # Utilisation de :T pour Temporel
-        x=alt.X('ANNEE_DATE:T', title='Année'),
-        y=alt.Y('moyenne_jours_chauds_zone:Q', title='Moyenne Jours > 32°C'),
-        color='Z_GEO:N', 
-        tooltip=[
-            alt.Tooltip('ANNEE_DATE:T', title='Année', format='%Y'), 
-            'Z_GEO', 
-            alt.Tooltip('moyenne_jours_chauds_zone:Q', format='.1f', title='Jours Chauds')
-        ]
-    ).properties(
-        title=f'Tendance des Jours de Chaleur Extrême pour {zone_selectionnee}'
-    ).interactive()
-
-    st.altair_chart(chart_line, use_container_width=True)
+    # Série de la zone (filtrée uniquement par Z_GEO) chargée seulement si le graphique
+    # de cette zone n'est pas déjà en cache
+    with span("chart_serie_temporelle"):
+        chart_line = cached_chart(
+            "temperatures_jour.serie", dataset_version("annuelles_par_zone"), (zone_selectionnee,),
+            lambda: chart_serie_temporelle(load_serie(zone_selectionnee), zone_selectionnee)
+        )
+
+    render_chart(chart_line, use_container_width=True)
     
     # --- Visualisation Secondaire : Comparaison des Zones (Barres) ---
     st.subheader("Comparaison : Jours Chauds Moyens par Zone (Toute la Période)")
     
-    # Calcul de la moyenne sur toute la période pour chaque zone
-    df_comparaison = data_temp.groupby('Z_GEO')['moyenne_jours_chauds_zone'].mean().reset_index()
-    df_comparaison.columns = ['Z_GEO', 'T_moyenne_periode']
+    # Moyenne sur toute la période pour chaque zone (calculée dans la requête)
+    df_comparaison = resume_zones[['Z_GEO', 'T_moyenne_periode']]
 
-    chart_bar = alt.Chart(df_comparaison).mark_bar().encode(
-        x=alt.X('T_moyenne_periode:Q', title='Moyenne Jours > 32°C (Période Totale)'),
-        y=alt.Y('Z_GEO:N', sort='-x', title='Zone Climatique'),
-        color=alt.Color('Z_GEO:N', legend=None),
-        tooltip=['Z_GEO', alt.Tooltip('T_moyenne_periode:Q', format='.1f', title='Moyenne Jours Chauds')]
-    ).properties(
-        title='Zones les plus exposées à la chaleur extrême (Moyenne 1950-2024)'
-    ).interactive()
+    with span("chart_comparaison_zones"):
+        chart_bar = cached_chart(
+            "temperatures_jour.comparaison", dataset_version("annuelles_resume_par_zone"), (),
+            lambda: chart_comparaison_zones(df_comparaison)
+        )
 
-    st.altair_chart(chart_bar, use_container_width=True)
+    render_chart(chart_bar, use_container_width=True)
 
     # 4. Affichage du DataFrame
     st.subheader(f"Aperçu des Données Filtrées (Année {annee_selectionnee})")
@@ -142,4 +153,6 @@ try:
 
 except Exception as e:
     st.error(f"Une erreur s'est produite : {e}")
-    st.warning("Vérifiez la connexion à BigQuery (credentials) et la structure des colonnes dans la requête SQL.")
\ No newline at end of file
+    st.warning("Vérifiez la connexion à BigQuery (credentials) et la structure des colonnes dans la requête SQL.")
+
+finish_rerun()
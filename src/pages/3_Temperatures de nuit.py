@@ -1,9 +1,16 @@
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
 import numpy as np
 import pandas as pd
 from data_layer.bigquery import get_nb_moy_nuits_sup_20deg_par_zone_par_annee
+from data_layer.prefetch import show_warm_up_status
+from analytics.tendances import get_tendances, droites
+from analytics.climatologies import get_climatologie, anomalies
+from charts.temperatures_nuit import figure_tendances, figure_ecarts, STYLES_TENDANCE
+from profiling.spans import span, start_rerun, finish_rerun
+
+# Colonnes utilisées par la page ; les données avant 1983 sont incomplètes
+COLONNES = ("ANNEE", "zone_geographique", "moy_nuits_ge_20")
+FILTRES = {"ANNEE": (">=", 1983)}
 
 
 st.set_page_config(
@@ -11,6 +18,8 @@ st.set_page_config(
     page_icon="",
     layout="wide"
 )
+start_rerun("3_Temperatures de nuit")
+show_warm_up_status()
 
 
 
@@ -18,10 +27,9 @@ st.set_page_config(
 # ------------------------------
 # 1. Plotly : line chart multi-zones
 # ------------------------------
-# df : ANNEE, zone_geographique, moy_nuits_ge_20, (nb_stations)
-df = get_nb_moy_nuits_sup_20deg_par_zone_par_annee()
-# Data before 1983 is incomplete
-df = df[df["ANNEE"] >= 1983]
+# df : ANNEE, zone_geographique, moy_nuits_ge_20
+with span("data"):
+    df = get_nb_moy_nuits_sup_20deg_par_zone_par_annee(COLONNES, FILTRES)
 
 
 
@@ -36,80 +44,26 @@ groupes = {
     "Zones hautes (AV_H + SSV_H)": ["AV_H", "SSV_H"]
 }
 
-# Fonction utilitaire pour calculer une tendance avec numpy
-def calcule_tendance(df, group_label):
-    df_group = df[df["zone_geographique"].isin(groupes[group_label])]
-    
-    df_tendance = (
-        df_group.groupby("ANNEE", as_index=False)["moy_nuits_ge_20"]
-        .mean()
-        .sort_values("ANNEE")
-    )
-    
-    x = df_tendance["ANNEE"].values
-    y = df_tendance["moy_nuits_ge_20"].values
-    
-    if len(x) > 1:
-        coef = np.polyfit(x, y, 1)
-        trend = np.poly1d(coef)
-        df_tendance["trend"] = trend(x)
-        return df_tendance
-    else:
-        return None
-
-# Prépare les deux tendances
-tendance_chaude = calcule_tendance(df, "Zones chaudes (AV_C + SSV_C)")
-tendance_haute = calcule_tendance(df, "Zones hautes (AV_H + SSV_H)")
-
-# Construction du graphique
-fig = go.Figure()
-
-# 1) Courbes par zone
-for zone in df["zone_geographique"].unique():
-    df_zone = df[df["zone_geographique"] == zone].sort_values("ANNEE")
-    
-    fig.add_trace(go.Scatter(
-        x=df_zone["ANNEE"],
-        y=df_zone["moy_nuits_ge_20"],
-        mode="lines+markers",
-        name=f"{zone}",
-        opacity=0.7
-    ))
-
-# 2) Courbe de tendance zones chaudes
-if tendance_chaude is not None:
-    fig.add_trace(go.Scatter(
-        x=tendance_chaude["ANNEE"],
-        y=tendance_chaude["trend"],
-        mode="lines",
-        name="Tendance zones chaudes",
-        line=dict(width=4, dash="dash")
-    ))
-
-# 3) Courbe de tendance zones hautes
-if tendance_haute is not None:
-    fig.add_trace(go.Scatter(
-        x=tendance_haute["ANNEE"],
-        y=tendance_haute["trend"],
-        mode="lines",
-        name="Tendance zones hautes",
-        line=dict(width=4, dash="dot")
-    ))
-
-fig.update_layout(
-    title="Moyenne des nuits ≥ 20°C par zone géographique",
-    xaxis_title="Année",
-    yaxis_title="Nuits ≥ 20°C (moyenne)",
-    legend_title="Zones",
-    hovermode="x unified"
-)
-fig.update_layout(
-    title=dict(
-        font=dict(size=24)
+# Tendances des deux groupes calculées en un seul passage (moyenne annuelle des zones du groupe)
+zone_vers_groupe = {zone: label for label, zones in groupes.items() for zone in zones}
+with span("tendances"):
+    df_groupes = df.assign(groupe=df["zone_geographique"].astype(str).map(zone_vers_groupe)).dropna(subset=["groupe"])
+    tendances = get_tendances(df_groupes, "ANNEE", "moy_nuits_ge_20", "groupe")
+    tendances = tendances[tendances["n"] > 1]
+    lignes = droites(tendances, np.sort(df_groupes["ANNEE"].unique()), x="ANNEE")
+
+with span("figure_tendances"):
+    fig = figure_tendances(df, lignes)
+with span("st.plotly_chart"):
+    st.plotly_chart(fig, use_container_width=True)
+
+# Pente par décennie, intervalle de confiance à 95 % et test de Mann-Kendall
+for _, t in tendances.iterrows():
+    st.caption(
+        f"{STYLES_TENDANCE[t['groupe']][0]} : {t['pente'] * 10:+.1f} nuits/décennie "
+        f"(IC 95 % : {t['pente_min'] * 10:+.1f} à {t['pente_max'] * 10:+.1f}, "
+        f"pente de Sen : {t['pente_sen'] * 10:+.1f}, Mann-Kendall p = {t['mk_p']:.3f})"
     )
-)
-
-st.plotly_chart(fig, use_container_width=True)
 
 
 
@@ -125,51 +79,24 @@ groupes = {
     "Zones montagneuses (AV_H + SSV_H)": ["AV_H", "SSV_H"]
 }
 
-df["groupe"] = df["zone_geographique"].apply(
-    lambda z: "Zones côtières" if z in ["AV_C", "SSV_C"] else "Zones montagneuses"
-)
+with span("ecarts"):
+    df["groupe"] = np.where(df["zone_geographique"].isin(["AV_C", "SSV_C"]), "Zones côtières", "Zones montagneuses")
 
-df_plot = df.copy()
-df_plot["moy_groupe"] = df_plot.groupby("groupe")["moy_nuits_ge_20"].transform("mean")
-df_plot["ecart_moy"] = df_plot["moy_nuits_ge_20"] - df_plot["moy_groupe"]
-df_plot["couleur"] = df_plot["ecart_moy"].apply(lambda x: "red" if x > 0 else "blue")
+    # Moyenne de chaque groupe sur toute la période affichée (calculée une fois, mise en cache)
+    moyennes_groupes = get_climatologie(df, "groupe", "moy_nuits_ge_20", periode=None)
 
+    df_plot = df.copy()
+    df_plot["ecart_moy"] = anomalies(df_plot, moyennes_groupes, "groupe", "moy_nuits_ge_20")
 
 
 
 
 
 
-# Création de la colonne couleur pour le graphique
-df_plot["couleur"] = df_plot["ecart_moy"].apply(lambda x: "Chaud" if x > 0 else "Froid")
 
-# Couleurs personnalisées
-color_map = {
-    "Chaud": "#EF654D",  # rouge personnalisé
-    "Froid": "#4D8EEF"   # bleu personnalisé
-}
+with span("figure_ecarts"):
+    fig = figure_ecarts(df_plot)
+with span("st.plotly_chart"):
+    st.plotly_chart(fig, use_container_width=True)
 
-fig = px.bar(
-    df_plot,
-    x="ANNEE",
-    y="ecart_moy",
-    color="couleur", # contient "Chaud" / "Froid"
-    facet_col="groupe",
-    color_discrete_map=color_map,
-    labels={"ecart_moy": "Écart à la moyenne", "ANNEE": "Année"},
-    title="Écarts à la moyenne du nombre moyen de nuits ≥20°C par zone géographique",
-)
-
-fig.update_layout(
-    title=dict(
-        font=dict(size=24)
-    )
-)
-fig.add_hline(y=0, line_dash="dash", line_color="black")
-fig.for_each_annotation(
-    lambda a: a.update(
-        text=a.text.split("=")[1],
-        font=dict(size=18) # augmenter la taille des titres de facettes ("Zones côtières", "Zones montagneuses")
-    )
-)
-st.plotly_chart(fig, use_container_width=True)
+finish_rerun()
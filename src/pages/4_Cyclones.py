@@ -3,11 +3,17 @@ import plotly.express as px
 import pandas as pd
 from config.constants import data_sinistres_cyclone, get_mois_labels
 import re
-from data_layer.bigquery import get_detection_precip_superieure100mm
+from data_layer.bigquery import get_detection_precip_superieure100mm, dataset_version
+from data_layer.prefetch import show_warm_up_status
+from charts.cyclones import figure_evenements, evenements_par_annee, figure_evenements_par_annee, top_evenements
+from charts.figure_cache import cached_chart, render_chart
+from profiling.spans import span, start_rerun, finish_rerun
 
 
 # Exécuter la requête et récupérer le dataframe
-df_pie_chart = get_detection_precip_superieure100mm()
+start_rerun("4_Cyclones")
+with span("data"):
+    df_pie_chart = get_detection_precip_superieure100mm()
 
 
 # Configuration de la page
@@ -19,6 +25,7 @@ st.set_page_config(
 
 # Titre principal
 st.title("Précipitations")
+show_warm_up_status()
 st.markdown("### Détection et analyse des événements cycloniques basés sur les précipitations extrêmes")
 
 
@@ -96,52 +103,24 @@ st.dataframe(
 st.markdown("---")
 st.subheader("📈 Visualisations")
 
-# Graphique 1: Évolution temporelle des événements cycloniques
-fig1 = px.scatter(
-    df_pie_chart,
-    x='date_key',
-    y='Nb_Jours_Sup_100mm',
-    size='Cumul_Mensuel_Pluie_Total',
-    color='Cumul_MAxi_par_mois',
-    hover_data=['annee', 'mois', 'Cumul_Mensuel_Pluie_Total', 'Cumul_MAxi_par_mois'],
-    title="Nombre de jours avec cumul de précipitation >100mm  par mois",
-    subtitle="Bulle = Intensité mensuelle des précipitations",
-    labels={
-        'date_key': 'Date',
-        'Nb_Jours_Sup_100mm': 'Nombre de jours avec >100mm',
-        'Cumul_Mensuel_Pluie_Total': 'Cumul mensuel (mm)',
-        'Cumul_MAxi_par_mois': 'Précipitation max 24h (mm)'
-    },
-    color_continuous_scale='Blues'
-)
-fig1.update_layout(height=500)
-st.plotly_chart(fig1, use_container_width=True)
+with span("figure_evenements"):
+    fig1 = cached_chart("cyclones.evenements", dataset_version("precip_sup_100mm"), (),
+                        lambda: figure_evenements(df_pie_chart))
+render_chart(fig1, use_container_width=True)
 
 # Graphique 2: Distribution par année
 st.subheader("Distribution annuelle des événements")
-events_per_year = df_pie_chart.groupby('annee').size().reset_index(name='nombre_evenements')
-fig2 = px.bar(
-    events_per_year,
-    x='annee',
-    y='nombre_evenements',
-    title="Nombre de jour réunissant des conditions cycloniques par année",
-    labels={
-        'annee': 'Année',
-        'nombre_evenements': "Nombre d'événements"
-    },
-    color='nombre_evenements',
-    color_continuous_scale='Reds'
-)
-fig2.update_layout(height=400)
-st.plotly_chart(fig2, use_container_width=True)
+with span("figure_evenements_par_annee"):
+    fig2 = cached_chart("cyclones.evenements_par_annee", dataset_version("precip_sup_100mm"), (),
+                        lambda: figure_evenements_par_annee(evenements_par_annee(df_pie_chart)))
+render_chart(fig2, use_container_width=True)
 
 
 # Section 4: Événements les plus intenses
 st.markdown("---")
 st.subheader("🌊 Top 10 des événements les plus intenses")
-top_events = df_pie_chart.nlargest(10, 'Cumul_Mensuel_Pluie_Total')[
-    ['annee', 'mois', 'Cumul_Mensuel_Pluie_Total', 'Cumul_MAxi_par_mois', 'Nb_Jours_Sup_100mm']
-]
+with span("transform"):
+    top_events = top_evenements(df_pie_chart)
 st.dataframe(
     top_events.style.format({
         'Cumul_Mensuel_Pluie_Total': '{:.2f}',
@@ -255,7 +234,8 @@ def creer_pie_chart_periode(df_pie_chart, annee_debut, annee_fin, titre):
     # Rendre l'anneau pour une meilleure lisibilité (Donut Chart)
     fig_pie.update_traces(textposition='inside', textinfo='percent+label', hole=.4)
     
-    st.plotly_chart(fig_pie)
+    with span("st.plotly_chart"):
+        st.plotly_chart(fig_pie)
 
 # --------------------------
 # Exécution pour les périodes 1 et 2
@@ -333,3 +313,5 @@ def get_top_5_degats_cyclone():
 # Appel de la fonction pour obtenir le tableau final
 df_final = get_top_5_degats_cyclone()
 print(df_final) # Décommentez pour vérifier le résultat dans un environnement standard
+
+finish_rerun()
@@ -2,10 +2,13 @@
 
 # Importations nécessaires
 import streamlit as st 
-import pandas as pd
-import altair as alt
 
-from data_layer.bigquery import get_projection_2100
+from data_layer.bigquery import dataset_version
+from data_layer.store import get_store
+from data_layer.prefetch import show_warm_up_status
+from charts.simulation_2100 import chart_carte_delta, format_long, chart_comparaison
+from charts.figure_cache import cached_chart, render_chart
+from profiling.spans import span, start_rerun, finish_rerun
 
 ## Configuration de la page Streamlit
 st.set_page_config(
@@ -14,34 +17,38 @@ st.set_page_config(
     layout="wide"
 )
 
+start_rerun("5_Simulation_temperature_extreme_2100")
 st.title("🌡️ Simulation des Jours de Forte Chaleur à La Réunion en 2100 (Projection 2100)")
 
 
 
-# --- Fonction de chargement des données (avec cache) ---
-@st.cache_data
-def load_data():
-    # Exécute la requête SQL et retourne le DataFrame
-    df = get_projection_2100()
-    return df
+# --- Chargement des données ---
+# Store partagé par toutes les sessions du processus, indexé par scénario
+def load_store():
+    return get_store("projection_2100", ("Scenario",))
 
 try:
+    # Moteur de données et préchargement (erreurs d'initialisation affichées ci-dessous)
+    show_warm_up_status()
+
     # 1. Chargement des données
-    data_proj = load_data()
+    with span("data"):
+        store_proj = load_store()
     
     # 2. Barre latérale et Filtres Interactifs
     # --------------------------------------------------------------------------
     st.sidebar.header("Filtres Scénario 📈")
     
     # Sélecteur de Scénario (RCP 4.5 vs RCP 8.5)
-    scenarios_uniques = sorted(data_proj['Scenario'].unique().tolist())
+    scenarios_uniques = store_proj.values('Scenario')
     scenario_selectionne = st.sidebar.selectbox(
         "Choisissez un Scénario de Réchauffement :", 
         scenarios_uniques
     )
     
     # Filtrage du DataFrame par Scénario
-    df_filtre = data_proj[data_proj['Scenario'] == scenario_selectionne]
+    with span("transform"):
+        df_filtre = store_proj.frame(Scenario=scenario_selectionne)
 
     
     # --- Indicateurs de Performance (KPI) ---
@@ -68,44 +75,24 @@ try:
     # --- Visualisation 1 : Cartographie du Changement (Carte Choroplèthe) ---
     st.subheader(f"Carte du Changement Projeté (Delta Tmax > 32°C) - Scénario {scenario_selectionne}")
     
-    # Altair ne fait pas de choroplèthes directement, mais peut afficher des points colorés.
-    # Pour simuler la cartographie du changement par zone, nous utilisons la couleur sur le delta.
-    
-    # Utilisation des coordonnées moyennes de la zone (calculées dans la requête SQL)
-    chart_map = alt.Chart(df_filtre).mark_circle().encode(
-        latitude='latitude_centre:Q',
-        longitude='longitude_centre:Q',
-        size=alt.Size('delta_projection_2100:Q', title="Augmentation Jours Chauds (Delta)"),
-        color=alt.Color('delta_projection_2100:Q', title="Delta Jours Chauds (2100)", scale=alt.Scale(range='heatmap')),
-        tooltip=['Z_CLIM', 'baseline_jours_chauds_zone:Q', 'delta_projection_2100:Q', 'jours_chauds_projete_2100:Q']
-    ).properties(
-        title="Impact du Changement Climatique sur les Jours Chauds (Horizon 2100)"
-    ).interactive()
-
-    st.altair_chart(chart_map, use_container_width=True)
+    with span("chart_carte_delta"):
+        chart_map = cached_chart(
+            "simulation_2100.carte", dataset_version("projection_2100"), (scenario_selectionne,),
+            lambda: chart_carte_delta(df_filtre)
+        )
+
+    render_chart(chart_map, use_container_width=True)
     
     # --- Visualisation 2 : Comparaison de la Projection (Baseline vs. Futur) ---
     st.subheader(f"Comparaison Baseline (1991-2020) vs. Projection 2100 - Scénario {scenario_selectionne}")
     
-    # On reformate le DataFrame pour Altair
-    df_long = df_filtre.melt(
-        id_vars=['Z_CLIM', 'Scenario'],
-        value_vars=['baseline_jours_chauds_zone', 'jours_chauds_projete_2100'],
-        var_name='Type_Valeur',
-        value_name='Jours_Chauds'
-    )
-    
-    chart_bar_comparison = alt.Chart(df_long).mark_bar().encode(
-        x=alt.X('Jours_Chauds:Q', title='Jours > 32°C Moyens/an'),
-        y=alt.Y('Z_CLIM:N', title='Zone Climatique', sort='-x'),
-        color=alt.Color('Type_Valeur:N', title='Période', scale=alt.Scale(domain=['baseline_jours_chauds_zone', 'jours_chauds_projete_2100'], range=['#93B5C9', '#E63946'])),
-        column=alt.Column('Type_Valeur:N', header=alt.Header(titleOrient="bottom", labelOrient="bottom")),
-        tooltip=['Z_CLIM', 'Type_Valeur', alt.Tooltip('Jours_Chauds:Q', format='.1f')]
-    ).properties(
-        title="Augmentation des Jours Chauds par Zone"
-    ).interactive()
-
-    st.altair_chart(chart_bar_comparison, use_container_width=False)
+    with span("chart_comparaison"):
+        chart_bar_comparison = cached_chart(
+            "simulation_2100.comparaison", dataset_version("projection_2100"), (scenario_selectionne,),
+            lambda: chart_comparaison(format_long(df_filtre))
+        )
+
+    render_chart(chart_bar_comparison, use_container_width=False)
     
     # 4. Affichage du DataFrame
     st.subheader(f"Aperçu des Données (Projection 2100)")
@@ -114,4 +101,6 @@ try:
 
 except Exception as e:
     st.error(f"Une erreur s'est produite lors de l'exécution : {e}")
-    st.warning("Vérifiez la connexion à BigQuery, les identifiants et le nom des colonnes (ex: `latitude`, `longitude` dans `T_ST`).")
\ No newline at end of file
+    st.warning("Vérifiez la connexion à BigQuery, les identifiants et le nom des colonnes (ex: `latitude`, `longitude` dans `T_ST`).")
+
+finish_rerun()
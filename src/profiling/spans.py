@@ -0,0 +1,155 @@
+"""
+Profilage des reruns des pages Streamlit (optionnel).
+
+Activé par `PROJET_CC_PROFILE=1` (ou `profile = true` dans la section [data] des
+secrets) pour toutes les sessions, ou par le paramètre d'URL `?profile=1` pour
+une seule session. Chaque page appelle `start_rerun` au début du script et
+`finish_rerun` à la fin ; entre les deux, les spans sont chronométrés :
+
+- `span("nom")` autour du chargement des données, des transformations et des
+  appels de rendu des graphiques (`st.plotly_chart`, `st_folium`, ... :
+  sérialisation et envoi des figures) ;
+- automatiquement : chaque requête du data layer (`query:<nom>`).
+
+À la fin du rerun, les spans sont écrits au format « collapsed stacks »
+(`page;data;query:climat_annuel 1234`, temps propre en microsecondes), lisible par
+flamegraph.pl, speedscope ou inferno : un fichier par rerun dans
+`PROJET_CC_PROFILE_DIR` (défaut `.profiles/`), et résumés dans un encadré en bas de page.
+Sans profilage actif, `span` ne fait rien.
+"""
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from config.settings import get_setting, PROJECT_ROOT
+
+_local = threading.local()
+SESSION_KEY = "_profil_rerun"
+
+
+class Rerun:
+    def __init__(self, page):
+        self.page = page
+        self.started_at = time.time()
+        self.stack = [page]
+        self.spans = []  # (chemin, durée totale, durée propre)
+        self._children = [0.0]
+        self._start = self._last = time.perf_counter()
+
+    def enter(self, name):
+        self.stack.append(name)
+        self._children.append(0.0)
+        return time.perf_counter()
+
+    def exit(self, start):
+        duration = time.perf_counter() - start
+        children = self._children.pop()
+        self.spans.append((tuple(self.stack), duration, duration - children))
+        self.stack.pop()
+        self._children[-1] += duration
+        self._last = time.perf_counter()
+
+    def close(self, interrupted=False):
+        # Temps du script hors spans, attribué à la page elle-même
+        # (rerun interrompu : jusqu'à la fin du dernier span terminé)
+        end = self._last if interrupted else time.perf_counter()
+        duration = end - self._start
+        self.spans.append(((self.page,), duration, duration - self._children[0]))
+        return duration
+
+    def folded(self):
+        """Lignes « collapsed stacks » : chemin;de;spans temps_propre_µs."""
+        totals = defaultdict(float)
+        for path, _, self_time in self.spans:
+            totals[";".join(path)] += self_time
+        return [f"{path} {round(us * 1e6)}" for path, us in totals.items() if us > 0]
+
+    def frame(self):
+        return pd.DataFrame(
+            [(" › ".join(path[1:]) or path[0], total * 1000, own * 1000) for path, total, own in self.spans],
+            columns=["span", "total_ms", "propre_ms"],
+        )
+
+
+def is_profiling_enabled():
+    if str(get_setting("PROJET_CC_PROFILE", "profile", "0")).lower() in ("1", "true", "yes"):
+        return True
+    try:
+        return st.query_params.get("profile", "0").lower() in ("1", "true", "yes")
+    except Exception:
+        # Hors session Streamlit (scripts, benchmarks)
+        return False
+
+
+def profile_dir():
+    return Path(get_setting("PROJET_CC_PROFILE_DIR", "profile_dir", PROJECT_ROOT / ".profiles"))
+
+
+def current_rerun():
+    return getattr(_local, "rerun", None)
+
+
+def _dump(rerun, status):
+    path = profile_dir()
+    path.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(rerun.started_at))
+    name = re.sub(r"\W+", "_", rerun.page).strip("_")
+    file = path / f"{stamp}-{int(rerun.started_at * 1000) % 1000:03d}_{name}_{status}.folded"
+    file.write_text("\n".join(rerun.folded()) + "\n", encoding="utf-8")
+    return file
+
+
+def _session_state():
+    try:
+        return st.session_state
+    except Exception:
+        # Hors session Streamlit : pas de détection des reruns interrompus
+        return {}
+
+
+def start_rerun(page):
+    """Début du profilage du rerun de `page` (sans effet si le profilage est désactivé)."""
+    # Chaque rerun s'exécute dans son propre thread : le rerun précédent non terminé
+    # (exception, st.stop, nouvelle interaction) est retrouvé dans l'état de la session
+    state = _session_state()
+    previous = state.pop(SESSION_KEY, None)
+    if previous is not None:
+        previous.close(interrupted=True)
+        _dump(previous, "interrompu")
+    _local.rerun = Rerun(page) if is_profiling_enabled() else None
+    if _local.rerun is not None:
+        state[SESSION_KEY] = _local.rerun
+
+
+def finish_rerun():
+    """Fin du rerun : écrit le profil et affiche le résumé des spans."""
+    rerun = current_rerun()
+    if rerun is None:
+        return
+    _local.rerun = None
+    _session_state().pop(SESSION_KEY, None)
+    duration = rerun.close()
+    file = _dump(rerun, "ok")
+    with st.expander(f"⏱️ Profil du rerun : {duration * 1000:.0f} ms", expanded=False):
+        st.dataframe(rerun.frame().sort_values("total_ms", ascending=False), hide_index=True)
+        st.caption(f"Flamegraph (collapsed stacks) : {file}")
+
+
+@contextmanager
+def span(name):
+    rerun = current_rerun()
+    if rerun is None:
+        yield
+        return
+    start = rerun.enter(name)
+    try:
+        yield
+    finally:
+        rerun.exit(start)
+
@@ -0,0 +1,64 @@
+"""
+Lecture des archives LSH (`ingestion.fetch_monthly_data`) sur une archive réduite :
+`rr.zip` contient deux CSV de station (ligne de titre, 12 lignes de métadonnées,
+en-tête puis mesures) et un fichier texte ignoré.
+
+    python -m pytest src/tests
+"""
+import zipfile
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ingestion.fetch_monthly_data import ingest_archive, parse_metadata_line, read_station_csv
+
+FIXTURE = Path(__file__).parent / "rr.zip"
+
+
+def read_member(name, key="Precipitations"):
+    with zipfile.ZipFile(FIXTURE) as archive, archive.open(name) as member:
+        return read_station_csv(member, key)
+
+
+def test_parse_metadata_line():
+    assert parse_metadata_line("# NUM_POSTE = 97418110\n") == ("NUM_POSTE", "97418110")
+    assert parse_metadata_line("# LATITUDE (°) = -20.89") == ("LATITUDE_DEG", "-20.89")
+    assert parse_metadata_line("# Période homogénéisée : 196501 201512") == ("PERIODE_HOMOGENISEE", "196501 201512")
+    assert parse_metadata_line("#") is None
+    assert parse_metadata_line("AAAAMM;VALEUR;Q_HOM") is None
+
+
+def test_read_station_csv_metadata():
+    num_post, metadata, _ = read_member("SH_RR_97418110.csv")
+    # Ligne de titre ignorée, poste lu sur la première ligne de métadonnées
+    assert num_post == "97418110"
+    assert list(metadata) == [
+        "NUM_POSTE", "NOM_USUEL", "LATITUDE_DEG", "LONGITUDE_DEG", "ALTITUDE_M", "ETAT_POSTE",
+        "AMPLITUDE_MIN_DETECTABLE", "PERIODE_HOMOGENISEE", "DATE_RUPTURE_HOMOGENEITE",
+        "Q_HOM_196501_201512", "Q_HOM_PROLONGEES_202412",
+    ]
+    assert metadata["NOM_USUEL"] == "GILLOT-AEROPORT"
+    assert metadata["Q_HOM_PROLONGEES_202412"] == "2"
+
+
+def test_read_station_csv_measures():
+    _, _, table = read_member("SH_RR_97418110.csv")
+    # L'en-tête suit les 12 lignes de métadonnées ; VALEUR renommée d'après le jeu
+    assert table.column_names == ["AAAAMM", "Precipitations", "Q_HOM"]
+    assert table.schema.field("AAAAMM").type == pa.int32()
+    assert table.schema.field("Precipitations").type == pa.float64()
+    assert table.column("AAAAMM").to_pylist() == [196501, 196502, 202412]
+    assert table.column("Precipitations").to_pylist() == [210.4, 512.0, 33.5]
+
+
+def test_ingest_archive(tmp_path):
+    assert ingest_archive("Precipitations", FIXTURE, tmp_path) == (2, 5)
+    dataset_dir = tmp_path / "precipitations"
+    partitions = sorted(p.name for p in (dataset_dir / "data").iterdir())
+    assert partitions == ["num_post=97402240", "num_post=97418110"]
+    # Même schéma pour toutes les partitions (une valeur entière lue en float64)
+    schemas = {str(pq.read_schema(p / "part-0.parquet")) for p in (dataset_dir / "data").iterdir()}
+    assert len(schemas) == 1
+    metadata = pq.read_table(dataset_dir / "metadata.parquet")
+    assert sorted(metadata.column("NUM_POSTE").to_pylist()) == ["97402240", "97418110"]
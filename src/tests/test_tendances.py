@@ -0,0 +1,75 @@
+"""
+Estimateurs de tendance (`analytics.tendances`) sur des séries aux valeurs connues.
+
+    python -m pytest src/tests
+"""
+import math
+
+import numpy as np
+import pytest
+
+from analytics.tendances import Z_95, mann_kendall, ols, quantile_student, sen
+
+ANNEES = np.arange(2000, 2010)
+
+
+def test_ols_et_sen_pente_connue():
+    # Deux séries : droite exacte, et même droite avec des années manquantes
+    droite = 2.0 * ANNEES + 1.0
+    lacunaire = droite.copy()
+    lacunaire[[1, 4, 7]] = np.nan
+    y = np.column_stack([droite, lacunaire])
+
+    resultat = ols(ANNEES, y)
+    assert resultat["n"].tolist() == [10, 7]
+    assert resultat["pente"] == pytest.approx([2.0, 2.0])
+    assert resultat["ordonnee"] == pytest.approx([1.0, 1.0])
+    # Résidus nuls : intervalle de confiance réduit à la pente
+    assert resultat["pente_min"] == pytest.approx([2.0, 2.0])
+    assert resultat["pente_max"] == pytest.approx([2.0, 2.0])
+    assert sen(ANNEES, y) == pytest.approx([2.0, 2.0])
+
+
+def test_sen_robuste_aux_valeurs_aberrantes():
+    y = 0.5 * ANNEES
+    y[3] += 100.0
+    assert sen(ANNEES, y[:, None])[0] == pytest.approx(0.5)
+
+
+def test_mann_kendall_sans_ex_aequo():
+    resultat = mann_kendall(ANNEES, np.arange(10.0)[:, None])
+    # S = nombre de paires (toutes croissantes), variance n(n-1)(2n+5)/18
+    assert resultat["s"][0] == 45
+    assert resultat["z"][0] == pytest.approx(44 / math.sqrt(10 * 9 * 25 / 18))
+
+
+def test_mann_kendall_ex_aequo():
+    x = np.arange(5)
+    y = np.array([[1.0], [1.0], [2.0], [2.0], [3.0]])
+    resultat = mann_kendall(x, y)
+    # S = 8 ; deux groupes de 2 ex aequo : variance (5·4·15 - 2·2·1·9) / 18
+    variance = (300 - 36) / 18
+    assert resultat["s"][0] == 8
+    assert resultat["z"][0] == pytest.approx(7 / math.sqrt(variance))
+    assert resultat["p"][0] == pytest.approx(math.erfc(7 / math.sqrt(variance) / math.sqrt(2)))
+    # Sans la correction, la variance serait surestimée (z plus petit, p-valeur plus grande)
+    assert resultat["p"][0] < math.erfc(7 / math.sqrt(300 / 18) / math.sqrt(2))
+
+
+def test_mann_kendall_ex_aequo_et_valeurs_manquantes():
+    # Les NaN ne comptent ni dans n ni dans les groupes d'ex aequo
+    y = np.array([[1.0], [np.nan], [1.0], [2.0], [np.nan], [2.0], [3.0]])
+    attendu = mann_kendall(np.arange(5), np.array([[1.0], [1.0], [2.0], [2.0], [3.0]]))
+    resultat = mann_kendall(np.arange(7), y)
+    assert resultat["s"][0] == attendu["s"][0]
+    assert resultat["z"][0] == pytest.approx(attendu["z"][0])
+
+
+@pytest.mark.parametrize("dof, attendu, tolerance", [
+    # Quantiles à 97,5 % de la loi de Student
+    (5, 2.570582, 1e-2),
+    (10, 2.228139, 1e-3),
+    (30, 2.042272, 1e-4),
+])
+def test_quantile_student(dof, attendu, tolerance):
+    assert quantile_student(Z_95, dof) == pytest.approx(attendu, rel=tolerance)
@@ -0,0 +1,19 @@
+-- mart_nuits_sup_20deg_par_zone (lu dans le cube) doit donner, par zone et par année,
+-- les mêmes valeurs que son ancien calcul int_mensq_temperatures_sup_20deg
+-- (rattachement des stations par stations_zones) : lignes en écart renvoyées
+
+SELECT
+    COALESCE(m.ANNEE, i.ANNEE) AS ANNEE,
+    COALESCE(m.zone_geographique, i.Z_GEO) AS zone_geographique,
+    m.moy_nuits_ge_20,
+    i.moy_nuits_ge_20 AS moy_nuits_ge_20_ancien,
+    m.nb_stations,
+    i.nb_stations AS nb_stations_ancien
+FROM {{ ref('mart_nuits_sup_20deg_par_zone') }} AS m
+FULL OUTER JOIN {{ ref('int_mensq_temperatures_sup_20deg') }} AS i
+    ON m.ANNEE = i.ANNEE
+    AND m.zone_geographique = i.Z_GEO
+WHERE m.ANNEE IS NULL
+    OR i.ANNEE IS NULL
+    OR m.nb_stations != i.nb_stations
+    OR ABS(m.moy_nuits_ge_20 - i.moy_nuits_ge_20) > 1e-6
@@ -0,0 +1,27 @@
+-- mart_precip_sup_100mm (lu dans le cube) doit donner les mêmes mois et valeurs que
+-- son ancien calcul (int_mensq_pluviometrie_sup_100mm, moyenne de toutes les
+-- stations du staging) : lignes en écart renvoyées
+
+WITH ancien AS (
+    SELECT
+        AAAAMM AS date_key,
+        AVG(RR) AS Cumul_Mensuel_Pluie_Total,
+        AVG(RRAB) AS Cumul_MAxi_par_mois,
+        AVG(NBJRR100) AS Nb_Jours_Sup_100mm
+    FROM {{ ref('stg_mensq_pluviometrie') }}
+    GROUP BY AAAAMM
+    HAVING AVG(NBJRR100) > 1
+)
+
+SELECT
+    COALESCE(m.date_key, a.date_key) AS date_key,
+    m.Nb_Jours_Sup_100mm,
+    a.Nb_Jours_Sup_100mm AS Nb_Jours_Sup_100mm_ancien
+FROM {{ ref('mart_precip_sup_100mm') }} AS m
+FULL OUTER JOIN ancien AS a
+    ON m.date_key = a.date_key
+WHERE m.date_key IS NULL
+    OR a.date_key IS NULL
+    OR ABS(m.Nb_Jours_Sup_100mm - a.Nb_Jours_Sup_100mm) > 1e-6
+    OR ABS(m.Cumul_Mensuel_Pluie_Total - a.Cumul_Mensuel_Pluie_Total) > 1e-6
+    OR ABS(m.Cumul_MAxi_par_mois - a.Cumul_MAxi_par_mois) > 1e-6